@@ -0,0 +1,59 @@
+""" Benchmark of the time taken to import the package and to first validate a document """
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+# Each case is timed in a fresh interpreter, so nothing is already imported
+CASES = {
+    "import core": "import aind_data_schema.core",
+    "import json_writer": "import aind_data_schema.utils.json_writer",
+    "import subject": "from aind_data_schema.core.subject import Subject",
+    "import metadata": "from aind_data_schema.core.metadata import Metadata",
+    "first subject validation": (
+        "from aind_data_schema.core.subject import Subject\n"
+        f"Subject.model_validate_json(open({str(EXAMPLES_DIR / 'subject.json')!r}).read())"
+    ),
+}
+
+_TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def time_case(statement: str, repeat: int) -> float:
+    """Returns the median time in seconds of running a statement in a fresh interpreter"""
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", _TIMER.format(statement=statement)], capture_output=True, check=True, text=True
+        ).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return statistics.median(times)
+
+
+def main(args: list) -> dict:
+    """Runs every case and prints the median times"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--repeat", type=int, default=5, help="Number of fresh interpreters per case")
+    parser.add_argument("-o", "--output", help="Optional json file to write the results to")
+    configs = parser.parse_args(args)
+
+    results = {name: time_case(statement, configs.repeat) for name, statement in CASES.items()}
+    for name, seconds in results.items():
+        print(f"{name:<30} {seconds:8.3f} s")
+    if configs.output:
+        Path(configs.output).write_text(json.dumps(results, indent=3))
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,220 @@
+""" Benchmarks of importing, validating, serializing and assembling the examples, and of generating schemas """
+
+import argparse
+import copy
+import datetime
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pydantic
+from pydantic import ValidationError
+from startup import CASES, time_case
+
+from aind_data_schema import __version__, core
+from aind_data_schema.core.metadata import Metadata
+from aind_data_schema.utils.json_writer import SchemaWriter
+
+ROOT_DIR = Path(__file__).parents[1]
+EXAMPLES_DIR = ROOT_DIR / "examples"
+SCHEMAS_DIR = ROOT_DIR / "schemas"
+
+# Examples used as the core fields of the assembled Metadata
+METADATA_EXAMPLES = {
+    "data_description": "data_description",
+    "subject": "subject",
+    "procedures": "ophys_procedures",
+    "session": "ophys_session",
+    "processing": "processing",
+    "acquisition": "exaspim_acquisition",
+    "instrument": "exaspim_instrument",
+    "rig": "fip_ophys_rig",
+}
+
+
+def load_examples() -> Dict[str, tuple]:
+    """Returns the json and model class of each example, keyed by the example name"""
+    examples = dict()
+    for example in sorted(EXAMPLES_DIR.glob("*.json")):
+        schema_path = next(path for path in SCHEMAS_DIR.glob("*_schema.json") if example.stem.endswith(path.stem[:-7]))
+        model_class = getattr(core, json.loads(schema_path.read_text())["title"])
+        examples[example.stem] = (json.loads(example.read_text()), model_class)
+    return examples
+
+
+def _copies(items: List[dict], factor: int) -> List[dict]:
+    """Returns factor copies of list items, with numbered names so that names stay unique"""
+    scaled = []
+    for index in range(factor):
+        for item in items:
+            item = copy.deepcopy(item)
+            if index and isinstance(item.get("name"), str):
+                item["name"] = f"{item['name']} {index}"
+            scaled.append(item)
+    return scaled
+
+
+def scalable_fields(data: dict, model_class: type) -> List[str]:
+    """Returns the fields holding lists of objects, e.g. devices, tiles, streams or procedures, that can be copied"""
+    fields = []
+    for field_name, value in data.items():
+        if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+            try:
+                model_class.model_validate({**data, field_name: _copies(value, 2)})
+            except ValidationError:
+                # e.g. the three axes of an acquisition
+                continue
+            fields.append(field_name)
+    return fields
+
+
+def scale_document(data: dict, fields: List[str], factor: int) -> dict:
+    """Returns a document with factor times as many items in each scalable field"""
+    return {key: _copies(value, factor) if key in fields else value for key, value in data.items()}
+
+
+def best_time(statement, repeat: int) -> float:
+    """Returns the fastest of several timings of a statement, in seconds"""
+    return min(timeit.repeat(statement, number=1, repeat=repeat))
+
+
+def _record(results: List[dict], benchmark: str, case: str, scale: int, seconds: float, size: Optional[int] = None):
+    """Adds a result and prints it"""
+    results.append({"benchmark": benchmark, "case": case, "scale": scale, "seconds": seconds, "bytes": size})
+    print(f"{benchmark:<22} {case:<30} {scale:>6}x {seconds * 1e3:12.3f} ms")
+
+
+def bench_examples(examples: Dict[str, tuple], scales: List[int], repeat: int, results: List[dict]) -> dict:
+    """Times validating and serializing each example at each scale, and returns the validated models"""
+    models = dict()
+    for name, (data, model_class) in examples.items():
+        try:
+            model_class.model_validate(data)
+        except ValidationError as error:
+            print(f"{name} is skipped, it is not valid: {error.error_count()} errors")
+            continue
+        fields = scalable_fields(data, model_class)
+        for scale in scales:
+            json_data = json.dumps(scale_document(data, fields, scale))
+            model = model_class.model_validate_json(json_data)
+            models[(name, scale)] = model
+            _record(
+                results,
+                "model_validate_json",
+                name,
+                scale,
+                best_time(lambda: model_class.model_validate_json(json_data), repeat),
+                len(json_data),
+            )
+            _record(results, "model_dump_json", name, scale, best_time(model.model_dump_json, repeat), len(json_data))
+    return models
+
+
+def bench_metadata(models: dict, scales: List[int], repeat: int, results: List[dict]) -> None:
+    """Times assembling, serializing and validating a Metadata from the scaled examples"""
+    for scale in scales:
+        fields = {field: models[(example, scale)] for field, example in METADATA_EXAMPLES.items()}
+
+        def assemble():
+            """Assembles the metadata of an asset"""
+            return Metadata(name="benchmark_asset", location="s3://benchmark/benchmark_asset", **fields)
+
+        metadata = assemble()
+        # The asset id is written as _id, its alias
+        json_data = metadata.model_dump_json(by_alias=True)
+        _record(results, "metadata_assembly", "metadata", scale, best_time(assemble, repeat), len(json_data))
+        _record(
+            results,
+            "metadata_dump_json",
+            "metadata",
+            scale,
+            best_time(lambda: metadata.model_dump_json(by_alias=True), repeat),
+        )
+        _record(
+            results,
+            "metadata_validate_json",
+            "metadata",
+            scale,
+            best_time(lambda: Metadata.model_validate_json(json_data), repeat),
+        )
+
+
+def bench_schemas(repeat: int, results: List[dict]) -> None:
+    """Times generating every core schema with json_writer"""
+    with tempfile.TemporaryDirectory() as output:
+        writer = SchemaWriter(["--output", output, "--force", "--jobs", "1"])
+        _record(results, "json_writer", "all schemas", 1, best_time(writer.write_to_json, repeat))
+
+
+def bench_imports(repeat: int, results: List[dict]) -> None:
+    """Times importing the package and first validating a document, in fresh interpreters"""
+    for name, statement in CASES.items():
+        _record(results, "import", name, 1, time_case(statement, repeat))
+
+
+def _environment() -> dict:
+    """Returns what the results were measured with, so runs can be matched"""
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True).stdout.strip()
+    return {
+        "commit": commit or None,
+        "version": __version__,
+        "python": platform.python_version(),
+        "pydantic": pydantic.VERSION,
+        "platform": platform.platform(),
+        "date": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+    }
+
+
+def compare(results: List[dict], baseline: dict, threshold: float) -> List[str]:
+    """Prints the ratio of each result to the baseline and returns the regressions larger than the threshold"""
+    baseline_times = {(r["benchmark"], r["case"], r["scale"]): r["seconds"] for r in baseline["results"]}
+    regressions = []
+    print(f"\ncompared with {baseline['environment'].get('commit')}")
+    for result in results:
+        key = (result["benchmark"], result["case"], result["scale"])
+        if baseline_times.get(key):
+            ratio = result["seconds"] / baseline_times[key]
+            print(f"{key[0]:<22} {key[1]:<30} {key[2]:>6}x {ratio:8.2f}x")
+            if ratio > 1 + threshold:
+                regressions.append(f"{key[0]} {key[1]} {key[2]}x is {ratio:.2f}x slower")
+    return regressions
+
+
+def main(args: list) -> dict:
+    """Runs the benchmarks, writes the results and compares them with a baseline"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-s", "--scales", type=int, nargs="+", default=[1, 10, 100, 1000], help="Scale factors")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="Number of timings to take the fastest of")
+    parser.add_argument("-o", "--output", help="Optional json file to write the results to")
+    parser.add_argument("-c", "--compare", help="Optional json file of earlier results to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2, help="Slowdown reported as a regression")
+    parser.add_argument("--skip-imports", action="store_true", help="Skip the import benchmarks")
+    parser.add_argument("--skip-schemas", action="store_true", help="Skip the json_writer benchmark")
+    configs = parser.parse_args(args)
+
+    results = []
+    if not configs.skip_imports:
+        bench_imports(configs.repeat, results)
+    models = bench_examples(load_examples(), configs.scales, configs.repeat, results)
+    bench_metadata(models, configs.scales, configs.repeat, results)
+    if not configs.skip_schemas:
+        bench_schemas(configs.repeat, results)
+
+    report = {"environment": _environment(), "results": results}
+    if configs.output:
+        Path(configs.output).write_text(json.dumps(report, indent=3))
+    if configs.compare:
+        regressions = compare(results, json.loads(Path(configs.compare).read_text()), configs.threshold)
+        for regression in regressions:
+            print(regression)
+        report["regressions"] = regressions
+    return report
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(sys.argv[1:]).get("regressions") else 0)
@@ -0,0 +1,62 @@
+""" Benchmark of validating the examples with compiled validators, jsonschema and the pydantic models """
+
+import argparse
+import json
+import sys
+import timeit
+from pathlib import Path
+
+from jsonschema import Draft202012Validator
+
+from aind_data_schema import core
+from aind_data_schema.utils.schema_compiler import load_validator
+
+ROOT_DIR = Path(__file__).parents[1]
+EXAMPLES_DIR = ROOT_DIR / "examples"
+SCHEMAS_DIR = ROOT_DIR / "schemas"
+
+
+def _cases() -> dict:
+    """Returns the examples that are valid, with their schema and model class"""
+    cases = dict()
+    for example in sorted(EXAMPLES_DIR.glob("*.json")):
+        schema_path = next(path for path in SCHEMAS_DIR.glob("*_schema.json") if example.stem.endswith(path.stem[:-7]))
+        schema = json.loads(schema_path.read_text())
+        json_data = example.read_text()
+        if Draft202012Validator(schema).is_valid(json.loads(json_data)):
+            cases[example.stem] = (json_data, schema_path, getattr(core, schema["title"]))
+    return cases
+
+
+def time_example(json_data: str, schema_path: Path, model_class: type, number: int) -> dict:
+    """Returns the mean time in seconds of validating a json document with each validator"""
+    compiled = load_validator(schema_path)
+    validator = Draft202012Validator(json.loads(schema_path.read_text()))
+    model_class.model_validate_json(json_data)
+    statements = {
+        "compiled": lambda: compiled.validate(json.loads(json_data)),
+        "jsonschema": lambda: validator.validate(json.loads(json_data)),
+        "pydantic": lambda: model_class.model_validate_json(json_data),
+    }
+    return {name: timeit.timeit(statement, number=number) / number for name, statement in statements.items()}
+
+
+def main(args: list) -> dict:
+    """Times every example and prints the mean times"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-n", "--number", type=int, default=20, help="Number of validations per example")
+    parser.add_argument("-o", "--output", help="Optional json file to write the results to")
+    configs = parser.parse_args(args)
+
+    results = {name: time_example(*case, configs.number) for name, case in _cases().items()}
+    print(f"{'example (ms)':<30} {'compiled':>12} {'jsonschema':>12} {'pydantic':>12}")
+    for name, times in results.items():
+        row = " ".join(f"{seconds * 1e3:>12.3f}" for seconds in times.values())
+        print(f"{name:<30} {row}")
+    if configs.output:
+        Path(configs.output).write_text(json.dumps(results, indent=3))
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
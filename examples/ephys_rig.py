@@ -85,6 +85,7 @@ probe_camera = Camera(
     sensor_format="1/2.9",
     sensor_format_unit="inches",
     chroma="Color",
+    cooling="Air",
 )
 
 stick_lens = Lens(name="Probe lens", manufacturer=Organization.EDMUND_OPTICS)
@@ -137,6 +138,7 @@ face_camera = Camera(
     sensor_format="1/2.9",
     sensor_format_unit="inches",
     chroma="Monochrome",
+    cooling="Air",
 )
 
 camassm1 = CameraAssembly(
@@ -159,6 +161,7 @@ body_camera = Camera(
     sensor_format="1/2.9",
     sensor_format_unit="inches",
     chroma="Monochrome",
+    cooling="Air",
 )
 
 camassm2 = CameraAssembly(
@@ -196,6 +199,7 @@ rig = Rig(
     stick_microscopes=[microscope],
     mouse_platform=running_wheel,
     calibrations=[red_laser_calibration, blue_laser_calibration],
+    rig_axes=None,
 )
 
 rig.write_standard_file(prefix="ephys")
@@ -278,6 +278,7 @@ r = r.Rig(
             output={"Power mW": [5, 10, 13]},
         )
     ],
+    rig_axes=None,
 )
 
 r.write_standard_file(prefix="fip_ophys")
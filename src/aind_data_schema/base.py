@@ -1,10 +1,52 @@
 """ generic base class with supporting validators and fields for basic AIND schema """
 
+import gzip
+import inspect
+import json
+import os
 import re
+import stat
+from functools import lru_cache
 from pathlib import Path
-from typing import Generic, Optional, TypeVar
+from types import MappingProxyType
+from typing import IO, Any, ClassVar, Generic, List, Mapping, Optional, Set, Tuple, Type, TypeVar, Union, get_args
+from uuid import uuid4
 
-from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, TypeAdapter, ValidationError, model_validator
+from typing_extensions import Annotated
+
+from aind_data_schema.utils.content_hash import content_hash
+from aind_data_schema.utils.integrity import is_trusted, write_sidecar
+from aind_data_schema.utils.json_patch import apply_patch, make_patch
+from aind_data_schema.utils.json_scanner import iter_object_members
+from aind_data_schema.utils.json_stream import write_model_json
+from aind_data_schema.utils.model_construct import construct_model
+from aind_data_schema.utils.validation_diagnostics import ValidationReport, diagnose, validate_model
+
+
+class _Unloaded:
+    """Placeholder for a field that was skipped when a model was loaded"""
+
+    def __repr__(self) -> str:
+        """Readable representation"""
+        return "UNLOADED"
+
+    def __reduce__(self) -> str:
+        """Keeps the placeholder a singleton when pickled"""
+        return "UNLOADED"
+
+
+UNLOADED = _Unloaded()
+
+
+def open_standard_file(path: Union[str, Path], mode: str = "r") -> IO[str]:
+    """
+    Opens a json file for reading or writing text. Files ending in .gz are
+    transparently decompressed or compressed.
+    """
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode)
 
 
 class AindGeneric(BaseModel, extra="allow"):
@@ -19,25 +61,311 @@ class AindGeneric(BaseModel, extra="allow"):
 AindGenericType = TypeVar("AindGenericType", bound=AindGeneric)
 
 
+# Number of changes made to fields of models other than core models. Such a
+# change can't be traced to the core models holding the changed model, so it
+# makes the validity recorded on every core model out of date.
+_nested_changes = 0
+
+
 class AindModel(BaseModel, Generic[AindGenericType]):
     """BaseModel that disallows extra fields"""
 
     model_config = ConfigDict(extra="forbid", use_enum_values=True)
 
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Sets an attribute, noting changes to fields"""
+        if not name.startswith("_"):
+            self._field_changed()
+        super().__setattr__(name, value)
+
+    def _field_changed(self) -> None:
+        """Notes that a field of a model that may be held by core models was changed"""
+        global _nested_changes
+        _nested_changes += 1
+
 
 class AindCoreModel(AindModel):
     """Generic base class to hold common fields/validators/etc for all basic AIND schema"""
 
+    # Schemas are built when a core model is first used rather than on import
+    model_config = ConfigDict(defer_build=True)
+
     _FILE_EXTENSION = PrivateAttr(default=".json")
     _DESCRIBED_BY_BASE_URL = PrivateAttr(
         default="https://raw.githubusercontent.com/AllenNeuralDynamics/aind-data-schema/main/src/"
     )
+    # Result of the last validation of this instance, with the number of
+    # changes to nested models made by then (see _is_valid)
+    _validity: Optional[Tuple[bool, int]] = PrivateAttr(default=None)
+    # Private attributes that record how an instance was validated rather
+    # than what it holds, and are ignored when comparing instances
+    _VALIDATION_RECORDS: ClassVar[Set[str]] = frozenset({"_validity"})
+
+    # Map of each field holding another core model (e.g. Optional[Subject])
+    # to that core model class. Computed once when the class is created.
+    core_field_classes: ClassVar[Mapping[str, Type["AindCoreModel"]]] = MappingProxyType({})
 
     describedBy: str = Field(...)
     schema_version: str = Field(
         ..., pattern=r"^\d+.\d+.\d+$", description="schema version", title="Version", frozen=True
     )
 
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        """Precomputes the map of fields holding other core models"""
+        super().__pydantic_init_subclass__(**kwargs)
+        core_field_classes = dict()
+        for field_name, field_info in cls.model_fields.items():
+            field_classes = [
+                f for f in get_args(field_info.annotation) if inspect.isclass(f) and issubclass(f, AindCoreModel)
+            ]
+            if field_classes:
+                core_field_classes[field_name] = field_classes[0]
+        cls.core_field_classes = MappingProxyType(core_field_classes)
+
+    @classmethod
+    def model_rebuild(cls, *, force: bool = False, _parent_namespace_depth: int = 2, **kwargs) -> Optional[bool]:
+        """
+        Builds the schemas of the core models held in fields first, e.g. the
+        Subject of a Metadata, so their schemas are reused rather than
+        rebuilt inline, which loses their discriminated unions
+        """
+        for field_class in cls.core_field_classes.values():
+            if not field_class.__pydantic_complete__:
+                field_class.model_rebuild(_parent_namespace_depth=0)
+        if _parent_namespace_depth > 0:
+            _parent_namespace_depth += 1
+        return super().model_rebuild(force=force, _parent_namespace_depth=_parent_namespace_depth, **kwargs)
+
+    @model_validator(mode="wrap")
+    def _record_validity(cls, value, handler):
+        """Records that a newly validated instance passed validation"""
+        # Existing instances are passed through as-is and keep their status
+        if isinstance(value, cls):
+            return handler(value)
+        validated = handler(value)
+        validated._is_valid = True
+        return validated
+
+    @property
+    def _is_valid(self) -> Optional[bool]:
+        """
+        Whether this instance passed its last validation. None if it was built
+        without validation (e.g. model_construct), or if it may have changed
+        since: setting one of its fields clears the result, and so does
+        setting a field of any model that is not a core model, since it may be
+        nested in this one. Changes made in place to lists and dictionaries
+        are not noticed, so check_validity must be called after them.
+        """
+        if self._validity is None or self._validity[1] != _nested_changes:
+            return None
+        return self._validity[0]
+
+    @_is_valid.setter
+    def _is_valid(self, valid: Optional[bool]) -> None:
+        """Records the result of a validation of the current contents"""
+        self._validity = None if valid is None else (valid, _nested_changes)
+
+    def _field_changed(self) -> None:
+        """Forgets the result of the last validation"""
+        self._validity = None
+
+    def model_copy(self, *, update: Optional[Mapping[str, Any]] = None, deep: bool = False):
+        """Copies the model. Copies with updated fields are not considered validated."""
+        copied = super().model_copy(update=update, deep=deep)
+        if update:
+            copied._validity = None
+        return copied
+
+    def __eq__(self, other: Any) -> bool:
+        """Compares the contents of models, whether or not they have been validated"""
+        if not isinstance(other, AindCoreModel):
+            return super().__eq__(other)
+        return (
+            self.__class__ == other.__class__
+            and self.__dict__ == other.__dict__
+            and self.__pydantic_extra__ == other.__pydantic_extra__
+            and self._private_contents() == other._private_contents()
+        )
+
+    def _private_contents(self) -> dict:
+        """Returns the private attributes, without the records of validation"""
+        return {
+            name: value
+            for name, value in (self.__pydantic_private__ or {}).items()
+            if name not in self._VALIDATION_RECORDS
+        }
+
+    def check_validity(self) -> bool:
+        """
+        Validates the current contents of this instance, which may have been
+        changed since it was built, and records the result on the instance.
+        Metadata only calls it if the recorded result may be out of date.
+        """
+        try:
+            data = self.model_dump(by_alias=True)
+        except TypeError:
+            # Sets of models, e.g. the modalities of a rig, are dumped to sets
+            # of dictionaries, which can not be hashed
+            data = json.loads(self.model_dump_json(by_alias=True))
+        try:
+            self.__class__.model_validate(data)
+            self._is_valid = True
+        except ValidationError:
+            self._is_valid = False
+        return self._is_valid
+
+    @classmethod
+    def diagnose(cls, data: Union[str, bytes, dict]) -> ValidationReport:
+        """
+        Validates a dictionary or json string without stopping at the first
+        failing custom validator. Returns a report with every error, its JSON
+        path, and the time spent in each custom validator.
+        """
+        report = diagnose(cls, data)
+        if report.model is not None and not report.is_valid:
+            report.model._is_valid = False
+        return report
+
+    @classmethod
+    def _validate_or_construct(cls, value: Union[str, dict]):
+        """
+        Validates a model from a dictionary or json string. If a validation
+        error is raised, the model is constructed without validation instead.
+        Returns None if the json can't be decoded into an object, e.g. if it
+        is truncated.
+        """
+        try:
+            return validate_model(cls, value)
+        except ValidationError:
+            try:
+                model = cls.model_construct(**(value if isinstance(value, dict) else json.loads(value)))
+            except (ValueError, TypeError):
+                return None
+            model._is_valid = False
+            return model
+
+    @classmethod
+    def load(cls, path: Union[str, Path], include: Optional[Set[str]] = None):
+        """
+        Loads a model from a json file
+        Parameters
+        ----------
+        path: Union[str, Path]
+            Path to the json file
+
+        include: Optional[Set[str]]
+            Optional set of top-level fields to load, by field name or alias.
+            The json of every other field is skipped without being decoded,
+            and the field is set to UNLOADED. Loaded fields are validated on
+            their own, with invalid core models constructed without
+            validation. Included fields missing from the file get their
+            default, unless it would be generated (e.g. a new id), in which
+            case they are UNLOADED too. Fields that are UNLOADED are left out
+            when the model is dumped, and the model can't be written with
+            write_standard_file. If None, the whole model is validated.
+            Default: None
+
+        """
+        with open_standard_file(path, "r") as f:
+            contents = f.read()
+        if include is None:
+            return cls.model_validate_json(contents)
+
+        # Files may use either the field names or the aliases, e.g. id or _id
+        field_names = dict()
+        for field_name, field_info in cls.model_fields.items():
+            if field_name in include or field_info.alias in include:
+                field_names[field_name] = field_name
+                if field_info.alias:
+                    field_names[field_info.alias] = field_name
+        values = {field_name: UNLOADED for field_name in cls.model_fields if field_name not in field_names}
+        for key, raw_value in iter_object_members(contents, keys=set(field_names)):
+            field_name = field_names[key]
+            if field_name in cls.core_field_classes and raw_value != "null":
+                values[field_name] = cls.core_field_classes[field_name]._validate_or_construct(raw_value)
+            else:
+                values[field_name] = _field_adapter(cls, field_name).validate_json(raw_value)
+        for field_name in set(field_names.values()) - set(values):
+            if cls.model_fields[field_name].default_factory is not None:
+                values[field_name] = UNLOADED
+        return cls.model_construct(**values)
+
+    def _unloaded_fields(self) -> List[str]:
+        """Returns the names of the fields that were skipped when this model was loaded (see load)"""
+        return [field_name for field_name, value in self.__dict__.items() if value is UNLOADED]
+
+    def _exclude_unloaded(self, exclude: Any) -> Any:
+        """Adds the fields that were skipped when this model was loaded to the fields excluded from a dump"""
+        unloaded = self._unloaded_fields()
+        if not unloaded:
+            return exclude
+        if isinstance(exclude, dict):
+            return {**exclude, **{field_name: True for field_name in unloaded}}
+        return set(exclude or ()) | set(unloaded)
+
+    def model_dump(self, **kwargs) -> dict:
+        """Dumps to a dictionary, leaving out the fields that were not loaded"""
+        kwargs["exclude"] = self._exclude_unloaded(kwargs.get("exclude"))
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        """Dumps to json, leaving out the fields that were not loaded"""
+        kwargs["exclude"] = self._exclude_unloaded(kwargs.get("exclude"))
+        return super().model_dump_json(**kwargs)
+
+    @classmethod
+    def load_trusted(cls, path: Union[str, Path]):
+        """
+        Loads a model from a json file without validating it, if the file's
+        sidecar (see write_standard_file) shows that it is unchanged since a
+        valid model was written with the same schema and library versions.
+        The model is then built recursively with model_construct, with the
+        same nested types as a validated model. Otherwise, the file is fully
+        validated.
+        """
+        with open_standard_file(path, "r") as f:
+            contents = f.read()
+        if is_trusted(path, contents, cls.model_fields["schema_version"].default):
+            return cls._construct_trusted(json.loads(contents))
+        return cls.model_validate_json(contents)
+
+    @classmethod
+    def _construct_trusted(cls, contents: dict):
+        """Builds a model known to be valid from its json contents"""
+        model = construct_model(cls, contents)
+        model._is_valid = True
+        return model
+
+    def diff(self, other: "AindCoreModel") -> List[dict]:
+        """
+        Returns the JSON-Patch (RFC 6902) operations that turn this model into
+        other. Paths use the serialized (aliased) field names. The models are
+        compared directly rather than dumped, and unchanged subtrees are
+        skipped without being walked.
+        """
+        unloaded = self._unloaded_fields() + other._unloaded_fields()
+        if unloaded:
+            raise ValueError(f"Can't diff a partially loaded model. These fields were not loaded: {unloaded}")
+        return make_patch(self, other)
+
+    def apply_patch(self, patch: List[dict]):
+        """
+        Returns a new, validated instance with the JSON-Patch operations
+        (e.g. from diff) applied. This instance is not modified.
+        """
+        document = apply_patch(self.model_dump(mode="json", by_alias=True), patch, in_place=True)
+        return self.__class__.model_validate(document)
+
+    def content_hash(self) -> str:
+        """
+        Returns a canonical sha256 hash of the contents of this model, e.g. to
+        use as a cache or deduplication key. Models with the same contents have
+        the same hash regardless of key order, decimal precision (1.0 vs 1.00),
+        enum members vs values, or the timezone of datetimes.
+        """
+        return content_hash(self)
+
     @classmethod
     def default_filename(cls):
         """
@@ -52,12 +380,78 @@ class AindCoreModel(AindModel):
 
         return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower() + cls._FILE_EXTENSION.default
 
+    @classmethod
+    def _standard_filename(cls, prefix: Optional[str] = None, suffix: Optional[str] = None) -> str:
+        """Returns the standard filename with an optional prefix and suffix"""
+        filename = cls.default_filename()
+        if prefix:
+            filename = str(prefix) + "_" + filename
+        if suffix:
+            filename = filename.replace(cls._FILE_EXTENSION.default, suffix)
+        return filename
+
+    @classmethod
+    def find_standard_file(
+        cls, input_directory: Union[str, Path], prefix: Optional[str] = None, suffix: Optional[str] = None
+    ) -> Optional[Path]:
+        """
+        Returns the path of the standard json file in a directory, or of its
+        gzipped version, or None if neither exists
+        """
+        path = Path(input_directory) / cls._standard_filename(prefix, suffix)
+        for candidate in (path, path.with_name(path.name + ".gz")):
+            if candidate.is_file():
+                return candidate
+        return None
+
+    @classmethod
+    def read_standard_file(
+        cls,
+        input_directory: Optional[Path] = None,
+        prefix: Optional[str] = None,
+        suffix: Optional[str] = None,
+        trusted: bool = False,
+    ):
+        """
+        Reads a model from its standard json file, as written by
+        write_standard_file. A gzipped file is read if it is the only one.
+        Parameters
+        ----------
+        input_directory: Optional[Path]
+            optional Path object for input directory.
+            Default: None
+
+        prefix: Optional[str]
+            optional str for intended filepath with extra naming convention
+            Default: None
+
+        suffix: Optional[str]
+            optional str for intended filepath with extra naming convention
+            Default: None
+
+        trusted: bool
+            skip validation if the file's sidecar matches, see load_trusted
+            Default: False
+
+        """
+        path = cls.find_standard_file(input_directory or Path("."), prefix, suffix)
+        if path is None:
+            raise FileNotFoundError(
+                f"No {cls._standard_filename(prefix, suffix)} file in {input_directory or Path('.')}"
+            )
+        return cls.load_trusted(path) if trusted else cls.load(path)
+
     def write_standard_file(
         self,
         output_directory: Optional[Path] = None,
         prefix: Optional[str] = None,
         suffix: Optional[str] = None,
-    ):
+        compact: bool = False,
+        compress: bool = False,
+        atomic: bool = False,
+        stream: bool = False,
+        sidecar: bool = False,
+    ) -> Path:
         """
         Writes schema to standard json file
         Parameters
@@ -74,16 +468,108 @@ class AindCoreModel(AindModel):
             optional str for intended filepath with extra naming convention
             Default: None
 
+        compact: bool
+            write the json without indentation or newlines
+            Default: False
+
+        compress: bool
+            gzip the file and append .gz to the filename. The file can be read
+            back with load.
+            Default: False
+
+        atomic: bool
+            write to a temporary file in the output directory and rename it
+            once complete, so that a failed write never leaves a truncated file
+            Default: False
+
+        stream: bool
+            write the json incrementally, field by field and list element by
+            list element, instead of building it as one string first. The
+            output is identical.
+            Default: False
+
+        sidecar: bool
+            also write a sidecar file with the hash of the json, the schema
+            version and the library version, so that the file can be loaded
+            without validation by load_trusted. The written json is validated
+            once, and the sidecar records whether it was valid.
+            Default: False
+
+        Returns
+        -------
+        Path
+            path of the written file
+
         """
-        filename = self.default_filename()
-        if prefix:
-            filename = str(prefix) + "_" + filename
-        if suffix:
-            filename = filename.replace(self._FILE_EXTENSION, suffix)
+        unloaded = self._unloaded_fields()
+        if unloaded:
+            raise ValueError(f"Can't write a partially loaded model. These fields were not loaded: {unloaded}")
+        filename = self._standard_filename(prefix, suffix)
+        if compress:
+            filename += ".gz"
 
         if output_directory is not None:
             output_directory = Path(output_directory)
             filename = output_directory / filename
 
-        with open(filename, "w") as f:
-            f.write(self.model_dump_json(indent=3))
+        indent = None if compact else 3
+        if not atomic:
+            with open_standard_file(filename, "w") as f:
+                self._write_json(f, indent, stream)
+        else:
+            self._write_json_atomic(filename, indent, stream)
+        if sidecar:
+            self._write_sidecar(filename)
+        return Path(filename)
+
+    def _write_json_atomic(self, filename: Union[str, Path], indent: Optional[int], stream: bool) -> None:
+        """Writes the json of this model to a temporary file, then renames it"""
+        # The temporary file keeps the extension, so it is compressed the same way
+        temp_filename = Path(filename).with_name(f".{uuid4().hex[:8]}.{Path(filename).name}")
+        # Unlike tempfile.mkstemp, which only lets the owner read the file,
+        # this gives the file the same permissions as open() would
+        os.close(os.open(temp_filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        try:
+            if os.path.exists(filename):
+                os.chmod(temp_filename, stat.S_IMODE(os.stat(filename).st_mode))
+            with open_standard_file(temp_filename, "w") as f:
+                self._write_json(f, indent, stream)
+            # Make sure the contents are on disk before they replace the old file
+            fd = os.open(temp_filename, os.O_RDWR)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
+
+    def _write_json(self, f: IO[str], indent: Optional[int], stream: bool) -> None:
+        """Writes the json of this model to a file handle"""
+        if stream:
+            write_model_json(self, f, indent=indent)
+        else:
+            f.write(self.model_dump_json(indent=indent))
+
+    def _write_sidecar(self, filename: Union[str, Path]) -> None:
+        """
+        Writes the sidecar of a json file written by this model. The sidecar
+        only marks the file as valid if the json read back from it validates,
+        since the model itself may have been changed since it was validated.
+        """
+        with open_standard_file(filename, "r") as f:
+            contents = f.read()
+        try:
+            self.__class__.model_validate_json(contents)
+            valid = True
+        except ValidationError:
+            valid = False
+        write_sidecar(filename, contents, self.schema_version, valid)
+
+
+@lru_cache(maxsize=None)
+def _field_adapter(model_class: Type[BaseModel], field_name: str) -> TypeAdapter:
+    """Builds (once) a validator for a single field of a model"""
+    field_info = model_class.model_fields[field_name]
+    return TypeAdapter(Annotated[field_info.annotation, field_info])
@@ -1 +1,42 @@
 """ Core schemas """
+
+import importlib
+import pkgutil
+
+# Module holding each core model. Modules are imported the first time one of
+# their models is accessed, e.g. aind_data_schema.core.Subject.
+_MODEL_MODULES = {
+    "Acquisition": "acquisition",
+    "DataDescription": "data_description",
+    "RawDataDescription": "data_description",
+    "DerivedDataDescription": "data_description",
+    "AnalysisDescription": "data_description",
+    "Instrument": "instrument",
+    "Metadata": "metadata",
+    "MriSession": "mri_session",
+    "Procedures": "procedures",
+    "Processing": "processing",
+    "Rig": "rig",
+    "Session": "session",
+    "Subject": "subject",
+}
+
+__all__ = list(_MODEL_MODULES)
+
+
+def __getattr__(name: str):
+    """Imports the module holding a core model on first access"""
+    if name not in _MODEL_MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(f"{__name__}.{_MODEL_MODULES[name]}"), name)
+
+
+def __dir__():
+    """Lists the lazily imported core models alongside the module attributes"""
+    return sorted(set(globals()) | set(__all__))
+
+
+def import_core_modules():
+    """Imports every module in the core package, so that every core model class is defined"""
+    for module_info in pkgutil.iter_modules(__path__):
+        importlib.import_module(f"{__name__}.{module_info.name}")
@@ -1,14 +1,33 @@
 """Generic metadata class for Data Asset Records."""
 
 import inspect
+import json
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Literal, Optional, get_args
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from uuid import UUID, uuid4
 
-from pydantic import Field, PrivateAttr, ValidationError, ValidationInfo, field_validator, model_validator
+from pydantic import ConfigDict, Field, PrivateAttr, ValidationError, ValidationInfo, field_validator, model_validator
 
-from aind_data_schema.base import AindCoreModel
+from aind_data_schema.base import AindCoreModel, _field_adapter, open_standard_file
 from aind_data_schema.core.acquisition import Acquisition
 from aind_data_schema.core.data_description import DataDescription
 from aind_data_schema.core.instrument import Instrument
@@ -18,6 +37,7 @@ from aind_data_schema.core.rig import Rig
 from aind_data_schema.core.session import Session
 from aind_data_schema.core.subject import Subject
 from aind_data_schema.models.platforms import Ecephys, SmartSpim
+from aind_data_schema.utils.json_scanner import iter_object_members
 
 
 class MetadataStatus(Enum):
@@ -35,6 +55,72 @@ class ExternalPlatforms(Enum):
     CODEOCEAN = "Code Ocean"
 
 
+def _get_surgery_procedures(procedures: Procedures) -> list:
+    """Collects every procedure performed during a surgery in one pass"""
+    return [
+        procedure
+        for subject_procedure in getattr(procedures, "subject_procedures", [])
+        if isinstance(subject_procedure, Surgery)
+        for procedure in subject_procedure.procedures
+    ]
+
+
+def check_injection_materials(surgery_procedures: list) -> Optional[str]:
+    """Checks that every injection lists its injection materials"""
+    if any(
+        isinstance(procedure, Injection) and getattr(procedure, "injection_materials", []) == []
+        for procedure in surgery_procedures
+    ):
+        return "Injection is missing injection_materials."
+    return None
+
+
+class PlatformRequirements(NamedTuple):
+    """Core fields and procedure checks that a platform requires"""
+
+    required_fields: Tuple[str, ...]
+    procedure_checks: Tuple[Callable[[list], Optional[str]], ...] = ()
+
+
+PLATFORM_REQUIREMENTS = {
+    Ecephys: PlatformRequirements(
+        required_fields=("subject", "procedures", "session", "rig", "processing"),
+        procedure_checks=(check_injection_materials,),
+    ),
+    SmartSpim: PlatformRequirements(
+        required_fields=("subject", "procedures", "acquisition", "instrument"),
+        procedure_checks=(check_injection_materials,),
+    ),
+}
+
+# Requirements keyed by platform name, so they can be looked up directly
+# from either a platform class or a platform instance
+_PLATFORM_REQUIREMENTS_BY_NAME = {
+    platform.model_fields["name"].default: (platform.__name__, requirements)
+    for platform, requirements in PLATFORM_REQUIREMENTS.items()
+}
+
+
+def _get_platform_name(platform) -> Optional[str]:
+    """Gets the name of a platform class, instance, or dictionary"""
+    if inspect.isclass(platform):
+        return platform.model_fields["name"].default
+    if isinstance(platform, dict):
+        return platform.get("name")
+    return getattr(platform, "name", None)
+
+
+class MetadataValidationResult(NamedTuple):
+    """Outcome of validating a single record with Metadata.validate_many"""
+
+    index: int
+    source: str
+    metadata_status: MetadataStatus
+    metadata: Optional["Metadata"]
+    errors: List[str]
+    elapsed: float
+
+
 class Metadata(AindCoreModel):
     """The records in the Data Asset Collection needs to contain certain fields
     to easily query and index the data."""
@@ -43,6 +129,17 @@ class Metadata(AindCoreModel):
     # The models base on this schema will be saved to metadata.nd.json as
     # default
     _FILE_EXTENSION = PrivateAttr(default=".nd.json")
+    # Status of each core model field, determined once during validation
+    _core_field_status: Dict[str, MetadataStatus] = PrivateAttr(default={})
+    # Raw json of core model fields that are loaded lazily and not yet accessed
+    _raw_core_fields: Dict[str, str] = PrivateAttr(default={})
+    # Whether the platform requirements of a lazily loaded record are still to be checked
+    _platform_check_pending: bool = PrivateAttr(default=False)
+    _VALIDATION_RECORDS: ClassVar[Set[str]] = frozenset({"_validity", "_core_field_status"})
+
+    # Files written by write_standard_file use the field name id rather than
+    # the _id alias, so both are accepted
+    model_config = ConfigDict(populate_by_name=True)
 
     _DESCRIBED_BY_URL = AindCoreModel._DESCRIBED_BY_BASE_URL.default + "aind_data_schema/core/metadata.py"
     describedBy: str = Field(_DESCRIBED_BY_URL, json_schema_extra={"const": _DESCRIBED_BY_URL})
@@ -117,117 +214,450 @@ class Metadata(AindCoreModel):
     )
     def validate_core_fields(cls, value, info: ValidationInfo):
         """Don't automatically raise errors if the core models are invalid"""
+        return cls._validate_core_model(info.field_name, value)
 
-        # extract field from Optional[<class>] annotation
-        field_name = info.field_name
-        field_class = [f for f in get_args(cls.model_fields[field_name].annotation) if inspect.isclass(f)][0]
-
-        # If the input is a json object, we will try to create the field
+    @classmethod
+    def _validate_core_model(cls, field_name: str, value: Any) -> Any:
+        """
+        Validates the value of a core model field and records whether it is
+        valid on the core model. Json objects are validated into a new core
+        model. Core model instances keep the result of their last validation,
+        and are only validated if they were built without validation or may
+        have changed since (see AindCoreModel._is_valid).
+        """
+        core_class = cls.core_field_classes[field_name]
         if isinstance(value, dict):
-            try:
-                core_model = field_class.model_validate_json(value)
-            # If a validation error is raised,
-            # we will construct the field without validation.
-            except ValidationError:
-                core_model = field_class.model_construct(**value)
-        else:
-            core_model = value
-        return core_model
+            return core_class._validate_or_construct(value)
+        if isinstance(value, core_class) and value._is_valid is None:
+            value.check_validity()
+        return value
 
     @model_validator(mode="after")
     def validate_metadata(self):
         """Validator for metadata"""
 
-        all_model_fields = dict()
-        for field_name in self.model_fields:
-            # The fields we're interested in are optional. We need to extract out the
-            # class using the get_args method
-            annotation_args = get_args(self.model_fields[field_name].annotation)
-            optional_classes = (
-                None
-                if not annotation_args
-                else (
-                    [
-                        f
-                        for f in get_args(self.model_fields[field_name].annotation)
-                        if inspect.isclass(f) and issubclass(f, AindCoreModel)
-                    ]
-                )
-            )
-            if (
-                optional_classes
-                and inspect.isclass(optional_classes[0])
-                and issubclass(optional_classes[0], AindCoreModel)
-            ):
-                all_model_fields[field_name] = optional_classes[0]
-
         # For each model field, check that is present and check if the model
         # is valid. If it isn't valid, still add it, but mark MetadataStatus
-        # as INVALID
-        metadata_status = MetadataStatus.VALID
-        for field_name, model_class in all_model_fields.items():
-            if getattr(self, field_name) is not None:
-                model = getattr(self, field_name)
-                model_contents = model.model_dump()
-                try:
-                    model_class(**model_contents)
-                except ValidationError:
-                    metadata_status = MetadataStatus.INVALID
-        # For certain required fields, like subject, if they are not present,
-        # mark the metadata record as missing
-        if self.subject is None:
-            metadata_status = MetadataStatus.MISSING
-        self.metadata_status = metadata_status
+        # as INVALID. The validity of each core model was recorded when the
+        # field was validated, and is kept in the per-field status map.
+        self._core_field_status = {
+            field_name: self._get_core_model_status(getattr(self, field_name)) for field_name in self.core_field_classes
+        }
+        self.metadata_status = self._compute_metadata_status()
         # return values
         return self
 
-    @model_validator(mode="after")
-    def validate_smartspim_metadata(self):
-        """Validator for smartspim metadata"""
-        if (
-            self.data_description
-            and self.data_description.platform == SmartSpim
-            and not (self.subject and self.procedures and self.acquisition and self.instrument)
-        ):
-            raise ValueError(
-                "Missing some metadata for SmartSpim. Requires subject, procedures, acquisition, and instrument."
-            )
-        if (
-            self.data_description
-            and self.data_description.platform == SmartSpim
-            and self.procedures
-            and any(
-                isinstance(surgery, Injection) and getattr(surgery, "injection_materials", []) == []
-                for subject_procedure in self.procedures.subject_procedures
-                if isinstance(subject_procedure, Surgery)
-                for surgery in subject_procedure.procedures
-            )
-        ):
-            raise ValueError("Injection is missing injection_materials.")
+    @staticmethod
+    def _get_core_model_status(model: Optional[AindCoreModel]) -> MetadataStatus:
+        """Status of a single core model field"""
+        if model is None:
+            return MetadataStatus.MISSING
+        return MetadataStatus.VALID if model._is_valid else MetadataStatus.INVALID
 
-        return self
+    def _compute_metadata_status(self) -> MetadataStatus:
+        """Computes the overall status from the per-field status map"""
+        # For certain required fields, like subject, if they are not present,
+        # mark the metadata record as missing
+        if self._core_field_status.get("subject", MetadataStatus.MISSING) == MetadataStatus.MISSING:
+            return MetadataStatus.MISSING
+        if MetadataStatus.INVALID in self._core_field_status.values():
+            return MetadataStatus.INVALID
+        return MetadataStatus.VALID
+
+    @classmethod
+    def model_validate_json_lazy(cls, json_data: Union[str, bytes]) -> "Metadata":
+        """
+        Loads metadata from json without parsing the core model fields. The
+        raw json of each core model is kept and only parsed and validated when
+        the field is first accessed. Until then, the field's status is
+        UNKNOWN, and the metadata_status stored in the json is used until
+        every field is loaded or a loaded field is invalid. The requirements of
+        the data description's platform are checked when the first core model
+        field is loaded, so a record that does not meet them raises a
+        ValueError then rather than here.
+        Parameters
+        ----------
+        json_data: Union[str, bytes]
+            Json of a metadata record
+
+        Returns
+        -------
+        Metadata
+
+        """
+        raw_core_fields = dict()
+        contents = dict()
+        for key, raw_value in iter_object_members(json_data):
+            if key in cls.core_field_classes and raw_value != "null":
+                raw_core_fields[key] = raw_value
+            else:
+                contents[key] = json.loads(raw_value)
+        metadata = cls.model_validate(contents)
+        for field_name in raw_core_fields:
+            del metadata.__dict__[field_name]
+            metadata._core_field_status[field_name] = MetadataStatus.UNKNOWN
+        metadata._raw_core_fields = raw_core_fields
+        metadata._platform_check_pending = bool(raw_core_fields)
+        metadata.metadata_status = MetadataStatus(contents.get("metadata_status", MetadataStatus.UNKNOWN.value))
+        return metadata
+
+    @classmethod
+    def _construct_trusted(cls, contents: dict) -> "Metadata":
+        """Builds a metadata record known to be valid. As with lazily loaded records,
+        the core models are not checked and the stored metadata_status is kept."""
+        metadata = super()._construct_trusted(contents)
+        metadata._core_field_status = {
+            field_name: MetadataStatus.MISSING if getattr(metadata, field_name) is None else MetadataStatus.UNKNOWN
+            for field_name in cls.core_field_classes
+        }
+        metadata.metadata_status = MetadataStatus(metadata.metadata_status)
+        return metadata
+
+    def __copy__(self) -> "Metadata":
+        """Shallow copy with its own per-field status and lazily loaded fields, which are changed in place"""
+        copied = super().__copy__()
+        copied._core_field_status = dict(self._core_field_status)
+        copied._raw_core_fields = dict(self._raw_core_fields)
+        return copied
+
+    def __getattr__(self, item: str):
+        """Materializes lazily loaded core model fields on first access"""
+        if item in self.core_field_classes and item in self._raw_core_fields:
+            return self._materialize_core_field(item)
+        return super().__getattr__(item)
+
+    def _materialize_core_field(self, field_name: str) -> AindCoreModel:
+        """Parses and validates the raw json of a lazily loaded core model field"""
+        raw_value = self._raw_core_fields.pop(field_name)
+        core_model = self.core_field_classes[field_name]._validate_or_construct(raw_value)
+        self.__dict__[field_name] = core_model
+        status = MetadataStatus.VALID if core_model is not None and core_model._is_valid else MetadataStatus.INVALID
+        self._core_field_status[field_name] = status
+        # The stored metadata_status is kept until it can be checked, i.e.
+        # once every field is loaded or as soon as one is invalid
+        if status == MetadataStatus.INVALID or not self._raw_core_fields:
+            self.metadata_status = self._compute_metadata_status()
+        # Cleared first, since the check itself may load data_description or procedures
+        if self._platform_check_pending:
+            self._platform_check_pending = False
+            error = self._check_platform_requirements()
+            if error is not None:
+                raise ValueError(error)
+        return core_model
+
+    def model_dump(self, **kwargs) -> Dict[str, Any]:
+        """Materializes any lazily loaded core model fields before dumping"""
+        for field_name in list(self._raw_core_fields):
+            self._materialize_core_field(field_name)
+        return super().model_dump(**kwargs)
+
+    def model_dump_json(self, **kwargs) -> str:
+        """Dumps to json. The raw json of lazily loaded core model fields that
+        were never accessed is passed through untouched."""
+        if kwargs.get("include") is not None or kwargs.get("exclude") is not None:
+            for field_name in list(self._raw_core_fields):
+                self._materialize_core_field(field_name)
+        dumped = super().model_dump_json(**kwargs)
+        if not self._raw_core_fields:
+            return dumped
+
+        indent = kwargs.get("indent")
+        key_separator = ":" if indent is None else ": "
+        member_separator = "," if indent is None else ",\n" + " " * indent
+        closing = "}" if indent is None else "\n}"
+        members = [json.dumps(key) + key_separator + raw_value for key, raw_value in self._raw_core_fields.items()]
+        return dumped.rstrip()[:-1].rstrip() + member_separator + member_separator.join(members) + closing
 
     @model_validator(mode="after")
-    def validate_ecephys_metadata(self):
-        """Validator for metadata"""
-        if (
-            self.data_description
-            and self.data_description.platform == Ecephys
-            and not (self.subject and self.procedures and self.session and self.rig and self.processing)
+    def validate_platform_requirements(self):
+        """Validator for the metadata required by the data description's platform"""
+        error = self._check_platform_requirements()
+        if error is not None:
+            raise ValueError(error)
+        return self
+
+    def _check_platform_requirements(
+        self, updates: Optional[Dict[str, Any]] = None, changed_fields: Optional[Set[str]] = None
+    ) -> Optional[str]:
+        """
+        Checks the requirements of the data description's platform, with the
+        values in updates replacing the current ones. If changed_fields is
+        set, the requirements are only checked if they involve one of them.
+        Returns the error message, or None if the requirements are met.
+        """
+        updates = updates or dict()
+
+        def get_field(field_name: str):
+            """Gets the updated or current value of a field"""
+            return updates[field_name] if field_name in updates else getattr(self, field_name)
+
+        platform = getattr(get_field("data_description"), "platform", None)
+        requirement = _PLATFORM_REQUIREMENTS_BY_NAME.get(_get_platform_name(platform))
+        if requirement is None:
+            return None
+        platform_label, requirements = requirement
+        if changed_fields is not None:
+            involved_fields = {"data_description", *requirements.required_fields}
+            if requirements.procedure_checks:
+                involved_fields.add("procedures")
+            if not changed_fields & involved_fields:
+                return None
+        # Lazily loaded fields are present without having to be parsed
+        if not all(
+            (field_name in self._raw_core_fields and field_name not in updates) or get_field(field_name)
+            for field_name in requirements.required_fields
         ):
-            raise ValueError(
-                "Missing some metadata for Ecephys. Requires subject, procedures, session, rig, and processing."
-            )
-        if (
-            self.data_description
-            and self.data_description.platform == Ecephys
-            and self.procedures
-            and any(
-                isinstance(surgery, Injection) and getattr(surgery, "injection_materials", []) == []
-                for subject_procedure in self.procedures.subject_procedures
-                if isinstance(subject_procedure, Surgery)
-                for surgery in subject_procedure.procedures
+            return (
+                f"Missing some metadata for {platform_label}. Requires "
+                f"{', '.join(requirements.required_fields[:-1])}, and {requirements.required_fields[-1]}."
             )
-        ):
-            raise ValueError("Injection is missing injection_materials.")
-        return self
+        procedures = get_field("procedures")
+        if procedures and requirements.procedure_checks:
+            surgery_procedures = _get_surgery_procedures(procedures)
+            for procedure_check in requirements.procedure_checks:
+                error = procedure_check(surgery_procedures)
+                if error is not None:
+                    return error
+        return None
+
+    def _validate_update(self, field_name: str, value: Any) -> Any:
+        """Validates the new value of a single field"""
+        if field_name not in self.model_fields:
+            raise ValueError(f"{self.__class__.__name__} has no field {field_name}")
+        if field_name in self.core_field_classes:
+            value = self._validate_core_model(field_name, value)
+        return _field_adapter(self.__class__, field_name).validate_python(value)
+
+    def update(self, **fields) -> None:
+        """
+        Replaces fields of this record in place, e.g. to attach processing
+        once it has run. Only the new values are validated. The cached status
+        of every other core model is reused to recompute metadata_status, and
+        only the platform requirements that involve the updated fields are
+        checked again. last_modified is set to the current time unless given.
+        Parameters
+        ----------
+        fields
+            New values by field name. Core models can be given as instances
+            or as dictionaries.
+
+        """
+        updates = {field_name: self._validate_update(field_name, value) for field_name, value in fields.items()}
+        error = self._check_platform_requirements(updates, changed_fields=set(updates))
+        if error is not None:
+            raise ValueError(error)
+
+        for field_name, value in updates.items():
+            setattr(self, field_name, value)
+            self._raw_core_fields.pop(field_name, None)
+            if field_name in self.core_field_classes:
+                self._core_field_status[field_name] = self._get_core_model_status(value)
+        if "last_modified" not in updates:
+            self.last_modified = datetime.utcnow()
+        self.metadata_status = self._compute_metadata_status()
+
+    @classmethod
+    def read_asset_directory(
+        cls,
+        directory: Union[str, Path],
+        name: Optional[str] = None,
+        location: Optional[str] = None,
+        workers: Optional[int] = None,
+        validation_workers: Optional[int] = None,
+    ) -> "Metadata":
+        """
+        Builds a metadata record from the standard files of a data asset
+        directory (subject.json, procedures.json, etc., or their gzipped
+        versions). The files are read concurrently in a thread pool. Core
+        models that fail validation are still added, and marked invalid.
+        Files that can't be decoded, e.g. truncated files, are left out and
+        their fields are marked invalid.
+        Parameters
+        ----------
+        directory: Union[str, Path]
+            Data asset directory
+
+        name: Optional[str]
+            Name of the data asset. Defaults to the name of the directory.
+
+        location: Optional[str]
+            Location of the data asset. Defaults to the directory path.
+
+        workers: Optional[int]
+            Number of threads reading files. Defaults to one per file.
+
+        validation_workers: Optional[int]
+            Number of worker processes validating the files. If None, files
+            are validated in the reading threads.
+            Default: None
+
+        Returns
+        -------
+        Metadata
+
+        """
+        directory = Path(directory)
+        paths = dict()
+        for field_name, core_class in cls.core_field_classes.items():
+            path = core_class.find_standard_file(directory)
+            if path is not None:
+                paths[field_name] = path
+
+        core_models = dict()
+        if paths:
+            with ThreadPoolExecutor(max_workers=workers or len(paths)) as executor:
+                if validation_workers is None:
+                    core_models = dict(zip(paths, executor.map(_read_core_file, paths.items())))
+                else:
+                    contents = list(executor.map(_read_file, paths.values()))
+                    with ProcessPoolExecutor(max_workers=validation_workers) as pool:
+                        core_models = dict(zip(paths, pool.map(_validate_core_field, zip(paths, contents))))
+        metadata = cls(
+            name=name if name is not None else directory.name,
+            location=location if location is not None else str(directory),
+            **core_models,
+        )
+        undecodable_fields = [field_name for field_name, core_model in core_models.items() if core_model is None]
+        if undecodable_fields:
+            for field_name in undecodable_fields:
+                metadata._core_field_status[field_name] = MetadataStatus.INVALID
+            metadata.metadata_status = metadata._compute_metadata_status()
+        return metadata
+
+    @classmethod
+    def validate_many(
+        cls,
+        records: Union[str, Path, Iterable[Union[str, dict, Path]]],
+        workers: Optional[int] = None,
+        ordered: bool = True,
+        max_pending: Optional[int] = None,
+    ) -> Iterator[MetadataValidationResult]:
+        """
+        Validates many metadata records, optionally across a process pool
+        Parameters
+        ----------
+        records: Union[str, Path, Iterable[Union[str, dict, Path]]]
+            Either a path to a JSONL file, a path to a single json file, a
+            path to a directory tree that will be searched for
+            metadata.nd.json files, or an iterable of json strings,
+            dictionaries, or file paths.
+
+        workers: Optional[int]
+            Number of worker processes. If None or 1, records are validated
+            in the current process.
+            Default: None
+
+        ordered: bool
+            Whether results are yielded in the same order as the records.
+            Default: True
+
+        max_pending: Optional[int]
+            Maximum number of records submitted to the pool at once. Bounds
+            the memory used while streaming. Defaults to 4 times workers.
+
+        Returns
+        -------
+        Iterator[MetadataValidationResult]
+            One result per record. Records with invalid core models are still
+            returned, with the core models constructed without validation.
+
+        """
+        items = enumerate(_iter_records(records))
+        if workers is None or workers <= 1:
+            for item in items:
+                yield _validate_record(item)
+            return
+
+        max_pending = max_pending or 4 * workers
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from _submit_bounded(executor, items, ordered, max_pending)
+
+
+def _submit_bounded(executor: ProcessPoolExecutor, items: Iterator, ordered: bool, max_pending: int) -> Iterator:
+    """Submits items to the pool, never holding more than max_pending at once"""
+    if ordered:
+        pending = deque()
+        for item in items:
+            pending.append(executor.submit(_validate_record, item))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    else:
+        pending = set()
+        for item in items:
+            pending.add(executor.submit(_validate_record, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                yield from (future.result() for future in done)
+        yield from (future.result() for future in pending)
+
+
+def _iter_records(records: Union[str, Path, Iterable[Union[str, dict, Path]]]) -> Iterator[Any]:
+    """Lazily yields records from a path or an iterable of records"""
+    if not isinstance(records, (str, Path)):
+        yield from records
+        return
+
+    path = Path(records)
+    if path.is_dir():
+        yield from sorted(path.rglob(Metadata.default_filename()))
+    elif path.suffix == ".jsonl":
+        with open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    yield line
+    else:
+        yield path
+
+
+def _read_file(path: Path) -> str:
+    """Reads a json file, which may be gzipped"""
+    with open_standard_file(path, "r") as f:
+        return f.read()
+
+
+def _validate_core_field(item: Tuple[str, str]) -> AindCoreModel:
+    """Validates the json of a (field name, json) pair. Defined at module level so it can run in a worker process."""
+    field_name, contents = item
+    return Metadata.core_field_classes[field_name]._validate_or_construct(contents)
+
+
+def _read_core_file(item: Tuple[str, Path]) -> AindCoreModel:
+    """Reads and validates the file of a (field name, path) pair"""
+    field_name, path = item
+    return _validate_core_field((field_name, _read_file(path)))
+
+
+def _validate_record(item) -> MetadataValidationResult:
+    """Validates a single (index, record) pair. Defined at module level so it can run in a worker process."""
+    index, record = item
+    source = str(record) if isinstance(record, Path) else f"record {index}"
+    start = time.perf_counter()
+    metadata = None
+    errors = []
+    try:
+        if isinstance(record, Path):
+            record = _read_file(record)
+        if isinstance(record, dict):
+            metadata = Metadata.model_validate(record)
+        else:
+            metadata = Metadata.model_validate_json(record)
+        metadata_status = metadata.metadata_status
+    except ValidationError as e:
+        metadata_status = MetadataStatus.INVALID
+        errors = [
+            ".".join(str(loc) for loc in error["loc"]) + ": " + error["msg"] if error["loc"] else error["msg"]
+            for error in e.errors()
+        ]
+    except OSError as e:
+        metadata_status = MetadataStatus.MISSING
+        errors = [str(e)]
+    return MetadataValidationResult(
+        index=index,
+        source=source,
+        metadata_status=metadata_status,
+        metadata=metadata,
+        errors=errors,
+        elapsed=time.perf_counter() - start,
+    )
@@ -127,14 +127,17 @@ class Rig(AindCoreModel):
             + reward_delivery_device_names
         )
 
-        for daq in daqs:
-            for channel in daq.channels:
-                if channel.device_name not in all_device_names:
-                    raise ValueError(
-                        f"Device name validation error: '{channel.device_name}' "
-                        + f"is connected to '{channel.channel_name}' on '{daq.name}', but "
-                        + "this device is not part of the rig."
-                    )
+        errors = [
+            f"Device name validation error: '{channel.device_name}' "
+            + f"is connected to '{channel.channel_name}' on '{daq.name}', but "
+            + "this device is not part of the rig."
+            for daq in daqs
+            for channel in daq.channels
+            if channel.device_name not in all_device_names
+        ]
+        if len(errors) > 0:
+            message = "\n     ".join(errors)
+            raise ValueError(message)
         return daqs
 
     @staticmethod
@@ -8,6 +8,7 @@ from pydantic import Field
 
 from aind_data_schema.base import AindModel
 from aind_data_schema.models.units import AngleUnit, SizeUnit
+from aind_data_schema.utils.numeric_mode import float_mode_model
 
 
 class CcfVersion(str, Enum):
@@ -50,6 +51,7 @@ class CoordinateTransform(AindModel):
     type: str = Field(..., title="transformation type")
 
 
+@float_mode_model
 class Scale3dTransform(CoordinateTransform):
     """Values to be vector-multiplied with a 3D position, equivalent to the diagonals of a 3x3 transform matrix.
     Represents voxel spacing if used as the first applied coordinate transform.
@@ -59,6 +61,7 @@ class Scale3dTransform(CoordinateTransform):
     scale: List[Decimal] = Field(..., title="3D scale parameters", min_length=3, max_length=3)
 
 
+@float_mode_model
 class Translation3dTransform(CoordinateTransform):
     """Values to be vector-added to a 3D position. Often needed to specify a device or tile's origin."""
 
@@ -66,6 +69,7 @@ class Translation3dTransform(CoordinateTransform):
     translation: List[Decimal] = Field(..., title="3D translation parameters", min_length=3, max_length=3)
 
 
+@float_mode_model
 class Rotation3dTransform(CoordinateTransform):
     """Values to be vector-added to a 3D position. Often needed to specify a device or tile's origin."""
 
@@ -73,6 +77,7 @@ class Rotation3dTransform(CoordinateTransform):
     rotation: List[Decimal] = Field(..., title="3D rotation matrix values (3x3) ", min_length=9, max_length=9)
 
 
+@float_mode_model
 class Affine3dTransform(CoordinateTransform):
     """Values to be vector-added to a 3D position. Often needed to specify a Tile's origin."""
 
@@ -125,6 +130,7 @@ class ModuleOrientation3d(AindModel):
     unit: AngleUnit = Field(AngleUnit.DEG, title="Angle unit")
 
 
+@float_mode_model
 class Coordinates3d(AindModel):
     """Coordinates in a 3D grid"""
 
@@ -134,6 +140,7 @@ class Coordinates3d(AindModel):
     unit: SizeUnit = Field(SizeUnit.UM, title="Position unit")
 
 
+@float_mode_model
 class CcfCoords(AindModel):
     """Coordinates in CCF template space"""
 
@@ -5,7 +5,7 @@ from typing import Literal, Union
 from pydantic import ConfigDict, Field
 from typing_extensions import Annotated
 
-from aind_data_schema.models.pid_names import BaseName
+from aind_data_schema.models.pid_names import BaseName, shared_names
 
 
 class _Modality(BaseName):
@@ -116,27 +116,28 @@ class Spim(_Modality):
     abbreviation: Literal["SPIM"] = "SPIM"
 
 
+@shared_names
 class Modality:
     """Modality classes"""
 
-    BEHAVIOR = Behavior()
-    BEHAVIOR_VIDEOS = BehaviorVideos()
-    CONFOCAL = Confocal()
-    ECEPHYS = Ecephys()
-    EMG = Electromyography()
-    FMOST = Fmost()
-    ICEPHYS = Icephys()
-    FIB = Fib()
-    ISI = Isi()
-    MERFISH = Merfish()
-    MRI = Mri()
-    POPHYS = POphys()
-    SLAP = Slap()
-    SPIM = Spim()
+    BEHAVIOR = Behavior.model_construct()
+    BEHAVIOR_VIDEOS = BehaviorVideos.model_construct()
+    CONFOCAL = Confocal.model_construct()
+    ECEPHYS = Ecephys.model_construct()
+    EMG = Electromyography.model_construct()
+    FMOST = Fmost.model_construct()
+    ICEPHYS = Icephys.model_construct()
+    FIB = Fib.model_construct()
+    ISI = Isi.model_construct()
+    MERFISH = Merfish.model_construct()
+    MRI = Mri.model_construct()
+    POPHYS = POphys.model_construct()
+    SLAP = Slap.model_construct()
+    SPIM = Spim.model_construct()
     _ALL = tuple(_Modality.__subclasses__())
     ONE_OF = Annotated[Union[_ALL], Field(discriminator="name")]
 
-    _abbreviation_map = {m().abbreviation: m() for m in _ALL}
+    _abbreviation_map = {m.model_construct().abbreviation: m.model_construct() for m in _ALL}
 
     @classmethod
     def from_abbreviation(cls, abbreviation: str):
@@ -5,7 +5,7 @@ from typing import Literal, Union
 from pydantic import ConfigDict, Field
 from typing_extensions import Annotated
 
-from aind_data_schema.models.pid_names import PIDName
+from aind_data_schema.models.pid_names import PIDName, shared_names
 from aind_data_schema.models.registry import Registry, ResearchOrganizationRegistry
 
 
@@ -665,86 +665,87 @@ class Other(_Organization):
     registry_identifier: Literal[None] = Field(None)
 
 
+@shared_names
 class Organization:
     """Organization definitions"""
 
-    AA_OPTO = AAOptoElectronic()
-    ABCAM = Abcam()
-    AILIPU = AilipuTechnologyCo()
-    AI = AllenInstitute()
-    AIBS = AllenInstituteForBrainScience()
-    AIND = AllenInstituteForNeuralDynamics()
-    ALLIED = Allied()
-    ASI = AppliedScientificInstrumentation()
-    ASUS = Asus()
-    AVCOSTAR = ArecontVisionCostar()
-    BASLER = Basler()
-    CAMBRIDGE_TECHNOLOGY = CambridgeTechnology()
-    CHAMPALIMAUD = ChampalimaudFoundation()
-    CHROMA = Chroma()
-    COHERENT_SCIENTIFIC = CoherentScientific()
-    COLUMBIA = ColumbiaUniversity()
-    COMPUTAR = Computar()
-    CONOPTICS = Conoptics()
-    CUSTOM = Custom()
-    DODOTRONIC = Dodotronic()
-    DORIC = Doric()
-    EALING = Ealing()
-    EDMUND_OPTICS = EdmundOptics()
-    EURESYS = Euresys()
-    FLIR = TeledyneFLIR()
-    FUJINON = Fujinon()
-    HAMAMATSU = Hamamatsu()
-    HUST = HuazhongUniversityOfScienceAndTechnology()
-    IMAGING_SOURCE = TheImagingSource()
-    IMEC = InteruniversityMicroelectronicsCenter()
-    INFINITY_PHOTO_OPTICAL = InfinityPhotoOptical()
-    ISL = ISLProductsInternational()
-    JAX = JacksonLaboratory()
-    JULABO = Julabo()
-    LEE = TheLeeCompany()
-    LEICA = Leica()
-    LG = Lg()
-    LIFECANVAS = LifeCanvas()
-    MEADOWLARK = MeadowlarkOptics()
-    MIGHTY_ZAP = IRRobotCo()
-    MITUTUYO = Mitutuyo()
-    MKS_NEWPORT = MKSNewport()
-    MPI = Mpi()
-    NATIONAL_INSTRUMENTS = NationalInstruments()
-    NAVITAR = Navitar()
-    NEW_SCALE_TECHNOLOGIES = NewScaleTechnologies()
-    NEUROPHOTOMETRICS = Neurophotometrics()
-    NINDS = NationalInstituteOfNeurologicalDisordersAndStroke()
-    NIKON = Nikon()
-    NYU = NewYorkUniversity()
-    OEPS = OpenEphysProductionSite()
-    OLYMPUS = Olympus()
-    OPTOTUNE = Optotune()
-    OSRAM = AmsOsram()
-    OXXIUS = Oxxius()
-    PRIZMATIX = Prizmatix()
-    QUANTIFI = Quantifi()
-    RASPBERRYPI = RaspberryPi()
-    SEMROCK = Semrock()
-    SCHNEIDER_KREUZNACH = SchneiderKreuznach()
-    SIMONS = SimonsFoundation()
-    SPINNAKER = Spinnaker()
-    TAMRON = Tamron()
-    THORLABS = Thorlabs()
-    THERMOFISHER = Thermofisher()
-    TMC = TMC()
-    TYMPHANY = Tymphany()
-    VIEWORKS = Vieworks()
-    VORTRAN = Vortran()
-    ZEISS = CarlZeiss()
-    OTHER = Other()
+    AA_OPTO = AAOptoElectronic.model_construct()
+    ABCAM = Abcam.model_construct()
+    AILIPU = AilipuTechnologyCo.model_construct()
+    AI = AllenInstitute.model_construct()
+    AIBS = AllenInstituteForBrainScience.model_construct()
+    AIND = AllenInstituteForNeuralDynamics.model_construct()
+    ALLIED = Allied.model_construct()
+    ASI = AppliedScientificInstrumentation.model_construct()
+    ASUS = Asus.model_construct()
+    AVCOSTAR = ArecontVisionCostar.model_construct()
+    BASLER = Basler.model_construct()
+    CAMBRIDGE_TECHNOLOGY = CambridgeTechnology.model_construct()
+    CHAMPALIMAUD = ChampalimaudFoundation.model_construct()
+    CHROMA = Chroma.model_construct()
+    COHERENT_SCIENTIFIC = CoherentScientific.model_construct()
+    COLUMBIA = ColumbiaUniversity.model_construct()
+    COMPUTAR = Computar.model_construct()
+    CONOPTICS = Conoptics.model_construct()
+    CUSTOM = Custom.model_construct()
+    DODOTRONIC = Dodotronic.model_construct()
+    DORIC = Doric.model_construct()
+    EALING = Ealing.model_construct()
+    EDMUND_OPTICS = EdmundOptics.model_construct()
+    EURESYS = Euresys.model_construct()
+    FLIR = TeledyneFLIR.model_construct()
+    FUJINON = Fujinon.model_construct()
+    HAMAMATSU = Hamamatsu.model_construct()
+    HUST = HuazhongUniversityOfScienceAndTechnology.model_construct()
+    IMAGING_SOURCE = TheImagingSource.model_construct()
+    IMEC = InteruniversityMicroelectronicsCenter.model_construct()
+    INFINITY_PHOTO_OPTICAL = InfinityPhotoOptical.model_construct()
+    ISL = ISLProductsInternational.model_construct()
+    JAX = JacksonLaboratory.model_construct()
+    JULABO = Julabo.model_construct()
+    LEE = TheLeeCompany.model_construct()
+    LEICA = Leica.model_construct()
+    LG = Lg.model_construct()
+    LIFECANVAS = LifeCanvas.model_construct()
+    MEADOWLARK = MeadowlarkOptics.model_construct()
+    MIGHTY_ZAP = IRRobotCo.model_construct()
+    MITUTUYO = Mitutuyo.model_construct()
+    MKS_NEWPORT = MKSNewport.model_construct()
+    MPI = Mpi.model_construct()
+    NATIONAL_INSTRUMENTS = NationalInstruments.model_construct()
+    NAVITAR = Navitar.model_construct()
+    NEW_SCALE_TECHNOLOGIES = NewScaleTechnologies.model_construct()
+    NEUROPHOTOMETRICS = Neurophotometrics.model_construct()
+    NINDS = NationalInstituteOfNeurologicalDisordersAndStroke.model_construct()
+    NIKON = Nikon.model_construct()
+    NYU = NewYorkUniversity.model_construct()
+    OEPS = OpenEphysProductionSite.model_construct()
+    OLYMPUS = Olympus.model_construct()
+    OPTOTUNE = Optotune.model_construct()
+    OSRAM = AmsOsram.model_construct()
+    OXXIUS = Oxxius.model_construct()
+    PRIZMATIX = Prizmatix.model_construct()
+    QUANTIFI = Quantifi.model_construct()
+    RASPBERRYPI = RaspberryPi.model_construct()
+    SEMROCK = Semrock.model_construct()
+    SCHNEIDER_KREUZNACH = SchneiderKreuznach.model_construct()
+    SIMONS = SimonsFoundation.model_construct()
+    SPINNAKER = Spinnaker.model_construct()
+    TAMRON = Tamron.model_construct()
+    THORLABS = Thorlabs.model_construct()
+    THERMOFISHER = Thermofisher.model_construct()
+    TMC = TMC.model_construct()
+    TYMPHANY = Tymphany.model_construct()
+    VIEWORKS = Vieworks.model_construct()
+    VORTRAN = Vortran.model_construct()
+    ZEISS = CarlZeiss.model_construct()
+    OTHER = Other.model_construct()
 
     _ALL = tuple(_Organization.__subclasses__())
     ONE_OF = Annotated[Union[_ALL], Field(discriminator="name")]
 
-    _abbreviation_map = {m().abbreviation: m() for m in _ALL}
-    _name_map = {m().name: m() for m in _ALL}
+    _abbreviation_map = {m.model_construct().abbreviation: m.model_construct() for m in _ALL}
+    _name_map = {m.model_construct().name: m.model_construct() for m in _ALL}
 
     @classmethod
     def from_abbreviation(cls, abbreviation: str):
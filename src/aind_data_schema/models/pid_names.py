@@ -1,11 +1,18 @@
 """Module for pidname definitions"""
 
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from pydantic import Field
+from pydantic import Field, model_validator
 
 from aind_data_schema.base import AindModel
 
+# The first instance of each frozen name class, e.g. Organization.AI, which is
+# shared by every equal instance that is validated afterwards
+_interned: Dict[type, "BaseName"] = dict()
+# Fields of each shared instance as data holds them, e.g. as parsed from json,
+# so that data matching a shared instance is not validated again
+_interned_fields: Dict[type, dict] = dict()
+
 
 class BaseName(AindModel):
     """A simple model associating a name with an abbreviation"""
@@ -13,6 +20,37 @@ class BaseName(AindModel):
     name: str = Field(..., title="Name")
     abbreviation: Optional[str] = Field(None, title="Abbreviation")
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _intern(cls, value: Any, handler):
+        """
+        Returns the shared instance of a frozen name, e.g. Organization.AI or
+        Platform.ECEPHYS, instead of an equal copy, so that documents parsed
+        from json hold the registry singletons and identity checks work.
+        Data matching the shared instance of the class returns it without
+        being validated.
+        """
+        if isinstance(value, dict) and cls in _interned:
+            fields = _interned_fields.get(cls)
+            if fields is None:
+                # Dumped on first use rather than for every name on import
+                fields = _interned_fields[cls] = _interned[cls].model_dump()
+            # The name, which discriminates the unions of name classes, rules out most other data cheaply
+            if value.get("name") == fields["name"] and value == fields:
+                return _interned[cls]
+        return cls._shared_instance(handler(value))
+
+    @classmethod
+    def _shared_instance(cls, name: "BaseName") -> "BaseName":
+        """
+        Returns the shared instance equal to a name, if it is frozen. Also
+        used for names built from trusted json without validation.
+        """
+        if not name.model_config.get("frozen"):
+            return name
+        interned = _interned.setdefault(name.__class__, name)
+        return interned if interned == name else name
+
 
 class PIDName(BaseName):
     """
@@ -22,3 +60,25 @@ class PIDName(BaseName):
 
     registry: Optional[BaseName] = Field(None, title="Registry")
     registry_identifier: Optional[str] = Field(None, title="Registry identifier")
+
+
+def shared_names(container: type) -> type:
+    """
+    Class decorator for the classes holding registry instances, e.g.
+    Organization. Its instances become the shared instances returned by
+    validation, and its lookup maps are updated to hold them. The instances
+    are built with model_construct so that importing a registry does not
+    validate them.
+    """
+    for value in vars(container).values():
+        if isinstance(value, BaseName) and value.model_config.get("frozen"):
+            _interned.setdefault(value.__class__, value)
+            # model_construct copies defaults, e.g. registry=Registry.ROR
+            for field_name, field_value in value.__dict__.items():
+                if isinstance(field_value, BaseName) and _interned.get(field_value.__class__) == field_value:
+                    value.__dict__[field_name] = _interned[field_value.__class__]
+    for map_name in ("_abbreviation_map", "_name_map"):
+        if map_name in vars(container):
+            lookup = {key: _interned.get(value.__class__, value) for key, value in vars(container)[map_name].items()}
+            setattr(container, map_name, lookup)
+    return container
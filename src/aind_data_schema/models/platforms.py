@@ -5,7 +5,7 @@ from typing import Literal, Union
 from pydantic import ConfigDict, Field
 from typing_extensions import Annotated
 
-from aind_data_schema.models.pid_names import BaseName
+from aind_data_schema.models.pid_names import BaseName, shared_names
 
 
 class _Platform(BaseName):
@@ -121,28 +121,29 @@ class SmartSpim(_Platform):
     abbreviation: Literal["SmartSPIM"] = "SmartSPIM"
 
 
+@shared_names
 class Platform:
     """Platform classes"""
 
-    BEHAVIOR = Behavior()
-    CONFOCAL = Confocal()
-    ECEPHYS = Ecephys()
-    EXASPIM = ExaSpim()
-    FIP = Fip()
-    HCR = Hcr()
-    HSFP = Hsfp()
-    ISI = Isi()
-    MESOSPIM = MesoSpim()
-    MERFISH = Merfish()
-    MRI = Mri()
-    MULTIPLANE_OPHYS = MultiplaneOphys()
-    SINGLE_PLANE_OPHYS = SingleplaneOphys()
-    SLAP2 = Slap2()
-    SMARTSPIM = SmartSpim()
+    BEHAVIOR = Behavior.model_construct()
+    CONFOCAL = Confocal.model_construct()
+    ECEPHYS = Ecephys.model_construct()
+    EXASPIM = ExaSpim.model_construct()
+    FIP = Fip.model_construct()
+    HCR = Hcr.model_construct()
+    HSFP = Hsfp.model_construct()
+    ISI = Isi.model_construct()
+    MESOSPIM = MesoSpim.model_construct()
+    MERFISH = Merfish.model_construct()
+    MRI = Mri.model_construct()
+    MULTIPLANE_OPHYS = MultiplaneOphys.model_construct()
+    SINGLE_PLANE_OPHYS = SingleplaneOphys.model_construct()
+    SLAP2 = Slap2.model_construct()
+    SMARTSPIM = SmartSpim.model_construct()
     _ALL = tuple(_Platform.__subclasses__())
     ONE_OF = Annotated[Union[_ALL], Field(discriminator="name")]
 
-    _abbreviation_map = {p().abbreviation: p() for p in _ALL}
+    _abbreviation_map = {p.model_construct().abbreviation: p.model_construct() for p in _ALL}
 
     @classmethod
     def from_abbreviation(cls, abbreviation: str):
@@ -4,7 +4,7 @@ from typing import Literal
 
 from pydantic import ConfigDict
 
-from aind_data_schema.models.pid_names import BaseName
+from aind_data_schema.models.pid_names import BaseName, shared_names
 
 
 class _Registry(BaseName):
@@ -48,13 +48,14 @@ class NationalCenterForBiotechnologyInformation(_Registry):
     abbreviation: Literal["NCBI"] = "NCBI"
 
 
+@shared_names
 class Registry:
     """Registry definitions"""
 
-    ADDGENE = Addgene()
-    ROR = ResearchOrganizationRegistry()
-    MGI = MouseGenomeInformatics()
-    NCBI = NationalCenterForBiotechnologyInformation()
-    RRID = ResearchResourceIdentifiers()
+    ADDGENE = Addgene.model_construct()
+    ROR = ResearchOrganizationRegistry.model_construct()
+    MGI = MouseGenomeInformatics.model_construct()
+    NCBI = NationalCenterForBiotechnologyInformation.model_construct()
+    RRID = ResearchResourceIdentifiers.model_construct()
 
     _ALL = tuple(_Registry.__subclasses__())
@@ -5,7 +5,7 @@ from typing import Literal, Union
 from pydantic import ConfigDict, Field
 from typing_extensions import Annotated
 
-from aind_data_schema.models.pid_names import PIDName
+from aind_data_schema.models.pid_names import PIDName, shared_names
 from aind_data_schema.models.registry import NationalCenterForBiotechnologyInformation, Registry
 
 
@@ -65,13 +65,14 @@ class RattusNorvegicus(_Species):
     registry_identifier: Literal["10116"] = "10116"
 
 
+@shared_names
 class Species:
     """Species classes"""
 
-    CALLITHRIX_JACCHUS = CallithrixJacchus()
-    HOMO_SAPIENS = HomoSapiens()
-    MACACA_MULATTA = MacacaMulatta()
-    MUS_MUSCULUS = MusMusculus()
-    RATTUS_NOVEGICUS = RattusNorvegicus()
+    CALLITHRIX_JACCHUS = CallithrixJacchus.model_construct()
+    HOMO_SAPIENS = HomoSapiens.model_construct()
+    MACACA_MULATTA = MacacaMulatta.model_construct()
+    MUS_MUSCULUS = MusMusculus.model_construct()
+    RATTUS_NOVEGICUS = RattusNorvegicus.model_construct()
     _ALL = tuple(_Species.__subclasses__())
     ONE_OF = Annotated[Union[_ALL], Field(discriminator="name")]
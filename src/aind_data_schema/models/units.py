@@ -5,6 +5,8 @@ from enum import Enum
 
 from pydantic import create_model
 
+from aind_data_schema.utils.numeric_mode import float_mode_model
+
 
 class SizeUnit(str, Enum):
     """Enumeration of Length Measurements"""
@@ -111,7 +113,7 @@ def create_unit_with_value(model_name, scalar_type, unit_type, unit_default):
     """this uses create_model instead of generics, which lets us set default values"""
 
     m = create_model(model_name, value=(scalar_type, ...), unit=(unit_type, unit_default))
-    return m
+    return float_mode_model(m)
 
 
 SizeValue = create_unit_with_value("SizeValue", Decimal, SizeUnit, SizeUnit.MM)
@@ -0,0 +1,170 @@
+""" Utility to pack many json documents into one archive that can be read one document at a time """
+
+import importlib
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, NamedTuple, Optional, Type, Union
+
+from aind_data_schema.base import AindCoreModel
+from aind_data_schema.utils.json_scanner import iter_object_members
+
+# A bundle starts with the magic bytes and the offset of its index. The
+# documents follow as utf-8 json, back to back, and the json index is last.
+_MAGIC = b"AINDBDL1"
+_HEADER = struct.Struct("<8sQ")
+
+
+class BundleEntry(NamedTuple):
+    """Location and schema of a document in a bundle"""
+
+    offset: int
+    length: int
+    schema_class: str
+    schema_version: Optional[str]
+
+
+def _class_path(model_class: type) -> str:
+    """Returns the import path of a class"""
+    return f"{model_class.__module__}.{model_class.__qualname__}"
+
+
+def _import_class(class_path: str) -> Type[AindCoreModel]:
+    """Imports a core model class from its import path"""
+    module_name, _, class_name = class_path.rpartition(".")
+    model_class = getattr(importlib.import_module(module_name), class_name, None)
+    if not isinstance(model_class, type) or not issubclass(model_class, AindCoreModel):
+        raise ValueError(f"{class_path} is not a core model class")
+    return model_class
+
+
+class BundleWriter:
+    """Writes json documents into a bundle"""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Starts a new bundle, replacing any file at path"""
+        self.path = Path(path)
+        self.entries: Dict[str, BundleEntry] = dict()
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, 0))
+
+    def __enter__(self) -> "BundleWriter":
+        """Returns the writer"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Writes the index and closes the bundle"""
+        self.close()
+
+    def add(self, name: str, model: AindCoreModel) -> None:
+        """Adds a model to the bundle as compact json"""
+        self.add_json(name, model.model_dump_json(), model.__class__)
+
+    def add_json(self, name: str, contents: Union[str, bytes], model_class: Type[AindCoreModel]) -> None:
+        """
+        Adds a json document to the bundle as is, e.g. the contents of an
+        existing subject.json. The document is not validated, and only its
+        schema_version is decoded.
+        Parameters
+        ----------
+        name : str
+          Unique name of the document in the bundle, e.g. a relative path
+        contents : Union[str, bytes]
+          Json of the document
+        model_class : Type[AindCoreModel]
+          Core model class of the document
+
+        """
+        if name in self.entries:
+            raise ValueError(f"Bundle already contains {name}")
+        if isinstance(contents, str):
+            contents = contents.encode("utf-8")
+        schema_version = dict(iter_object_members(contents, {"schema_version"})).get("schema_version")
+        self.entries[name] = BundleEntry(
+            offset=self._file.tell(),
+            length=len(contents),
+            schema_class=_class_path(model_class),
+            schema_version=None if schema_version is None else json.loads(schema_version),
+        )
+        self._file.write(contents)
+
+    def close(self) -> None:
+        """Writes the index and closes the bundle"""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        index = {name: entry._asdict() for name, entry in self.entries.items()}
+        self._file.write(json.dumps(index).encode("utf-8"))
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, index_offset))
+        self._file.close()
+
+
+class BundleReader:
+    """Reads json documents from a bundle one at a time. The bundle is memory mapped, so only
+    the index and the documents that are read are loaded."""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """Opens a bundle and reads its index"""
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_offset = _HEADER.unpack_from(self._mmap) if len(self._mmap) >= _HEADER.size else (None, 0)
+        if magic != _MAGIC or index_offset < _HEADER.size:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a bundle")
+        index = json.loads(self._mmap[index_offset:])
+        self.entries: Dict[str, BundleEntry] = {name: BundleEntry(**entry) for name, entry in index.items()}
+
+    def __enter__(self) -> "BundleReader":
+        """Returns the reader"""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Closes the bundle"""
+        self.close()
+
+    def close(self) -> None:
+        """Closes the bundle"""
+        self._mmap.close()
+
+    def __len__(self) -> int:
+        """Number of documents in the bundle"""
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the names of the documents in the bundle"""
+        return iter(self.entries)
+
+    def __contains__(self, name: object) -> bool:
+        """Whether the bundle contains a document"""
+        return name in self.entries
+
+    def read_bytes(self, name: str) -> bytes:
+        """Returns the json of a document"""
+        entry = self.entries[name]
+        start = entry.offset
+        end = start + entry.length
+        return self._mmap[start:end]
+
+    def load(self, name: str, model_class: Optional[Type[AindCoreModel]] = None) -> AindCoreModel:
+        """
+        Validates a single document of the bundle
+        Parameters
+        ----------
+        name : str
+          Name of the document
+        model_class : Optional[Type[AindCoreModel]]
+          Class to validate the document with. Defaults to the class recorded
+          in the index, which is imported if needed.
+
+        Returns
+        -------
+        AindCoreModel
+          Validated model
+
+        """
+        if model_class is None:
+            model_class = _import_class(self.entries[name].schema_class)
+        return model_class.model_validate_json(self.read_bytes(name))
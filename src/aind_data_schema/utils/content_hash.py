@@ -0,0 +1,236 @@
+""" Utility to compute canonical content hashes of models without serializing them to json """
+
+import functools
+import hashlib
+import json
+import weakref
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from enum import Enum
+from json.encoder import encode_basestring
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import BaseModel
+
+# Digests of frozen models, which can not change once built. Registry
+# instances like Organization.AI are shared by many documents, so their
+# subtrees are only walked once.
+_frozen_digests: "weakref.WeakKeyDictionary[BaseModel, bytes]" = weakref.WeakKeyDictionary()
+
+# Number of pieces buffered before they are passed to the hash
+_BUFFER_SIZE = 1024
+
+
+class _CanonicalEncoder:
+    """Feeds the canonical encoding of a value to a hash, piece by piece"""
+
+    def __init__(self, update: Callable[[bytes], None]) -> None:
+        """Starts an encoder writing to a hash update function"""
+        self.update = update
+        self.pieces: List[str] = []
+
+    def write(self, piece: str) -> None:
+        """Buffers a piece of the encoding"""
+        self.pieces.append(piece)
+        if len(self.pieces) >= _BUFFER_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Passes the buffered pieces to the hash"""
+        self.update("".join(self.pieces).encode("utf-8"))
+        self.pieces = []
+
+    def encode(self, value: Any) -> None:
+        """Writes the canonical encoding of a value"""
+        if isinstance(value, BaseModel):
+            self.encode_model(value)
+        elif isinstance(value, dict):
+            self.encode_object([(str(k), v) for k, v in value.items()])
+        elif isinstance(value, (list, tuple)):
+            self.encode_array(value)
+        elif isinstance(value, (set, frozenset)):
+            # Sets have no order, so their elements are sorted by their encoding
+            self.encode_array(sorted(value, key=canonical_json))
+        else:
+            self.write(_encode_scalar(value))
+
+    def encode_model(self, model: BaseModel) -> None:
+        """Writes the canonical encoding of a model, using memoized digests of frozen models"""
+        if not model.model_config.get("frozen"):
+            self.encode_object(_model_items(model))
+            return
+        try:
+            digest = _frozen_digests.get(model)
+        except TypeError:
+            # Frozen models holding unhashable values can not be memoized
+            self.encode_object(_model_items(model))
+            return
+        if digest is None:
+            digest = _frozen_digests[model] = _digest(model, lambda encoder: encoder.encode_object(_model_items(model)))
+        # Stand in for the subtree with its digest
+        self.write('"#' + digest.hex() + '"')
+
+    def encode_object(self, items: List[tuple]) -> None:
+        """Writes an object with its keys sorted"""
+        self.write("{")
+        for index, (key, value) in enumerate(sorted(items, key=lambda item: item[0])):
+            self.write(("," if index else "") + json.dumps(key) + ":")
+            self.encode(value)
+        self.write("}")
+
+    def encode_array(self, values: Any) -> None:
+        """Writes an array"""
+        self.write("[")
+        for index, value in enumerate(values):
+            if index:
+                self.write(",")
+            self.encode(value)
+        self.write("]")
+
+
+def _encode_scalar(value: Any) -> str:
+    """Returns the canonical encoding of a value that is not a container"""
+    if isinstance(value, Enum):
+        value = value.value
+    if value is None or isinstance(value, (bool, int)):
+        return json.dumps(value)
+    if isinstance(value, float):
+        # Floats, e.g. Decimal fields read in float mode, are encoded as the decimal they were read from
+        value = Decimal(repr(value))
+    if isinstance(value, Decimal):
+        # Numerically equal decimals, e.g. 1.0 and 1.00, are encoded the same
+        return json.dumps(str(value.normalize()) if value else "0")
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            # The same instant in different timezones is encoded the same
+            value = value.astimezone(timezone.utc)
+        return json.dumps(value.isoformat())
+    if isinstance(value, (date, time)):
+        return json.dumps(value.isoformat())
+    if isinstance(value, timedelta):
+        return json.dumps(value.total_seconds())
+    if isinstance(value, bytes):
+        return json.dumps(value.hex())
+    return json.dumps(str(value))
+
+
+def _model_items(model: BaseModel) -> List[tuple]:
+    """Returns the serialized names and values of the fields of a model, including extra fields"""
+    items = [(field_info.alias or name, getattr(model, name)) for name, field_info in model.model_fields.items()]
+    items.extend((model.model_extra or {}).items())
+    return items
+
+
+def _digest(value: Any, encode: Callable[[_CanonicalEncoder], None]) -> bytes:
+    """Returns the sha256 digest of the canonical encoding written by encode"""
+    h = hashlib.sha256()
+    encoder = _CanonicalEncoder(h.update)
+    encode(encoder)
+    encoder.flush()
+    return h.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def _sorted_fields(model_class: type) -> List[tuple]:
+    """Returns the encoded serialized names and the names of the fields of a model class, sorted like object members"""
+    return sorted(
+        (encode_basestring(info.alias or name) + ":", name) for name, info in model_class.model_fields.items()
+    )
+
+
+def _subtree_encoding(value: Any, digests: Dict[int, bytes]) -> str:
+    """Returns the encoding of a value in which models and containers stand in by their digests"""
+    # Scalars are tagged with their type, so that e.g. 1, 1.0, "1" and True differ
+    value_type = type(value)
+    if value_type is str:
+        return "s" + encode_basestring(value)
+    if value_type is int:
+        return "i" + str(value)
+    digest = digests.get(id(value))
+    if digest is None:
+        encoding = _container_encoding(value, value_type, digests)
+        if encoding is None:
+            return encode_basestring(value_type.__name__) + _encode_scalar(value)
+        digest = digests[id(value)] = hashlib.sha256(encoding.encode("utf-8")).digest()
+    return '"#' + digest.hex() + '"'
+
+
+def _container_encoding(value: Any, value_type: type, digests: Dict[int, bytes]) -> Optional[str]:
+    """Returns the encoding of a model or container with its children standing in by their digests, if it is one"""
+    # The exact types are checked first, as checking for models is slower
+    if value_type is list or value_type is tuple:
+        return "[" + ",".join([_subtree_encoding(element, digests) for element in value]) + "]"
+    if value_type is dict:
+        return _object_encoding(value.items(), digests)
+    if isinstance(value, BaseModel):
+        members = [key + _subtree_encoding(getattr(value, name), digests) for key, name in _sorted_fields(value_type)]
+        if value.model_extra:
+            members.extend(_member_encodings(value.model_extra.items(), digests))
+            members.sort()
+        return "{" + ",".join(members) + "}"
+    if isinstance(value, dict):
+        return _object_encoding(value.items(), digests)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        elements = [_subtree_encoding(element, digests) for element in value]
+        if isinstance(value, (set, frozenset)):
+            elements.sort()
+        return "[" + ",".join(elements) + "]"
+    return None
+
+
+def _member_encodings(items: Iterable[tuple], digests: Dict[int, bytes]) -> List[str]:
+    """Returns the encodings of the members of an object"""
+    return [encode_basestring(str(key)) + ":" + _subtree_encoding(value, digests) for key, value in items]
+
+
+def _object_encoding(items: Iterable[tuple], digests: Dict[int, bytes]) -> str:
+    """Returns the encoding of an object with its members sorted by key"""
+    return "{" + ",".join(sorted(_member_encodings(items, digests))) + "}"
+
+
+def subtree_digests(*values: Any) -> Dict[int, bytes]:
+    """
+    Computes the digest of every model and container in values, keyed on
+    their ids, in a single pass. Each is the sha256 of the canonical
+    encoding of the subtree with its children standing in by their own
+    digests, and with scalars tagged with their type. Subtrees with equal
+    digests have equal contents, values and types alike, so comparing
+    documents can skip them without walking them.
+    """
+    digests = dict()
+    for value in values:
+        _subtree_encoding(value, digests)
+    return digests
+
+
+def canonical_json(value: Any) -> str:
+    """Returns the canonical encoding of a value as a string. Used to order set elements."""
+    pieces = []
+    encoder = _CanonicalEncoder(lambda b: pieces.append(b.decode("utf-8")))
+    encoder.encode(value)
+    encoder.flush()
+    return "".join(pieces)
+
+
+def content_hash(value: Any) -> str:
+    """
+    Computes a canonical sha256 hash of a model or value. The encoding is
+    compact json with sorted keys, serialized (aliased) field names,
+    enums replaced by their values, decimals and floats normalized so that
+    equal numbers are encoded the same, whether read as Decimals or in float
+    mode, and timezone-aware datetimes converted to UTC.
+    The encoding is fed to the hash piece by piece, so the json of the whole
+    document is never built. Frozen models, e.g. Organization and Platform
+    instances, are hashed once and then stand in by their digest.
+    Parameters
+    ----------
+    value : Any
+      Model, or json-like value holding models
+
+    Returns
+    -------
+    str
+      sha256 hex digest
+
+    """
+    return _digest(value, lambda encoder: encoder.encode(value)).hex()
@@ -0,0 +1,80 @@
+""" Utility methods for the integrity sidecar files written next to standard json files """
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional, Union
+
+from aind_data_schema import __version__
+
+SIDECAR_SUFFIX = ".sidecar.json"
+
+
+def _sha256(contents: str) -> str:
+    """Returns the sha256 hex digest of json text"""
+    return hashlib.sha256(contents.encode("utf-8")).hexdigest()
+
+
+def sidecar_path(path: Union[str, Path]) -> Path:
+    """Returns the path of the sidecar file of a json file"""
+    path = Path(path)
+    return path.with_name(path.name + SIDECAR_SUFFIX)
+
+
+def write_sidecar(path: Union[str, Path], contents: str, schema_version: str, valid: bool) -> Path:
+    """
+    Writes the sidecar file of a json file
+    Parameters
+    ----------
+    path : Union[str, Path]
+      Path of the json file
+    contents : str
+      The json text of the file
+    schema_version : str
+      Schema version of the model in the file
+    valid : bool
+      Whether the json text validates as the model
+
+    Returns
+    -------
+    Path
+      Path of the sidecar file
+
+    """
+    sidecar = {
+        "sha256": _sha256(contents),
+        "schema_version": schema_version,
+        "library_version": __version__,
+        "valid": valid,
+    }
+    output_path = sidecar_path(path)
+    with open(output_path, "w") as f:
+        f.write(json.dumps(sidecar, indent=3))
+    return output_path
+
+
+def read_sidecar(path: Union[str, Path]) -> Optional[dict]:
+    """Reads the sidecar file of a json file, or returns None if it is missing or unreadable"""
+    try:
+        with open(sidecar_path(path), "r") as f:
+            sidecar = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return sidecar if isinstance(sidecar, dict) else None
+
+
+def is_trusted(path: Union[str, Path], contents: str, schema_version: Optional[str]) -> bool:
+    """
+    Whether the contents of a json file can be trusted without validation:
+    its sidecar must match the contents' hash, the expected schema version
+    and the installed library version, and the contents must have been
+    valid when they were written.
+    """
+    sidecar = read_sidecar(path)
+    return (
+        sidecar is not None
+        and sidecar.get("valid") is True
+        and sidecar.get("schema_version") == schema_version
+        and sidecar.get("library_version") == __version__
+        and sidecar.get("sha256") == _sha256(contents)
+    )
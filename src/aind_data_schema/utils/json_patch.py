@@ -0,0 +1,172 @@
+""" Utility methods to compute and apply JSON-Patch style differences between json documents """
+
+import copy
+from typing import Any, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+from pydantic_core import to_jsonable_python
+
+from aind_data_schema.utils.content_hash import _model_items, subtree_digests
+
+
+def _escape(token: Any) -> str:
+    """Escapes a key or index for use in a JSON pointer"""
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    """Reverses _escape"""
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _is_same(old: Any, new: Any, digests: Dict[int, bytes]) -> bool:
+    """
+    Whether two values are identical. Models and containers are compared by
+    their digests and scalars by type and value, so that 1, 1.0 and True
+    differ, however deep they are nested.
+    """
+    if old is new:
+        return True
+    old_digest = digests.get(id(old))
+    new_digest = digests.get(id(new))
+    if old_digest is not None or new_digest is not None:
+        return old_digest == new_digest
+    return type(old) is type(new) and old == new
+
+
+def _members(value: Any) -> Optional[Dict[str, Any]]:
+    """Returns the members of a json object, or the serialized fields of a model"""
+    if isinstance(value, BaseModel):
+        return dict(_model_items(value))
+    return value if isinstance(value, dict) else None
+
+
+def _elements(value: Any) -> Optional[Sequence]:
+    """Returns the elements of a json array, or of a list, tuple or set"""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return value if isinstance(value, (list, tuple)) else None
+
+
+def _to_json(value: Any) -> Any:
+    """Returns the json value of a value, e.g. of a model"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return to_jsonable_python(value, by_alias=True)
+
+
+def _diff_members(old: dict, new: dict, path: str, patch: List[dict], digests: Dict[int, bytes]) -> None:
+    """Appends the operations that turn one json object into another"""
+    for key, old_value in old.items():
+        child_path = f"{path}/{_escape(key)}"
+        if key not in new:
+            patch.append({"op": "remove", "path": child_path})
+        elif not _is_same(old_value, new[key], digests):
+            _diff(old_value, new[key], child_path, patch, digests)
+    for key, new_value in new.items():
+        if key not in old:
+            patch.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": _to_json(new_value)})
+
+
+def _diff_elements(old: Sequence, new: Sequence, path: str, patch: List[dict], digests: Dict[int, bytes]) -> None:
+    """Appends the operations that turn one json array into another"""
+    for index, (old_value, new_value) in enumerate(zip(old, new)):
+        if not _is_same(old_value, new_value, digests):
+            _diff(old_value, new_value, f"{path}/{index}", patch, digests)
+    for index in range(len(old), len(new)):
+        patch.append({"op": "add", "path": f"{path}/{index}", "value": _to_json(new[index])})
+    # Remove from the end so that the remaining indices stay valid
+    for index in reversed(range(len(new), len(old))):
+        patch.append({"op": "remove", "path": f"{path}/{index}"})
+
+
+def _diff(old: Any, new: Any, path: str, patch: List[dict], digests: Dict[int, bytes]) -> None:
+    """Appends the operations that turn old into new. Identical children are skipped without being walked."""
+    old_members, new_members = _members(old), _members(new)
+    if old_members is not None and new_members is not None:
+        _diff_members(old_members, new_members, path, patch, digests)
+        return
+    old_elements, new_elements = _elements(old), _elements(new)
+    if old_elements is not None and new_elements is not None:
+        _diff_elements(old_elements, new_elements, path, patch, digests)
+    else:
+        patch.append({"op": "replace", "path": path, "value": _to_json(new)})
+
+
+def make_patch(old: Any, new: Any) -> List[dict]:
+    """
+    Computes the list of JSON-Patch (RFC 6902) add, remove and replace
+    operations that turn one json document into another. The documents may
+    hold models, which are walked as objects of their serialized fields
+    rather than dumped. The digests of all subtrees are computed first, in
+    one pass, so that unchanged subtrees are skipped without being walked.
+    Parameters
+    ----------
+    old : Any
+      Original json document or model
+    new : Any
+      Updated json document or model
+
+    Returns
+    -------
+    List[dict]
+      Patch operations. Empty if the documents are identical.
+
+    """
+    patch = []
+    digests = subtree_digests(old, new)
+    if not _is_same(old, new, digests):
+        _diff(old, new, "", patch, digests)
+    return patch
+
+
+def _apply_operation(document: Any, operation: dict) -> Any:
+    """Applies a single patch operation in place and returns the document"""
+    op = operation.get("op")
+    if op not in ("add", "remove", "replace"):
+        raise ValueError(f"Unsupported patch operation: {op}")
+    if operation["path"] == "":
+        if op == "remove":
+            raise ValueError("Cannot remove the whole document")
+        return copy.deepcopy(operation["value"])
+
+    tokens = [_unescape(token) for token in operation["path"].split("/")[1:]]
+    parent = document
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    last = tokens[-1]
+    if isinstance(parent, list):
+        last = len(parent) if last == "-" else int(last)
+        if op == "add":
+            parent.insert(last, copy.deepcopy(operation["value"]))
+            return document
+    if op == "remove":
+        del parent[last]
+    else:
+        parent[last] = copy.deepcopy(operation["value"])
+    return document
+
+
+def apply_patch(document: Any, patch: List[dict], in_place: bool = False) -> Any:
+    """
+    Applies JSON-Patch add, remove and replace operations to a json document
+    Parameters
+    ----------
+    document : Any
+      Json document
+    patch : List[dict]
+      Patch operations, e.g. from make_patch
+    in_place : bool
+      Modify the document itself instead of a copy
+
+    Returns
+    -------
+    Any
+      Patched document
+
+    """
+    if not in_place:
+        document = copy.deepcopy(document)
+    for operation in patch:
+        document = _apply_operation(document, operation)
+    return document
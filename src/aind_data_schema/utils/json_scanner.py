@@ -0,0 +1,121 @@
+""" Utility methods to locate values in a JSON document without decoding them """
+
+import json
+import re
+from json.decoder import scanstring
+from typing import Iterator, Optional, Set, Tuple, Union
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_CONTAINER_TOKEN = re.compile(r'["\[\]{}]')
+_SCALAR = re.compile(r"[^ \t\n\r,\]}]+")
+
+
+def _skip_whitespace(s: str, idx: int) -> int:
+    """Returns the index of the next non-whitespace character"""
+    return _WHITESPACE.match(s, idx).end()
+
+
+def skip_value(s: str, idx: int) -> int:
+    """
+    Returns the index just past the JSON value that starts at idx, without
+    building any Python objects for it
+    Parameters
+    ----------
+    s : str
+      JSON document
+    idx : int
+      Index of the first character of the value
+
+    Returns
+    -------
+    int
+      Index of the first character after the value
+
+    """
+    if idx >= len(s):
+        raise json.JSONDecodeError("Expecting value", s, idx)
+    char = s[idx]
+    if char == '"':
+        return scanstring(s, idx + 1)[1]
+    if char not in "[{":
+        match = _SCALAR.match(s, idx)
+        if match is None:
+            raise json.JSONDecodeError("Expecting value", s, idx)
+        return match.end()
+
+    depth = 0
+    pos = idx
+    while True:
+        match = _CONTAINER_TOKEN.search(s, pos)
+        if match is None:
+            raise json.JSONDecodeError("Unterminated container", s, idx)
+        token = match.group()
+        pos = match.end()
+        if token == '"':
+            pos = scanstring(s, pos)[1]
+        elif token in "[{":
+            depth += 1
+        else:
+            depth -= 1
+            if depth == 0:
+                return pos
+
+
+def _iter_member_spans(s: str) -> Iterator[Tuple[str, int, int]]:
+    """Yields the key and the start and end index of each member's value"""
+    pos = _skip_whitespace(s, 0)
+    if not s.startswith("{", pos):
+        raise json.JSONDecodeError("Expecting '{'", s, pos)
+    pos = _skip_whitespace(s, pos + 1)
+    if s.startswith("}", pos):
+        return
+    while True:
+        if not s.startswith('"', pos):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", s, pos)
+        key, pos = scanstring(s, pos + 1)
+        pos = _skip_whitespace(s, pos)
+        if not s.startswith(":", pos):
+            raise json.JSONDecodeError("Expecting ':' delimiter", s, pos)
+        start = _skip_whitespace(s, pos + 1)
+        end = skip_value(s, start)
+        yield key, start, end
+        pos = _skip_whitespace(s, end)
+        if s.startswith("}", pos):
+            return
+        if not s.startswith(",", pos):
+            raise json.JSONDecodeError("Expecting ',' delimiter", s, pos)
+        pos = _skip_whitespace(s, pos + 1)
+
+
+def iter_object_members(s: Union[str, bytes], keys: Optional[Set[str]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Iterates over the members of a top-level JSON object, yielding each key
+    along with the raw, undecoded JSON text of its value
+    Parameters
+    ----------
+    s : Union[str, bytes]
+      JSON document whose top level is an object
+    keys : Optional[Set[str]]
+      If set, only these members are yielded. Other values are skipped
+      without being copied, and scanning stops once every key was found.
+
+    Returns
+    -------
+    Iterator[Tuple[str, str]]
+      (key, raw value) pairs in document order
+
+    """
+    if isinstance(s, bytes):
+        s = s.decode("utf-8")
+    if keys is None:
+        for key, start, end in _iter_member_spans(s):
+            yield key, s[start:end]
+        return
+
+    remaining = set(keys)
+    for key, start, end in _iter_member_spans(s):
+        if key in remaining:
+            remaining.discard(key)
+            yield key, s[start:end]
+            if not remaining:
+                return
@@ -0,0 +1,68 @@
+""" Utility to write the json of a model incrementally instead of building one string """
+
+import json
+from typing import IO, Iterator, Optional
+
+from pydantic import BaseModel
+
+
+def _dump_member(model: BaseModel, key: str, indent: Optional[int]) -> str:
+    """Serializes a single field of a model, as it appears in the json of the whole model"""
+    dumped = model.model_dump_json(include={key}, indent=indent)
+    if indent is None:
+        return dumped[1:-1]
+    # Strip "{\n" plus one level of indentation, and "\n}"
+    start = 2 + indent
+    return dumped[start:-2]
+
+
+def _iter_elements(model: BaseModel, key: str, indent: Optional[int]) -> Iterator[str]:
+    """Serializes the elements of a list field one at a time, as they appear in the json of the whole model"""
+    # The array starts after the key and the separator
+    start = len(json.dumps(key)) + (1 if indent is None else 2) + 1
+    for element in getattr(model, key):
+        member = _dump_member(model.model_copy(update={key: [element]}), key, indent)
+        if indent is None:
+            yield member[start:-1]
+        else:
+            # Strip "[\n" plus two levels of indentation, and "\n" plus one level and "]"
+            element_start = start + 1 + 2 * indent
+            element_end = len(member) - 2 - indent
+            yield member[element_start:element_end]
+
+
+def write_model_json(model: BaseModel, f: IO[str], indent: Optional[int] = None) -> None:
+    """
+    Writes the json of a model to a file handle incrementally. Each field is
+    written on its own and each element of a list field is written on its
+    own, so the whole document is never held in memory as one string. The
+    output is identical to model.model_dump_json(indent=indent).
+    Parameters
+    ----------
+    model : BaseModel
+      Model to write
+    f : IO[str]
+      Text file handle
+    indent : Optional[int]
+      Indentation, as for model_dump_json
+
+    """
+    keys = list(model.model_fields) + list(model.model_extra or {})
+    newline = "" if indent is None else "\n"
+    member_indent = "" if indent is None else " " * indent
+    element_indent = "" if indent is None else " " * (2 * indent)
+    key_separator = ":" if indent is None else ": "
+
+    f.write("{" if keys else "{}")
+    for index, key in enumerate(keys):
+        f.write(("," if index else "") + newline + member_indent)
+        value = getattr(model, key)
+        if not isinstance(value, list) or not value:
+            f.write(_dump_member(model, key, indent))
+            continue
+        f.write(json.dumps(key) + key_separator + "[")
+        for element_index, element in enumerate(_iter_elements(model, key, indent)):
+            f.write(("," if element_index else "") + newline + element_indent + element)
+        f.write(newline + member_indent + "]")
+    if keys:
+        f.write(newline + "}")
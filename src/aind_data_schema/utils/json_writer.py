@@ -1,20 +1,183 @@
 """ Utility method to write Pydantic schemas to JSON """
 
 import argparse
+import hashlib
 import importlib
+import inspect
 import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Iterator
+from typing import Any, Callable, Dict, Iterator, List, Set, Tuple, Type, get_args
 
-from aind_data_schema import core
+import pydantic
+import pydantic_core
+from pydantic import BaseModel
+
+from aind_data_schema import __version__, core
 from aind_data_schema.base import AindCoreModel
 
-# Import all modules in core package
-for mod in core.__loader__.get_resource_reader().contents():
-    if "__" not in mod:
-        importlib.import_module(f"aind_data_schema.core.{mod.replace('.py','')}")
+# File in the output directory recording what each schema file was generated
+# from. It is local to each checkout and is ignored by git.
+MANIFEST_FILENAME = ".schema_hashes.json"
+
+# File holding the definitions shared by every core schema, with --shared-defs
+DEFINITIONS_FILENAME = "definitions_schema.json"
+
+_DEFS_PREFIX = "#/$defs/"
+
+
+def _annotation_classes(annotation) -> Iterator[type]:
+    """Yields the classes in a field annotation, e.g. Camera and CameraType"""
+    if inspect.isclass(annotation):
+        yield annotation
+    for arg in get_args(annotation):
+        yield from _annotation_classes(arg)
+
+
+def source_modules(model: Type[BaseModel]) -> Set[str]:
+    """Returns the modules of this package defining a model, its base classes and every class its fields use"""
+    modules = set()
+    pending = [model]
+    seen = set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        modules.update(base.__module__ for base in cls.__mro__)
+        if issubclass(cls, BaseModel):
+            for field_info in cls.model_fields.values():
+                pending.extend(_annotation_classes(field_info.annotation))
+    return {module for module in modules if module.split(".")[0] == core.__name__.split(".")[0]}
+
+
+def source_hash(model: Type[BaseModel]) -> str:
+    """
+    Hashes the source of every module a model's schema depends on, and the
+    versions of pydantic, so a schema only needs to be regenerated when the
+    hash changes
+    """
+    source = hashlib.sha256(f"pydantic {pydantic.VERSION} {pydantic_core.__version__}\n".encode("utf-8"))
+    for module in sorted(source_modules(model)):
+        source.update(f"{module}\n".encode("utf-8"))
+        source.update(Path(sys.modules[module].__file__).read_bytes())
+    return source.hexdigest()
+
+
+def _generate_schema(model_path: str) -> str:
+    """Generates the json schema of the model at a module:qualname path, in a worker process"""
+    module, _, name = model_path.partition(":")
+    model = getattr(importlib.import_module(module), name)
+    return json.dumps(model.model_json_schema(), indent=3)
+
+
+def _text_hash(text: str) -> str:
+    """Hashes the contents of a schema file"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _read_text(path: Path):
+    """Returns the contents of a file, or None if it cannot be read"""
+    try:
+        return path.read_text()
+    except OSError:
+        return None
+
+
+def _replace_refs(node: Any, replace: Callable[[str], str]) -> Any:
+    """Returns a copy of a schema with its refs, including those of discriminator mappings, replaced"""
+    if isinstance(node, list):
+        return [_replace_refs(item, replace) for item in node]
+    if not isinstance(node, dict):
+        return node
+    copy = {key: _replace_refs(value, replace) for key, value in node.items()}
+    if isinstance(copy.get("$ref"), str):
+        copy["$ref"] = replace(copy["$ref"])
+    if isinstance(copy.get("discriminator"), dict) and isinstance(copy["discriminator"].get("mapping"), dict):
+        copy["discriminator"]["mapping"] = {tag: replace(ref) for tag, ref in node["discriminator"]["mapping"].items()}
+    return copy
+
+
+def _def_name(ref: str) -> str:
+    """Returns the name of the definition a local ref points to"""
+    return ref.rpartition("/")[2]
+
+
+def _structural_labels(schemas: List[dict]) -> Dict[Tuple[int, str], str]:
+    """
+    Labels the definitions of schemas by their structure, including the
+    structure of the definitions they refer to, so definitions with the same
+    label are interchangeable. Labels are refined until they stop splitting.
+    """
+    definitions = {
+        (index, name): d for index, schema in enumerate(schemas) for name, d in schema.get("$defs", {}).items()
+    }
+    labels = {key: "" for key in definitions}
+    count = 0
+    while True:
+        labels = {
+            (index, name): _text_hash(
+                labels[(index, name)]
+                + json.dumps(_replace_refs(definition, lambda ref: labels[(index, _def_name(ref))]), sort_keys=True)
+            )
+            for (index, name), definition in definitions.items()
+        }
+        if len(set(labels.values())) == count:
+            return labels
+        count = len(set(labels.values()))
+
+
+def share_definitions(schemas: List[dict], definitions_refs: List[str]) -> Tuple[dict, List[dict]]:
+    """
+    Moves the definitions of json schemas into one document, keeping one copy
+    of definitions that are structurally equal. Definitions keep their names,
+    unless different definitions share a name, e.g. two Stream classes, when
+    all but the most used get a suffix from their structural hash.
+    Parameters
+    ----------
+    schemas : List[dict]
+      Json schemas with local $defs
+    definitions_refs : List[str]
+      Reference to the definitions document from each schema, e.g. definitions_schema.json
+
+    Returns
+    -------
+    Tuple[dict, List[dict]]
+      The $defs of the definitions document, and each schema without $defs
+      and with its refs pointing into the document
+
+    """
+    labels = _structural_labels(schemas)
+    uses: Dict[str, List[Tuple[int, str]]] = dict()
+    for key, label in labels.items():
+        uses.setdefault(label, []).append(key)
+    by_name: Dict[str, List[str]] = dict()
+    for label, keys in uses.items():
+        by_name.setdefault(min((name for _, name in keys), key=lambda name: (len(name), name)), []).append(label)
+    shared_names = dict()
+    for name, name_labels in by_name.items():
+        for rank, label in enumerate(sorted(name_labels, key=lambda label: (-len(uses[label]), label))):
+            shared_names[label] = name if rank == 0 else f"{name}_{label[:8]}"
+
+    definitions = dict()
+    for label, keys in sorted(uses.items(), key=lambda item: shared_names[item[0]]):
+        index, name = keys[0]
+        definitions[shared_names[label]] = _replace_refs(
+            schemas[index]["$defs"][name],
+            lambda ref: _DEFS_PREFIX + shared_names[labels[(index, _def_name(ref))]],
+        )
+    thin_schemas = []
+    for index, (schema, definitions_ref) in enumerate(zip(schemas, definitions_refs)):
+        thin_schema = {key: value for key, value in schema.items() if key != "$defs"}
+        thin_schemas.append(
+            _replace_refs(
+                thin_schema,
+                lambda ref: definitions_ref + _DEFS_PREFIX + shared_names[labels[(index, _def_name(ref))]],
+            )
+        )
+    return definitions, thin_schemas
 
 
 class SchemaWriter:
@@ -49,6 +212,32 @@ class SchemaWriter:
         )
         parser.set_defaults(attach_version=False)
 
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Report schema files that are missing or out of date instead of writing them",
+        )
+
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Regenerate every schema, even if its source has not changed",
+        )
+
+        parser.add_argument(
+            "--shared-defs",
+            action="store_true",
+            help=f"Write the definitions of every schema once, to {DEFINITIONS_FILENAME}, and refer to them",
+        )
+
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            default=1,
+            help="Number of worker processes generating schemas, defaults to generating them in this process",
+        )
+
         optional_args = parser.parse_args(args)
 
         return optional_args
@@ -59,38 +248,177 @@ class SchemaWriter:
         Returns Iterator of AindCoreModel classes
         """
 
+        # The core modules are imported only once schemas are written
+        core.import_core_modules()
         for model in AindCoreModel.__subclasses__():
-            yield model
+            # Models defined elsewhere, e.g. in tests, are not published
+            if model.__module__.startswith(core.__name__):
+                yield model
+
+    def _output_file(self, schema: Type[AindCoreModel]) -> Path:
+        """Returns the path of the schema file of a model"""
+        filename = schema.default_filename()
+        file_extension = "".join(Path(filename).suffixes)
+        schema_filename = filename.replace(file_extension, "_schema.json")
+        if self.configs.attach_version:
+            schema_version = schema.model_construct().schema_version
+            model_directory_name = schema_filename.replace("_schema.json", "")
+            sub_directory = Path(self.configs.output) / model_directory_name / schema_version
+            return sub_directory / schema_filename
+        return Path(self.configs.output) / schema_filename
+
+    def _definitions_file(self) -> Path:
+        """Returns the path of the shared definitions document"""
+        if self.configs.attach_version:
+            return (
+                Path(self.configs.output)
+                / DEFINITIONS_FILENAME.replace("_schema.json", "")
+                / __version__
+                / DEFINITIONS_FILENAME
+            )
+        return Path(self.configs.output) / DEFINITIONS_FILENAME
 
-    def write_to_json(self) -> None:
+    def _definitions_stale(self, manifest: Dict[str, dict]) -> bool:
+        """Whether the shared definitions document is missing or was edited"""
+        definitions_file = self._definitions_file()
+        contents = _read_text(definitions_file)
+        entry = manifest.get(definitions_file.relative_to(self.configs.output).as_posix(), {})
+        return contents is None or entry.get("schema") != _text_hash(contents)
+
+    def _share_definitions(self, outputs: Dict[Path, Tuple[str, str]]) -> Dict[Path, Tuple[str, str]]:
+        """Moves the definitions of every schema into the shared definitions document"""
+        definitions_file = self._definitions_file()
+        schemas = [json.loads(schema_json_str) for _, schema_json_str in outputs.values()]
+        definitions_refs = [
+            Path(os.path.relpath(definitions_file, output_file.parent)).as_posix() for output_file in outputs
+        ]
+        definitions, thin_schemas = share_definitions(schemas, definitions_refs)
+        document = {
+            "title": "Definitions",
+            "description": f"Definitions shared by the aind-data-schema {__version__} core schemas",
+            "version": __version__,
+            "$defs": definitions,
+        }
+        shared = {
+            output_file: (source, json.dumps(thin_schema, indent=3))
+            for (output_file, (source, _)), thin_schema in zip(outputs.items(), thin_schemas)
+        }
+        sources = _text_hash("".join(source for source, _ in outputs.values()))
+        shared[definitions_file] = (sources, json.dumps(document, indent=3))
+        return shared
+
+    def _generate_schemas(self, schemas: List[Type[AindCoreModel]]) -> List[str]:
+        """Generates the json schemas of models, in parallel worker processes if there are several"""
+        jobs = min(self.configs.jobs, len(schemas))
+        if jobs <= 1:
+            return [json.dumps(schema.model_json_schema(), indent=3) for schema in schemas]
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(_generate_schema, [f"{s.__module__}:{s.__qualname__}" for s in schemas]))
+
+    def _stale_schemas(self, manifest: Dict[str, dict]) -> Dict[Path, Type[AindCoreModel]]:
+        """
+        Returns the schema file and model of each schema that needs to be
+        regenerated: its file is missing or was edited, the source it was
+        generated from has changed, or it was written with or without
+        --shared-defs and now is not
+        """
+        stale = dict()
+        for schema in self._get_schemas():
+            output_file = self._output_file(schema)
+            entry = manifest.get(output_file.relative_to(self.configs.output).as_posix(), {})
+            contents = _read_text(output_file)
+            if (
+                self.configs.force
+                or contents is None
+                or entry.get("source") != source_hash(schema)
+                or entry.get("schema") != _text_hash(contents)
+                or entry.get("shared_defs", False) != self.configs.shared_defs
+            ):
+                stale[output_file] = schema
+        return stale
+
+    def _remove_definitions(self, manifest: Dict[str, dict]) -> List[Path]:
+        """
+        Removes the shared definitions document left by an earlier run with
+        --shared-defs, unless checking, and returns it if it exists
         """
-        Writes Pydantic models to JSON file.
+        definitions_file = self._definitions_file()
+        if not definitions_file.is_file():
+            return []
+        if not self.configs.check:
+            definitions_file.unlink()
+            manifest.pop(definitions_file.relative_to(self.configs.output).as_posix(), None)
+        return [definitions_file]
+
+    def _write_outputs(self, outputs: Dict[Path, Tuple[str, str]], manifest: Dict[str, dict]) -> List[Path]:
+        """
+        Writes the schema files whose contents changed, unless checking, and
+        records them in the manifest. Returns the files that changed.
+        """
+        changed = []
+        for output_file, (source, schema_json_str) in outputs.items():
+            if schema_json_str != _read_text(output_file):
+                changed.append(output_file)
+                if self.configs.check:
+                    continue
+                if not os.path.exists(output_file.parent):
+                    os.makedirs(output_file.parent)
+                with open(output_file, "w") as f:
+                    f.write(schema_json_str)
+            manifest[output_file.relative_to(self.configs.output).as_posix()] = {
+                "source": source,
+                "schema": _text_hash(schema_json_str),
+                "shared_defs": self.configs.shared_defs,
+            }
+        return changed
+
+    def write_to_json(self) -> List[Path]:
+        """
+        Writes Pydantic models to JSON file. Only the schemas whose source
+        changed since they were last written are regenerated, and files whose
+        contents would not change are not rewritten. With --check, nothing is
+        written and the out of date files are reported instead. With
+        --shared-defs, the definitions of every schema are written once, to a
+        shared document, and the schemas refer to it. Without it, a shared
+        document left by an earlier run is removed.
+
+        Returns
+        -------
+        List[Path]
+          Schema files that were written or removed, or that are out of date
+          with --check
+
         """
-        schemas_to_write = self._get_schemas()
-        output_path = self.configs.output
-        for schema in schemas_to_write:
-            filename = schema.default_filename()
-            file_extension = "".join(Path(filename).suffixes)
-            schema_filename = filename.replace(file_extension, "_schema.json")
-            if self.configs.attach_version:
-                schema_version = schema.model_construct().schema_version
-                model_directory_name = schema_filename.replace("_schema.json", "")
-                sub_directory = Path(output_path) / model_directory_name / schema_version
-                output_file = sub_directory / schema_filename
-            else:
-                output_file = Path(output_path) / schema_filename
-
-            if not os.path.exists(output_file.parent):
-                os.makedirs(output_file.parent)
-
-            with open(output_file, "w") as f:
-                schema_json: dict = schema.model_json_schema()
-                schema_json_str: str = json.dumps(schema_json, indent=3)
-                f.write(schema_json_str)
+        manifest_file = Path(self.configs.output) / MANIFEST_FILENAME
+        manifest = json.loads(_read_text(manifest_file) or "{}")
+        stale = self._stale_schemas(manifest)
+        if self.configs.shared_defs and (stale or self._definitions_stale(manifest)):
+            # Every schema is needed to write the shared definitions
+            stale = {self._output_file(schema): schema for schema in self._get_schemas()}
+        schema_json_strs = self._generate_schemas(list(stale.values()))
+        outputs = {
+            output_file: (source_hash(schema), schema_json_str)
+            for (output_file, schema), schema_json_str in zip(stale.items(), schema_json_strs)
+        }
+        if self.configs.shared_defs and outputs:
+            outputs = self._share_definitions(outputs)
+        changed = self._write_outputs(outputs, manifest)
+        removed = [] if self.configs.shared_defs else self._remove_definitions(manifest)
+        if self.configs.check:
+            for output_file in changed:
+                print(f"{output_file} is out of date")
+            for output_file in removed:
+                print(f"{output_file} is no longer used")
+        elif stale or removed:
+            with open(manifest_file, "w") as f:
+                f.write(json.dumps(manifest, indent=3, sort_keys=True))
+        return changed + removed
 
 
 if __name__ == "__main__":
     """User defined argument for output directory"""
     sys_args = sys.argv[1:]
     s = SchemaWriter(sys_args)
-    s.write_to_json()
+    out_of_date = s.write_to_json()
+    if s.configs.check and out_of_date:
+        sys.exit(1)
@@ -0,0 +1,302 @@
+""" Utility to index queryable metadata fields into a local SQLite database """
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+from aind_data_schema.base import AindCoreModel
+from aind_data_schema.core.data_description import DataDescription
+from aind_data_schema.core.metadata import Metadata
+from aind_data_schema.utils.json_scanner import iter_object_members
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    content_hash TEXT,
+    schema_class TEXT NOT NULL,
+    record_id TEXT,
+    name TEXT,
+    location TEXT,
+    subject_id TEXT,
+    platform TEXT,
+    creation_time TEXT,
+    data_level TEXT,
+    metadata_status TEXT,
+    project_name TEXT
+);
+CREATE TABLE IF NOT EXISTS modalities (
+    path TEXT NOT NULL REFERENCES records(path) ON DELETE CASCADE,
+    modality TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_record_id ON records(record_id);
+CREATE INDEX IF NOT EXISTS idx_records_subject_id ON records(subject_id, creation_time);
+CREATE INDEX IF NOT EXISTS idx_records_platform ON records(platform, creation_time);
+CREATE INDEX IF NOT EXISTS idx_records_creation_time ON records(creation_time);
+CREATE INDEX IF NOT EXISTS idx_records_data_level ON records(data_level);
+CREATE INDEX IF NOT EXISTS idx_records_metadata_status ON records(metadata_status);
+CREATE INDEX IF NOT EXISTS idx_records_project_name ON records(project_name);
+CREATE INDEX IF NOT EXISTS idx_modalities_modality ON modalities(modality, path);
+CREATE INDEX IF NOT EXISTS idx_modalities_path ON modalities(path);
+"""
+
+_COLUMNS = (
+    "record_id",
+    "name",
+    "location",
+    "subject_id",
+    "platform",
+    "creation_time",
+    "data_level",
+    "metadata_status",
+    "project_name",
+)
+
+# Bumped whenever the stored values change format, so older indexes are rebuilt
+_INDEX_VERSION = 1
+
+# Creation times are stored in UTC with a fixed width so that they sort and
+# compare as strings in the same order as the times themselves
+_CREATION_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _normalize_creation_time(value: Union[str, datetime, None]) -> Optional[str]:
+    """Converts a creation time to a UTC string. Times without an offset are
+    taken to be UTC. Values that are not iso formatted times are dropped."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime(_CREATION_TIME_FORMAT)
+
+
+def _extract_data_description_fields(data_description: dict) -> dict:
+    """Pulls the queryable fields out of a data description dictionary"""
+    platform = data_description.get("platform") or {}
+    return {
+        "name": data_description.get("name"),
+        "subject_id": data_description.get("subject_id"),
+        "platform": platform.get("abbreviation"),
+        "creation_time": _normalize_creation_time(data_description.get("creation_time")),
+        "data_level": data_description.get("data_level"),
+        "project_name": data_description.get("project_name"),
+        "modalities": [m.get("abbreviation") for m in data_description.get("modality") or []],
+    }
+
+
+def extract_index_fields(contents: Union[str, bytes], schema_class: str) -> dict:
+    """
+    Extracts the queryable fields from the json of a Metadata or
+    DataDescription file. Only the members that are needed are decoded.
+    Parameters
+    ----------
+    contents : Union[str, bytes]
+      Json of the file
+    schema_class : str
+      Either "Metadata" or "DataDescription"
+
+    Returns
+    -------
+    dict
+      Queryable fields, with modality abbreviations under "modalities"
+
+    """
+    if schema_class == DataDescription.__name__:
+        fields = _extract_data_description_fields(json.loads(contents))
+        fields["record_id"] = fields["name"]
+        return fields
+
+    members = dict()
+    for key, raw_value in iter_object_members(contents):
+        if key in ("_id", "id", "name", "location", "metadata_status", "subject", "data_description"):
+            members[key] = json.loads(raw_value)
+    fields = _extract_data_description_fields(members.get("data_description") or {})
+    subject = members.get("subject") or {}
+    fields.update(
+        {
+            "record_id": members.get("_id", members.get("id")),
+            "name": members.get("name"),
+            "location": members.get("location"),
+            "metadata_status": members.get("metadata_status"),
+            "subject_id": subject.get("subject_id", fields["subject_id"]),
+        }
+    )
+    return fields
+
+
+class MetadataIndex:
+    """SQLite index of the queryable fields of Metadata and DataDescription files"""
+
+    SCHEMA_CLASSES = {
+        Metadata.default_filename(): Metadata,
+        DataDescription.default_filename(): DataDescription,
+    }
+
+    def __init__(self, db_path: Union[str, Path]) -> None:
+        """Open (and create if needed) the index database"""
+        self.connection = sqlite3.connect(str(db_path))
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] < _INDEX_VERSION:
+            with self.connection:
+                self.connection.execute("DELETE FROM records")
+                self.connection.execute(f"PRAGMA user_version = {_INDEX_VERSION}")
+
+    def close(self) -> None:
+        """Close the index database"""
+        self.connection.close()
+
+    def _iter_files(self, root: Path) -> Iterator[Path]:
+        """Yields every indexable file under root"""
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename in self.SCHEMA_CLASSES:
+                    yield Path(dirpath) / filename
+
+    def update(self, root: Union[str, Path], use_content_hash: bool = False) -> int:
+        """
+        Incrementally indexes every metadata.nd.json and data_description.json
+        file under root. Files are only re-read if their mtime changed, and
+        with use_content_hash, only re-indexed if their contents changed.
+        Entries for files under root that no longer exist are removed.
+        Parameters
+        ----------
+        root : Union[str, Path]
+          Directory to search
+        use_content_hash : bool
+          Compare content hashes instead of only modification times
+
+        Returns
+        -------
+        int
+          Number of files that were (re)indexed
+
+        """
+        root = Path(root).resolve()
+        known = {
+            row[0]: (row[1], row[2])
+            for row in self.connection.execute("SELECT path, mtime, content_hash FROM records")
+            if row[0].startswith(f"{root}{os.sep}")
+        }
+        indexed = 0
+        with self.connection:
+            for path in self._iter_files(root):
+                key = str(path)
+                mtime = path.stat().st_mtime
+                previous_mtime, previous_hash = known.pop(key, (None, None))
+                if previous_mtime == mtime:
+                    continue
+                contents = path.read_bytes()
+                content_hash = hashlib.sha256(contents).hexdigest() if use_content_hash else None
+                if content_hash is not None and content_hash == previous_hash:
+                    self.connection.execute("UPDATE records SET mtime = ? WHERE path = ?", (mtime, key))
+                    continue
+                self._index_file(key, mtime, content_hash, contents, self.SCHEMA_CLASSES[path.name].__name__)
+                indexed += 1
+            self.connection.executemany("DELETE FROM records WHERE path = ?", [(key,) for key in known])
+        return indexed
+
+    def _index_file(self, key: str, mtime: float, content_hash: Optional[str], contents: bytes, schema_class: str):
+        """Writes the index entries of a single file"""
+        fields = extract_index_fields(contents, schema_class)
+        self.connection.execute("DELETE FROM records WHERE path = ?", (key,))
+        self.connection.execute(
+            f"INSERT INTO records (path, mtime, content_hash, schema_class, {', '.join(_COLUMNS)}) "
+            f"VALUES (?, ?, ?, ?, {', '.join('?' for _ in _COLUMNS)})",
+            (key, mtime, content_hash, schema_class) + tuple(fields.get(column) for column in _COLUMNS),
+        )
+        self.connection.executemany(
+            "INSERT INTO modalities (path, modality) VALUES (?, ?)",
+            [(key, modality) for modality in fields["modalities"] if modality is not None],
+        )
+
+    def _select(self, columns: str, **filters) -> sqlite3.Cursor:
+        """Runs a query over the records table with the given filters"""
+        clauses = []
+        params = []
+        for column in ("subject_id", "platform", "data_level", "metadata_status", "project_name", "name"):
+            if filters.get(column) is not None:
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if filters.get("modality") is not None:
+            clauses.append("path IN (SELECT path FROM modalities WHERE modality = ?)")
+            params.append(filters["modality"])
+        if filters.get("created_after") is not None:
+            clauses.append("creation_time > ?")
+            params.append(_normalize_creation_time(filters["created_after"]))
+        if filters.get("created_before") is not None:
+            clauses.append("creation_time < ?")
+            params.append(_normalize_creation_time(filters["created_before"]))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return self.connection.execute(f"SELECT {columns} FROM records{where} ORDER BY creation_time, path", params)
+
+    def query(
+        self,
+        subject_id: Optional[str] = None,
+        platform: Optional[str] = None,
+        modality: Optional[str] = None,
+        data_level: Optional[str] = None,
+        metadata_status: Optional[str] = None,
+        project_name: Optional[str] = None,
+        name: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+    ) -> List[str]:
+        """
+        Returns the ids of the records matching every given filter. Platforms
+        and modalities are matched by abbreviation. Metadata records are
+        identified by their _id and DataDescription records by their name.
+        Creation times are compared in UTC, with times without an offset
+        taken to be UTC.
+        """
+        rows = self._select(
+            "record_id",
+            subject_id=subject_id,
+            platform=platform,
+            modality=modality,
+            data_level=data_level,
+            metadata_status=metadata_status,
+            project_name=project_name,
+            name=name,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        return [row[0] for row in rows]
+
+    def query_records(self, **filters) -> Iterator[AindCoreModel]:
+        """
+        Yields the records matching the filters accepted by query. Each file is
+        only read when its record is reached, and Metadata records are loaded
+        lazily with Metadata.model_validate_json_lazy.
+        """
+        for path, schema_class in self._select("path, schema_class", **filters).fetchall():
+            with open(path, "r") as f:
+                contents = f.read()
+            if schema_class == Metadata.__name__:
+                yield Metadata.model_validate_json_lazy(contents)
+            else:
+                yield DataDescription.model_validate_json(contents)
+
+
+if __name__ == "__main__":
+    sys_args = sys.argv[1:]
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--database", required=True, help="Path to the SQLite index file")
+    parser.add_argument("-r", "--root", required=True, help="Directory to search for metadata files")
+    parser.add_argument("--content-hash", action="store_true", help="Re-index files only if their contents changed")
+    parser.set_defaults(content_hash=False)
+    index_args = parser.parse_args(sys_args)
+    index = MetadataIndex(index_args.database)
+    index.update(index_args.root, use_content_hash=index_args.content_hash)
+    index.close()
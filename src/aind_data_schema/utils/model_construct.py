@@ -0,0 +1,204 @@
+""" Utility to build models from trusted json data without validating them """
+
+import inspect
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+from typing_extensions import Annotated, Literal
+
+# Types whose json values are already the values a validated model holds
+_PLAIN_TYPES = (str, bool, type(None))
+
+# Builders are compiled once per (annotation, discriminator, use_enum_values)
+_builders: Dict[Any, Callable[[Any], Any]] = dict()
+_model_builders: Dict[Type[BaseModel], Callable[[dict], BaseModel]] = dict()
+
+
+def _identity(value: Any) -> Any:
+    """Returns the value unchanged"""
+    return value
+
+
+def _literal_values(field_info: FieldInfo) -> Tuple[Any, ...]:
+    """Returns the allowed values of a Literal field, or an empty tuple if the field is not a Literal"""
+    if get_origin(field_info.annotation) is Literal:
+        return get_args(field_info.annotation)
+    return ()
+
+
+def _compile_matcher(model_class: Type[BaseModel]) -> Callable[[dict], bool]:
+    """Compiles the check of whether a json object could have been dumped from the given model class"""
+    keys = {field_info.alias or name: field_info for name, field_info in model_class.model_fields.items()}
+    allowed_keys = None if model_class.model_config.get("extra") == "allow" else set(keys)
+    required_keys = {key for key, field_info in keys.items() if field_info.is_required()}
+    literal_fields = [(key, _literal_values(field_info)) for key, field_info in keys.items()]
+    literal_fields = [(key, values) for key, values in literal_fields if values]
+
+    def matches(value: dict) -> bool:
+        """Whether the json object could belong to the model class"""
+        if not required_keys <= value.keys() or (allowed_keys is not None and not value.keys() <= allowed_keys):
+            return False
+        return all(value[key] in values for key, values in literal_fields if key in value)
+
+    return matches
+
+
+def _union_builder(annotation: Any, discriminator: Optional[str], use_enum_values: bool) -> Callable[[Any], Any]:
+    """Compiles the builder of a union type"""
+    options = [option for option in get_args(annotation) if option is not type(None)]
+    if len(options) == 1:
+        option_builder = get_builder(options[0], discriminator, use_enum_values)
+        return lambda value: None if value is None else option_builder(value)
+    model_classes = [option for option in options if inspect.isclass(option) and issubclass(option, BaseModel)]
+    adapter = TypeAdapter(annotation)
+    if len(model_classes) < len(options):
+        return adapter.validate_python
+
+    if discriminator is not None:
+        # Look up the model class directly from the discriminator value
+        by_tag = {tag: c for c in model_classes for tag in _literal_values(c.model_fields[discriminator])}
+
+        def build_tagged(value: Any) -> Any:
+            """Builds the model selected by the discriminator"""
+            model_class = by_tag.get(value.get(discriminator)) if isinstance(value, dict) else None
+            return adapter.validate_python(value) if model_class is None else construct_model(model_class, value)
+
+        return build_tagged
+
+    matchers = [(model_class, _compile_matcher(model_class)) for model_class in model_classes]
+
+    def build_untagged(value: Any) -> Any:
+        """Builds the only model the value can belong to, or validates it if that is ambiguous"""
+        candidates = [c for c, matches in matchers if matches(value)] if isinstance(value, dict) else []
+        return construct_model(candidates[0], value) if len(candidates) == 1 else adapter.validate_python(value)
+
+    return build_untagged
+
+
+def _container_builder(origin: type, args: Tuple[Any, ...], use_enum_values: bool) -> Callable[[Any], Any]:
+    """Compiles the builder of a list, set or dictionary type"""
+    if origin is dict:
+        key_annotation, value_annotation = args or (Any, Any)
+        key_builder = get_builder(key_annotation, None, use_enum_values)
+        value_builder = get_builder(value_annotation, None, use_enum_values)
+        return lambda value: {key_builder(k): value_builder(v) for k, v in value.items()}
+    (item_annotation,) = args or (Any,)
+    item_builder = get_builder(item_annotation, None, use_enum_values)
+    if origin is list:
+        return lambda value: [item_builder(item) for item in value]
+    return lambda value: origin(item_builder(item) for item in value)
+
+
+def _compile(annotation: Any, discriminator: Optional[str], use_enum_values: bool) -> Callable[[Any], Any]:
+    """Compiles the function that builds values of a type from json values"""
+    origin = get_origin(annotation)
+    if origin is Annotated:
+        args = get_args(annotation)
+        for metadata in args[1:]:
+            if isinstance(metadata, FieldInfo) and metadata.discriminator is not None:
+                discriminator = metadata.discriminator
+        return get_builder(args[0], discriminator, use_enum_values)
+    if origin is Union:
+        return _union_builder(annotation, discriminator, use_enum_values)
+    if annotation is Any or origin is Literal or annotation in _PLAIN_TYPES:
+        return _identity
+    if inspect.isclass(annotation) and issubclass(annotation, Enum) and use_enum_values:
+        return _identity
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return lambda value: construct_model(annotation, value)
+    if origin in (list, set, frozenset, dict):
+        return _container_builder(origin, get_args(annotation), use_enum_values)
+    # Leaves like dates, decimals and tuples are validated on their own
+    return TypeAdapter(annotation).validate_python
+
+
+def get_builder(annotation: Any, discriminator: Optional[str] = None, use_enum_values: bool = False) -> Callable:
+    """
+    Returns the function that builds the value of a field from trusted json,
+    as a validated model would hold it. Nested models, lists, sets,
+    dictionaries and unions are followed. Values whose type can not be
+    determined without validation, e.g. ambiguous unions, are validated on
+    their own. Builders are compiled once per type.
+    Parameters
+    ----------
+    annotation : Any
+      Type annotation of the field
+    discriminator : Optional[str]
+      Discriminator field of a union annotation
+    use_enum_values : bool
+      Whether the model holding the field stores enum values instead of members
+
+    Returns
+    -------
+    Callable
+      Function of the decoded json value
+
+    """
+    key = (annotation, discriminator, use_enum_values)
+    try:
+        builder = _builders.get(key)
+    except TypeError:  # pragma: no cover
+        # Unhashable annotation
+        return _compile(annotation, discriminator, use_enum_values)
+    if builder is None:
+        builder = _builders[key] = _compile(annotation, discriminator, use_enum_values)
+    return builder
+
+
+def _compile_model(model_class: Type[BaseModel]) -> Callable[[dict], BaseModel]:
+    """Compiles the function that builds a model from a json object"""
+    use_enum_values = bool(model_class.model_config.get("use_enum_values"))
+    fields: List[Tuple[str, str, Callable]] = [
+        (name, field_info.alias or name, get_builder(field_info.annotation, field_info.discriminator, use_enum_values))
+        for name, field_info in model_class.model_fields.items()
+    ]
+    complete = model_class.model_config.get("extra") != "allow"
+    # Models that share equal instances, e.g. the frozen registry names,
+    # return the shared instance as their validators do
+    shared_instance = getattr(model_class, "_shared_instance", _identity)
+
+    def build(data: dict) -> BaseModel:
+        """Builds the model"""
+        values = {name: builder(data[key]) for name, key, builder in fields if key in data}
+        if complete and len(values) == len(data) == len(fields):
+            # Every field is set, as in a file written by model_dump_json, so
+            # there are no defaults or extra fields to fill in
+            model = model_class.__new__(model_class)
+            object.__setattr__(model, "__dict__", values)
+            object.__setattr__(model, "__pydantic_fields_set__", set(values))
+            object.__setattr__(model, "__pydantic_extra__", None)
+            if model_class.__pydantic_post_init__:
+                model.model_post_init(None)
+            else:
+                object.__setattr__(model, "__pydantic_private__", None)
+            return shared_instance(model)
+        extra = {key: value for key, value in data.items() if key not in {k for _, k, _ in fields}}
+        return shared_instance(model_class.model_construct(**values, **extra))
+
+    return build
+
+
+def construct_model(model_class: Type[BaseModel], data: dict) -> BaseModel:
+    """
+    Builds a model from trusted json data with model_construct, recursively,
+    so that nested models, dates, decimals, etc. have the same types as in a
+    validated model. Validators are not run.
+    Parameters
+    ----------
+    model_class : Type[BaseModel]
+      Model class to build
+    data : dict
+      Decoded json object, e.g. written by model_dump_json
+
+    Returns
+    -------
+    BaseModel
+      Model built without validation
+
+    """
+    builder = _model_builders.get(model_class)
+    if builder is None:
+        builder = _model_builders[model_class] = _compile_model(model_class)
+    return builder(data)
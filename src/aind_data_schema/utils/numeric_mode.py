@@ -0,0 +1,120 @@
+""" Utility methods to write Decimals as json numbers and to read coordinate-heavy models with floats """
+
+from typing import Any, Dict, Type, Union
+
+from pydantic import BaseModel
+from pydantic_core import SchemaSerializer, SchemaValidator, core_schema
+
+# Models whose Decimal fields hold floats when read in float mode
+_FLOAT_MODE_MODELS = set()
+
+# Constraints shared by the decimal and float core schemas
+_FLOAT_CONSTRAINTS = ("le", "ge", "lt", "gt", "multiple_of", "allow_inf_nan", "strict", "ref", "metadata")
+
+# Variants of the core schemas of model classes are compiled once per class
+_number_serializers: Dict[type, SchemaSerializer] = dict()
+_float_validators: Dict[type, SchemaValidator] = dict()
+
+
+# Serialization of Decimals, or of the floats read in float mode, as json numbers
+_AS_FLOAT = core_schema.plain_serializer_function_ser_schema(float, when_used="json")
+
+
+def float_mode_model(model_class: type) -> type:
+    """
+    Class decorator that lets the Decimal fields of a model hold floats when
+    read with validate_json_floats. The model class itself is unchanged.
+    """
+    _FLOAT_MODE_MODELS.add(model_class)
+    return model_class
+
+
+def _replace_decimals(schema: Any, to_floats: bool, in_float_model: bool = False) -> Any:
+    """
+    Returns a copy of a core schema in which every decimal schema is
+    serialized as a float or, with to_floats, in which the decimal schemas
+    of float mode models are validated as floats. Unchanged parts are shared.
+    """
+    if isinstance(schema, list):
+        items = [_replace_decimals(item, to_floats, in_float_model) for item in schema]
+        return items if any(new is not old for new, old in zip(items, schema)) else schema
+    if not isinstance(schema, dict):
+        return schema
+    if schema.get("type") == "model":
+        in_float_model = schema["cls"] in _FLOAT_MODE_MODELS
+    if schema.get("type") == "decimal":
+        if not to_floats:
+            return dict(schema, serialization=_AS_FLOAT)
+        if in_float_model:
+            return dict({k: v for k, v in schema.items() if k in _FLOAT_CONSTRAINTS}, type="float")
+        return schema
+    replaced = {
+        key: value if key == "metadata" else _replace_decimals(value, to_floats, in_float_model)
+        for key, value in schema.items()
+    }
+    return replaced if any(replaced[key] is not schema[key] for key in schema) else schema
+
+
+def _core_schema(model_class: Type[BaseModel]) -> Any:
+    """Returns the core schema of a model class, building it first if it was deferred"""
+    model_class.model_rebuild()
+    return model_class.__pydantic_core_schema__
+
+
+def dump_json_numbers(model: BaseModel, indent: Union[int, None] = None) -> str:
+    """
+    Serializes a model to json with every Decimal written as a json number
+    instead of a string. The output is otherwise identical to
+    model_dump_json, and still validates against the model's json schema,
+    which accepts numbers for Decimal fields. Values are written as the
+    nearest float, so Decimals with more than 15 significant digits may be
+    rounded. Models read with validate_json_floats are written this way,
+    without the warnings model_dump_json gives for floats in Decimal fields.
+    Parameters
+    ----------
+    model : BaseModel
+      Model to serialize
+    indent : Union[int, None]
+      Indentation, as for model_dump_json
+
+    Returns
+    -------
+    str
+      Json of the model
+
+    """
+    model_class = model.__class__
+    serializer = _number_serializers.get(model_class)
+    if serializer is None:
+        schema = _replace_decimals(_core_schema(model_class), to_floats=False)
+        serializer = _number_serializers[model_class] = SchemaSerializer(schema)
+    return serializer.to_json(model, indent=indent).decode("utf-8")
+
+
+def validate_json_floats(model_class: Type[BaseModel], json_data: Union[str, bytes]) -> BaseModel:
+    """
+    Validates json in float mode: the Decimal fields of coordinates,
+    transforms and values (the models decorated with float_mode_model) are
+    validated as floats, which is much faster than building Decimals. Every
+    other field is validated as usual. Models read in float mode hold floats
+    where they would otherwise hold Decimals, so they should be written with
+    dump_json_numbers. The core schemas of the model classes are unchanged,
+    so reading and writing them as usual is not affected.
+    Parameters
+    ----------
+    model_class : Type[BaseModel]
+      Model class to validate against
+    json_data : Union[str, bytes]
+      Json to validate
+
+    Returns
+    -------
+    BaseModel
+      Validated model
+
+    """
+    validator = _float_validators.get(model_class)
+    if validator is None:
+        schema = _replace_decimals(_core_schema(model_class), to_floats=True)
+        validator = _float_validators[model_class] = SchemaValidator(schema)
+    return validator.validate_json(json_data)
@@ -0,0 +1,546 @@
+""" Utility methods to compile the json schemas in schemas/ into python validator functions """
+
+import argparse
+import hashlib
+import importlib.util
+import json
+import os
+import re
+import sys
+import types
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Environment variable overriding the directory compiled validators are cached in
+CACHE_DIR_ENV = "AIND_DATA_SCHEMA_CACHE_DIR"
+
+# Keywords that don't constrain an instance. jsonschema doesn't check formats
+# by default, so they are not checked either. The discriminator is only used
+# to dispatch a oneOf.
+_ANNOTATIONS = frozenset(
+    ["$comment", "$defs", "$id", "$schema", "default", "deprecated", "description", "discriminator", "examples"]
+    + ["format", "readOnly", "title", "writeOnly"]
+)
+
+# Keywords checked inline, without calling a function for the subschema
+_LOCAL_KEYWORDS = frozenset(["const", "enum", "maximum", "minimum", "pattern", "type"])
+
+# Keywords with subschemas or that only apply to arrays and objects
+_STRUCTURAL_KEYWORDS = frozenset(
+    ["$ref", "additionalProperties", "allOf", "anyOf", "items", "maxItems", "minItems", "oneOf", "properties"]
+    + ["required", "uniqueItems"]
+)
+
+_KEYWORDS = _ANNOTATIONS | _LOCAL_KEYWORDS | _STRUCTURAL_KEYWORDS
+
+# Python conditions for each json type, formatted with the name of the instance
+_TYPE_CONDITIONS = {
+    "array": "isinstance({0}, list)",
+    "boolean": "({0} is True or {0} is False)",
+    "integer": "(isinstance({0}, int) and not isinstance({0}, bool) or isinstance({0}, float) and {0}.is_integer())",
+    "null": "{0} is None",
+    "number": "(isinstance({0}, (int, float)) and not isinstance({0}, bool))",
+    "object": "isinstance({0}, dict)",
+    "string": "isinstance({0}, str)",
+}
+
+_HEADER = '''""" Validator compiled from {name} by aind_data_schema.utils.schema_compiler, do not edit """
+
+import re
+
+from aind_data_schema.utils.schema_compiler import MISSING, InstanceInvalid, json_equal, passes, unique_items
+
+SCHEMA_HASH = {schema_hash!r}
+
+
+def validate(instance):
+    """Raises a jsonschema ValidationError if the instance is not valid"""
+    try:
+        {root}(instance)
+    except InstanceInvalid as error:
+        raise error.validation_error() from None
+
+
+def is_valid(instance):
+    """Whether the instance is valid"""
+    return passes({root}, instance)
+'''
+
+# Sentinel for properties missing from an instance
+MISSING = object()
+
+_validators: Dict[str, types.ModuleType] = dict()
+
+
+class InstanceInvalid(Exception):
+    """Raised by compiled validators. The message is only formatted when needed, since most are caught."""
+
+    def __init__(self, validator: str, instance: Any, template: str, *args: Any):
+        """Holds the failed keyword, the instance and the message template"""
+        super().__init__(validator)
+        self.validator = validator
+        self.instance = instance
+        self.template = template
+        self.args_ = args
+        self.path = deque()
+
+    @property
+    def message(self) -> str:
+        """Message in the style of jsonschema"""
+        return self.template.format(self.instance, *self.args_)
+
+    def validation_error(self):
+        """Returns the equivalent jsonschema ValidationError"""
+        from jsonschema.exceptions import ValidationError
+
+        return ValidationError(self.message, validator=self.validator, path=self.path, instance=self.instance)
+
+
+def json_equal(one: Any, two: Any) -> bool:
+    """Whether two json values are equal, where booleans are not equal to numbers"""
+    if isinstance(one, str) or isinstance(two, str):
+        return one == two
+    if isinstance(one, list) and isinstance(two, list):
+        return len(one) == len(two) and all(json_equal(i, j) for i, j in zip(one, two))
+    if isinstance(one, dict) and isinstance(two, dict):
+        return one.keys() == two.keys() and all(json_equal(one[key], two[key]) for key in one)
+    if isinstance(one, bool) or isinstance(two, bool):
+        return one is two
+    return one == two
+
+
+def unique_items(items: list) -> bool:
+    """Whether the items of an array are unique json values"""
+    return not any(json_equal(items[i], items[j]) for i in range(len(items)) for j in range(i + 1, len(items)))
+
+
+def passes(function, instance: Any) -> bool:
+    """Whether a compiled check passes for an instance"""
+    try:
+        function(instance)
+    except InstanceInvalid:
+        return False
+    return True
+
+
+def _indent(lines: List[str]) -> List[str]:
+    """Indents lines of source by one level"""
+    return ["    " + line for line in lines]
+
+
+def _constraints(node: dict) -> set:
+    """Returns the keywords of a schema that constrain an instance"""
+    return set(node) - _ANNOTATIONS
+
+
+class _Compiler:
+    """Generates the source of a validator module from a json schema"""
+
+    def __init__(self, schema: dict):
+        """Starts with no functions generated"""
+        self.schema = schema
+        self.names: Dict[str, str] = dict()
+        self.pending: List[tuple] = []
+        self.constants: List[str] = []
+
+    def constant(self, source: str) -> str:
+        """Adds a module level constant and returns its name"""
+        name = f"_C{len(self.constants)}"
+        self.constants.append(f"{name} = {source}")
+        return name
+
+    def resolve(self, ref: str) -> dict:
+        """Returns the schema a local ref points to"""
+        if ref == "#":
+            return self.schema
+        match = re.fullmatch(r"#/\$defs/([^/]+)", ref)
+        if match is None:
+            raise ValueError(f"Unsupported $ref {ref!r}, only refs to $defs are compiled")
+        return self.schema["$defs"][match.group(1).replace("~1", "/").replace("~0", "~")]
+
+    def function(self, node: dict, ref: Optional[str] = None) -> str:
+        """Returns the name of the function checking a schema, generating it if needed"""
+        if ref is None and _constraints(node) == {"$ref"}:
+            return self.function(self.resolve(node["$ref"]), node["$ref"])
+        if ref is not None and ref != "#":
+            key = ref
+            name = "_def_" + re.sub(r"\W", "_", ref.rpartition("/")[2])
+        else:
+            key = json.dumps(
+                {k: v for k, v in node.items() if k in _constraints(node) | {"discriminator"}}, sort_keys=True
+            )
+            name = "_v"
+        if key not in self.names:
+            if name in self.names.values() or name == "_v":
+                name = f"{name}{len(self.names)}"
+            self.names[key] = name
+            self.pending.append((name, node))
+        return self.names[key]
+
+    def subschema(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking var against a subschema, inlined when it only has local keywords"""
+        if _constraints(node) <= _LOCAL_KEYWORDS:
+            return self.checks(node, var)
+        return [f"{self.function(node)}({var})"]
+
+    def checks(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking var against the keywords of a schema"""
+        unsupported = set(node) - _KEYWORDS
+        if unsupported:
+            raise ValueError(f"Unsupported json schema keywords {sorted(unsupported)}")
+        json_types = node.get("type")
+        json_types = [json_types] if isinstance(json_types, str) else json_types
+        lines = self.type_checks(json_types, var) + self.value_checks(node, var)
+        if "$ref" in node:
+            lines.append(f"{self.function(self.resolve(node['$ref']), node['$ref'])}({var})")
+        for subschema in node.get("allOf", []):
+            lines += self.subschema(subschema, var)
+        if "anyOf" in node:
+            lines += self.any_of(node["anyOf"], var)
+        if "oneOf" in node:
+            lines += self.one_of(node, var)
+        lines += self.guarded(self.number_checks(node, var), "number", json_types, var)
+        lines += self.guarded(self.string_checks(node, var), "string", json_types, var)
+        lines += self.guarded(self.array_checks(node, var), "array", json_types, var)
+        lines += self.guarded(self.object_checks(node, var), "object", json_types, var)
+        return lines
+
+    @staticmethod
+    def guarded(lines: List[str], json_type: str, json_types: Optional[List[str]], var: str) -> List[str]:
+        """Only runs the checks of a json type on instances of that type"""
+        if not lines or json_types == [json_type] or (json_type == "number" and json_types == ["integer"]):
+            return lines
+        return [f"if {_TYPE_CONDITIONS[json_type].format(var)}:"] + _indent(lines)
+
+    @staticmethod
+    def type_condition(json_types: List[str], var: str) -> str:
+        """Returns the condition that var has one of the json types"""
+        conditions = [_TYPE_CONDITIONS[json_type].format(var) for json_type in json_types]
+        return conditions[0] if len(conditions) == 1 else f"({' or '.join(conditions)})"
+
+    def type_checks(self, json_types: Optional[List[str]], var: str) -> List[str]:
+        """Returns the lines checking the type keyword"""
+        if json_types is None:
+            return []
+        template = "{0!r} is not of type " + ", ".join(repr(json_type) for json_type in json_types)
+        return [
+            f"if not {self.type_condition(json_types, var)}:",
+            f"    raise InstanceInvalid('type', {var}, {template!r})",
+        ]
+
+    def value_condition(self, node: dict, var: str) -> Optional[str]:
+        """Returns a condition for a schema with a single type, string const or string enum, if it has one"""
+        constraints = _constraints(node)
+        if constraints == {"type"}:
+            json_types = node["type"]
+            return self.type_condition([json_types] if isinstance(json_types, str) else json_types, var)
+        if constraints == {"const"} and isinstance(node["const"], str):
+            return f"{var} == {node['const']!r}"
+        if constraints == {"enum"} and all(isinstance(value, str) for value in node["enum"]):
+            return f"(isinstance({var}, str) and {var} in {self.constant(repr(frozenset(node['enum'])))})"
+        return None
+
+    def value_checks(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking the const and enum keywords"""
+        lines = []
+        if "const" in node:
+            const = node["const"]
+            condition = self.value_condition({"const": const}, var) or f"json_equal({var}, {const!r})"
+            lines += [
+                f"if not {condition}:",
+                f"    raise InstanceInvalid('const', {var}, '{{1!r}} was expected', {const!r})",
+            ]
+        if "enum" in node:
+            enum = node["enum"]
+            condition = self.value_condition({"enum": enum}, var)
+            if condition is None:
+                condition = f"any(json_equal({var}, member) for member in {self.constant(repr(enum))})"
+            lines += [
+                f"if not {condition}:",
+                f"    raise InstanceInvalid('enum', {var}, '{{0!r}} is not one of {{1!r}}', {enum!r})",
+            ]
+        return lines
+
+    @staticmethod
+    def number_checks(node: dict, var: str) -> List[str]:
+        """Returns the lines checking the minimum and maximum keywords"""
+        lines = []
+        for keyword, operator, word in [
+            ("minimum", "<", "less than the minimum"),
+            ("maximum", ">", "greater than the maximum"),
+        ]:
+            if keyword in node:
+                template = f"{{0!r}} is {word} of {node[keyword]!r}"
+                lines += [
+                    f"if {var} {operator} {node[keyword]!r}:",
+                    f"    raise InstanceInvalid({keyword!r}, {var}, {template!r})",
+                ]
+        return lines
+
+    def string_checks(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking the pattern keyword"""
+        if "pattern" not in node:
+            return []
+        pattern = self.constant(f"re.compile({node['pattern']!r})")
+        template = f"{{0!r}} does not match {node['pattern']!r}"
+        return [f"if not {pattern}.search({var}):", f"    raise InstanceInvalid('pattern', {var}, {template!r})"]
+
+    def array_checks(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking the keywords of arrays"""
+        lines = []
+        if "minItems" in node:
+            template = "{0!r} should be non-empty" if node["minItems"] == 1 else "{0!r} is too short"
+            lines += [
+                f"if len({var}) < {node['minItems']}:",
+                f"    raise InstanceInvalid('minItems', {var}, {template!r})",
+            ]
+        if "maxItems" in node:
+            template = "{0!r} is too long"
+            lines += [
+                f"if len({var}) > {node['maxItems']}:",
+                f"    raise InstanceInvalid('maxItems', {var}, {template!r})",
+            ]
+        if node.get("uniqueItems"):
+            template = "{0!r} has non-unique elements"
+            lines += [f"if not unique_items({var}):", f"    raise InstanceInvalid('uniqueItems', {var}, {template!r})"]
+        item_checks = self.subschema(node["items"], "item") if isinstance(node.get("items"), dict) else []
+        if item_checks:
+            lines += ["index = 0", "try:", f"    for index, item in enumerate({var}):"]
+            lines += _indent(_indent(item_checks))
+            lines += ["except InstanceInvalid as error:", "    error.path.appendleft(index)", "    raise"]
+        return lines
+
+    def object_checks(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking the keywords of objects"""
+        lines = []
+        properties = node.get("properties", {})
+        if node.get("required"):
+            lines += [
+                f"for key in {tuple(node['required'])!r}:",
+                f"    if key not in {var}:",
+                f"        raise InstanceInvalid('required', {var}, '{{1!r}} is a required property', key)",
+            ]
+        additional = node.get("additionalProperties", True)
+        if additional is False or isinstance(additional, dict):
+            names = self.constant(repr(frozenset(properties)))
+        if additional is False:
+            template = "Additional properties are not allowed ({1!r} was unexpected)"
+            lines += [
+                f"if not {names}.issuperset({var}):",
+                f"    for key in {var}:",
+                f"        if key not in {names}:",
+                f"            raise InstanceInvalid('additionalProperties', {var}, {template!r}, key)",
+            ]
+        value_checks = []
+        for name, subschema in properties.items():
+            checks = self.subschema(subschema, "value")
+            if checks:
+                value_checks += [f"key = {name!r}", f"value = {var}.get(key, MISSING)", "if value is not MISSING:"]
+                value_checks += _indent(checks)
+        additional_checks = self.subschema(additional, "value") if isinstance(additional, dict) else []
+        if additional_checks:
+            value_checks += [f"for key, value in {var}.items():", f"    if key not in {names}:"]
+            value_checks += _indent(_indent(additional_checks))
+        if value_checks:
+            lines += ["key = None", "try:"] + _indent(value_checks)
+            lines += ["except InstanceInvalid as error:", "    error.path.appendleft(key)", "    raise"]
+        return lines
+
+    def any_of(self, branches: List[dict], var: str) -> List[str]:
+        """Returns the lines checking anyOf, trying the branches with a single condition first"""
+        conditions = [self.value_condition(branch, var) for branch in branches]
+        functions = [self.function(branch) for branch, condition in zip(branches, conditions) if condition is None]
+        template = "{0!r} is not valid under any of the given schemas"
+        if len(functions) == 1:
+            # The error of the only branch that is not a simple condition is the most useful one
+            failed = [f"    {functions[0]}({var})"]
+        else:
+            passed = " or ".join(f"passes({function}, {var})" for function in functions) or "False"
+            failed = [f"    if not ({passed}):", f"        raise InstanceInvalid('anyOf', {var}, {template!r})"]
+        simple = [condition for condition in conditions if condition is not None]
+        if not simple:
+            return [line[4:] for line in failed]
+        return [f"if not ({' or '.join(simple)}):"] + failed
+
+    def dispatch(self, node: dict) -> Optional[tuple]:
+        """
+        Returns the property name and a constant mapping its values to
+        branch functions when the discriminator of a oneOf picks exactly the
+        branch that can be valid, i.e. every branch is a ref in the mapping
+        whose discriminator property is the const of its mapping key
+        """
+        discriminator = node.get("discriminator")
+        if not isinstance(discriminator, dict) or not isinstance(discriminator.get("mapping"), dict):
+            return None
+        name = discriminator.get("propertyName")
+        mapping = discriminator["mapping"]
+        refs = [branch.get("$ref") for branch in node["oneOf"] if set(branch) == {"$ref"}]
+        if len(refs) != len(node["oneOf"]) or sorted(refs) != sorted(mapping.values()):
+            return None
+        for tag, ref in mapping.items():
+            if self.resolve(ref).get("properties", {}).get(name, {}).get("const", MISSING) != tag:
+                return None
+        functions = ", ".join(f"{tag!r}: {self.function(self.resolve(ref), ref)}" for tag, ref in mapping.items())
+        return name, self.constant(f"{{{functions}}}")
+
+    def one_of(self, node: dict, var: str) -> List[str]:
+        """Returns the lines checking oneOf, dispatching on the discriminator when it is present"""
+        functions = ", ".join(self.function(branch) for branch in node["oneOf"])
+        none_valid = "{0!r} is not valid under any of the given schemas"
+        many_valid = "{0!r} is valid under each of more than one of the given schemas"
+        lines = [
+            f"passed = sum(passes(function, {var}) for function in ({functions},))",
+            "if passed == 0:",
+            f"    raise InstanceInvalid('oneOf', {var}, {none_valid!r})",
+            "if passed > 1:",
+            f"    raise InstanceInvalid('oneOf', {var}, {many_valid!r})",
+        ]
+        dispatch = self.dispatch(node)
+        if dispatch is None:
+            return lines
+        name, functions = dispatch
+        template = f"{{0!r}} is not one of {sorted(node['discriminator']['mapping'])!r}"
+        return [
+            f"if isinstance({var}, dict) and {name!r} in {var}:",
+            f"    tag = {var}[{name!r}]",
+            f"    branch = {functions}.get(tag) if isinstance(tag, str) else None",
+            "    if branch is None:",
+            f"        error = InstanceInvalid('discriminator', tag, {template!r})",
+            f"        error.path.append({name!r})",
+            "        raise error",
+            f"    branch({var})",
+            "else:",
+        ] + _indent(lines)
+
+    def compile(self, name: str, schema_hash: str) -> str:
+        """Returns the source of the validator module"""
+        root = self.function(self.schema, "#")
+        functions = []
+        while self.pending:
+            function_name, node = self.pending.pop(0)
+            functions += ["", "", f"def {function_name}(x):"] + _indent(self.checks(node, "x") or ["pass"])
+        source = [_HEADER.format(name=name, schema_hash=schema_hash, root=root)] + functions
+        if self.constants:
+            source += ["", ""] + self.constants
+        return "\n".join(source) + "\n"
+
+
+def schema_hash(schema_text: str) -> str:
+    """Returns the hash of a schema and of this compiler, which changes when either does"""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(schema_text.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def compile_schema(schema: dict, name: str = "schema", schema_text: Optional[str] = None) -> str:
+    """
+    Generates the source of a python module validating instances of a json
+    schema. The module has validate, which raises a jsonschema
+    ValidationError, and is_valid. A oneOf with a discriminator, as pydantic
+    writes for tagged unions, only checks the branch its tag selects.
+    Parameters
+    ----------
+    schema : dict
+      Json schema to compile
+    name : str
+      Name of the schema, written in the docstring of the module
+    schema_text : Optional[str]
+      Text the schema was read from, used for the schema hash
+
+    Returns
+    -------
+    str
+      Source of the validator module
+
+    """
+    if schema_text is None:
+        schema_text = json.dumps(schema, sort_keys=True)
+    return _Compiler(schema).compile(name, schema_hash(schema_text))
+
+
+def cache_dir() -> Path:
+    """Returns the directory compiled validators are cached in"""
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "aind_data_schema") / "validators"
+
+
+def _module_name(schema_path: Path) -> str:
+    """Returns a module name for the validator of a schema file, e.g. rig_schema"""
+    return re.sub(r"\W", "_", schema_path.name.split(".")[0])
+
+
+def _write(path: Path, text: str) -> None:
+    """Writes a file through a temporary file so other processes never read part of it"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(text)
+    os.replace(temp_path, path)
+
+
+def load_validator(schema_path: Union[str, Path]) -> types.ModuleType:
+    """
+    Returns the compiled validator of a schema file, compiling it into the
+    cache if it is not there yet. Validators are cached in memory and on disk
+    by the hash of the schema, so edited schemas are compiled again.
+    Parameters
+    ----------
+    schema_path : Union[str, Path]
+      Path of a json schema, e.g. schemas/rig_schema.json
+
+    Returns
+    -------
+    types.ModuleType
+      Module with validate and is_valid functions
+
+    """
+    schema_path = Path(schema_path)
+    schema_text = schema_path.read_text()
+    key = schema_hash(schema_text)
+    if key not in _validators:
+        module_name = f"{_module_name(schema_path)}_{key}"
+        path = cache_dir() / f"{module_name}.py"
+        if not path.exists():
+            _write(path, compile_schema(json.loads(schema_text), schema_path.name, schema_text))
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _validators[key] = module
+    return _validators[key]
+
+
+def compile_schemas(schemas_dir: Union[str, Path], output: Optional[Union[str, Path]] = None) -> List[Path]:
+    """
+    Compiles every schema in a directory, into the cache or into modules
+    named after the schemas in an output directory
+    Parameters
+    ----------
+    schemas_dir : Union[str, Path]
+      Directory of json schemas, e.g. schemas
+    output : Optional[Union[str, Path]]
+      Directory to write the modules to, defaults to the cache
+
+    Returns
+    -------
+    List[Path]
+      Paths of the compiled modules
+
+    """
+    paths = []
+    for schema_path in sorted(Path(schemas_dir).glob("*.json")):
+        if output is None:
+            paths.append(Path(load_validator(schema_path).__file__))
+        else:
+            path = Path(output) / f"{_module_name(schema_path)}.py"
+            schema_text = schema_path.read_text()
+            _write(path, compile_schema(json.loads(schema_text), schema_path.name, schema_text))
+            paths.append(path)
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compiles json schemas into python validators")
+    parser.add_argument("-s", "--schemas", default="schemas", help="Directory of json schemas, defaults to schemas")
+    parser.add_argument("-o", "--output", help="Directory to write the validator modules to, defaults to the cache")
+    configs = parser.parse_args(sys.argv[1:])
+    for compiled_path in compile_schemas(configs.schemas, configs.output):
+        print(compiled_path)
@@ -0,0 +1,333 @@
+""" Utility to compare two versions of a json schema and classify their differences """
+
+import hashlib
+import json
+import re
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Kinds of changes, from least to most severe
+ANNOTATION = "annotation"
+ADDITIVE = "additive"
+BREAKING = "breaking"
+_SEVERITY = {ANNOTATION: 0, ADDITIVE: 1, BREAKING: 2}
+
+# Keywords that document a schema without constraining instances
+_ANNOTATIONS = frozenset(["$comment", "default", "deprecated", "description", "enumNames", "examples", "title"])
+
+# Keywords that hold the definitions refs point to, in newer and older drafts
+_DEFINITIONS = ("$defs", "definitions")
+
+# Keywords whose larger values accept more instances, and those whose larger values accept fewer
+_LOWER_BOUNDS = frozenset(["exclusiveMinimum", "minItems", "minLength", "minProperties", "minimum"])
+_UPPER_BOUNDS = frozenset(["exclusiveMaximum", "maxItems", "maxLength", "maxProperties", "maximum"])
+
+_REF_PATTERN = re.compile(r'"\$ref": "([^"]*)"')
+
+_MISSING = object()
+
+
+class SchemaChange(NamedTuple):
+    """A difference between two versions of a schema"""
+
+    # JSON pointer to the changed keyword in the new schema, e.g. /$defs/Subject/properties/sex
+    path: str
+    # One of breaking, additive or annotation
+    kind: str
+    description: str
+
+
+def _canonical(value: Any) -> str:
+    """Returns the canonical json of a value, which is equal for equal values"""
+    return json.dumps(value, sort_keys=True)
+
+
+def _definitions(schema: dict) -> Dict[str, Tuple[str, dict]]:
+    """Maps the refs of the definitions of a schema to their hash and definition"""
+    found = dict()
+    for keyword in _DEFINITIONS:
+        for name, definition in schema.get(keyword, {}).items():
+            text = _canonical(definition)
+            found[f"#/{keyword}/{name}"] = (hashlib.sha256(text.encode("utf-8")).hexdigest(), definition)
+    return found
+
+
+def _without_annotations(node: Any) -> Any:
+    """Returns a schema without its annotation keywords"""
+    return {key: value for key, value in node.items() if key not in _ANNOTATIONS} if isinstance(node, dict) else node
+
+
+class _Differ:
+    """Walks two versions of a schema together, recording their differences"""
+
+    def __init__(self, old: dict, new: dict):
+        """Hashes the definitions of both schemas, so equal definitions are skipped"""
+        self.old_definitions = _definitions(old)
+        self.new_definitions = _definitions(new)
+        self.visited: Set[Tuple[str, str]] = set()
+        self.changes: List[SchemaChange] = []
+
+    def add(self, path: str, kind: str, description: str) -> None:
+        """Records a change"""
+        self.changes.append(SchemaChange(path, kind, description))
+
+    def compare(self, old: Any, new: Any, path: str) -> None:
+        """Compares two schemas, stopping at equal subtrees"""
+        if old == new:
+            self.follow_refs(_REF_PATTERN.findall(_canonical(old)))
+            return
+        if not isinstance(old, dict) or not isinstance(new, dict):
+            self.add(path, BREAKING, "schema replaced")
+            return
+        if self.compare_union_change(old, new, path):
+            return
+        for key in sorted(set(old) | set(new)):
+            if key not in _DEFINITIONS:
+                self.compare_keyword(key, old, new, f"{path}/{key}")
+
+    def compare_keyword(self, key: str, old: dict, new: dict, path: str) -> None:
+        """Compares a keyword of two schemas, which may be missing from either"""
+        old_value, new_value = old.get(key, _MISSING), new.get(key, _MISSING)
+        if old_value == new_value:
+            # Equal keywords may still refer to definitions that changed
+            self.follow_refs([new_value] if key == "$ref" else _REF_PATTERN.findall(_canonical(new_value)))
+        elif key in _ANNOTATIONS:
+            self.add(path, ANNOTATION, f"{key} changed")
+        elif key in self.keyword_handlers:
+            self.keyword_handlers[key](self, old_value, new_value, path, old, new)
+        elif key in _LOWER_BOUNDS or key in _UPPER_BOUNDS:
+            self.compare_bound(key, old_value, new_value, path)
+        elif new_value is _MISSING:
+            self.add(path, ADDITIVE, f"{key} removed")
+        else:
+            self.add(path, BREAKING, f"{key} changed")
+
+    def follow_refs(self, refs: Iterable[str]) -> None:
+        """Compares the definitions equal subtrees refer to, which may still differ"""
+        for ref in refs:
+            self.compare_ref(ref, ref)
+
+    def compare_ref(self, old_ref: str, new_ref: str) -> None:
+        """Compares the definitions two refs point to, skipping those with equal hashes"""
+        if (old_ref, new_ref) in self.visited:
+            return
+        self.visited.add((old_ref, new_ref))
+        old_hash, old_definition = self.old_definitions.get(old_ref, (None, None))
+        new_hash, new_definition = self.new_definitions.get(new_ref, (None, None))
+        if old_hash is not None and old_hash == new_hash:
+            self.follow_refs(_REF_PATTERN.findall(_canonical(new_definition)))
+        else:
+            self.compare(old_definition, new_definition, new_ref[1:])
+
+    def compare_union_change(self, old: dict, new: dict, path: str) -> bool:
+        """
+        Classifies a schema that became or stopped being a union, e.g. a field
+        that became Optional, and returns whether it was one
+        """
+        for keyword in ("anyOf", "oneOf"):
+            if keyword in new and keyword not in old:
+                branches, narrowed = new[keyword], old
+                kind = ADDITIVE
+            elif keyword in old and keyword not in new:
+                branches, narrowed = old[keyword], new
+                kind = BREAKING
+            else:
+                continue
+            if _without_annotations(narrowed) in map(_without_annotations, branches):
+                self.add(f"{path}/{keyword}", kind, "type widened" if kind == ADDITIVE else "type narrowed")
+            else:
+                self.add(f"{path}/{keyword}", BREAKING, "type changed")
+            return True
+        return False
+
+    def compare_properties(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares properties, where removed fields and new required fields are breaking"""
+        old_properties = {} if old_value is _MISSING else old_value
+        new_properties = {} if new_value is _MISSING else new_value
+        required = new.get("required", [])
+        for name in sorted(set(old_properties) | set(new_properties)):
+            property_path = f"{path}/{name}"
+            if name not in new_properties:
+                self.add(property_path, BREAKING, "field removed")
+            elif name not in old_properties:
+                kind = BREAKING if name in required else ADDITIVE
+                self.add(property_path, kind, "required field added" if name in required else "field added")
+            elif not (path == "/properties" and name == "schema_version"):
+                # The schema_version const is the version being checked, not a change
+                self.compare(old_properties[name], new_properties[name], property_path)
+
+    def compare_required(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares required fields, where fields that became required are breaking"""
+        old_required = set([] if old_value is _MISSING else old_value)
+        new_required = set([] if new_value is _MISSING else new_value)
+        old_properties = old.get("properties", {})
+        for name in sorted(new_required - old_required):
+            # Fields added as required are reported with the properties
+            if name in old_properties:
+                self.add(f"{path}/{name}", BREAKING, "field made required")
+        for name in sorted(old_required - new_required):
+            self.add(f"{path}/{name}", ADDITIVE, "field made optional")
+
+    def compare_enum(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares enums, where removed values narrow the enum"""
+        if old_value is _MISSING or new_value is _MISSING:
+            kind = ADDITIVE if new_value is _MISSING else BREAKING
+            self.add(path, kind, "enum removed" if new_value is _MISSING else "enum added")
+            return
+        old_values = set(map(_canonical, old_value))
+        new_values = set(map(_canonical, new_value))
+        if old_values - new_values:
+            self.add(path, BREAKING, f"enum narrowed, removed {sorted(old_values - new_values)}")
+        if new_values - old_values:
+            self.add(path, ADDITIVE, f"enum widened, added {sorted(new_values - old_values)}")
+        if old_values == new_values:
+            self.add(path, ANNOTATION, "enum reordered")
+
+    def compare_const(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares consts, e.g. Literal fields, which only accept one value"""
+        if new_value is _MISSING:
+            self.add(path, ADDITIVE, "const removed")
+        else:
+            self.add(path, BREAKING, f"const changed to {new_value!r}")
+
+    def compare_type(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares types, where a type accepting fewer instances is breaking"""
+        old_types = _types(old_value)
+        new_types = _types(new_value)
+        if old_types <= new_types:
+            self.add(path, ADDITIVE, "type widened")
+        else:
+            self.add(path, BREAKING, "type narrowed" if new_types < old_types else "type changed")
+
+    def compare_union(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares the branches of an anyOf or oneOf, pairing changed branches by position"""
+        removed, added = _unmatched(old_value, new_value)
+        if len(removed) == len(added):
+            for (index, old_branch), (_, new_branch) in zip(removed, added):
+                self.compare(old_branch, new_branch, f"{path}/{index}")
+            return
+        for index, _ in removed:
+            self.add(f"{path}/{index}", BREAKING, "type removed from union")
+        for index, _ in added:
+            self.add(f"{path}/{index}", ADDITIVE, "type added to union")
+
+    def compare_all_of(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares the schemas of an allOf, where each added schema is another constraint"""
+        removed, added = _unmatched(
+            [] if old_value is _MISSING else old_value, [] if new_value is _MISSING else new_value
+        )
+        if len(removed) == len(added):
+            for (index, old_branch), (_, new_branch) in zip(removed, added):
+                self.compare(old_branch, new_branch, f"{path}/{index}")
+            return
+        for index, _ in removed:
+            self.add(f"{path}/{index}", ADDITIVE, "constraint removed")
+        for index, _ in added:
+            self.add(f"{path}/{index}", BREAKING, "constraint added")
+
+    def compare_subschema(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares a keyword holding a schema, e.g. items or additionalProperties, where a missing one is {}"""
+        old_value = {} if old_value is _MISSING or old_value is True else old_value
+        new_value = {} if new_value is _MISSING or new_value is True else new_value
+        if new_value is False:
+            self.add(path, BREAKING, "no longer allowed")
+        elif old_value is False:
+            self.add(path, ADDITIVE, "now allowed")
+        else:
+            self.compare(old_value, new_value, path)
+
+    def compare_ref_keyword(self, old_value: Any, new_value: Any, path: str, old: dict, new: dict) -> None:
+        """Compares the definitions of refs, so renamed definitions are compared by structure"""
+        if old_value is _MISSING or new_value is _MISSING:
+            self.add(path, BREAKING, "type changed")
+        else:
+            self.compare_ref(old_value, new_value)
+
+    def compare_bound(self, key: str, old_value: Any, new_value: Any, path: str) -> None:
+        """Compares a bound, where a stricter bound is breaking"""
+        if new_value is _MISSING:
+            self.add(path, ADDITIVE, f"{key} removed")
+        elif old_value is _MISSING or (new_value > old_value) == (key in _LOWER_BOUNDS):
+            self.add(path, BREAKING, f"{key} tightened")
+        else:
+            self.add(path, ADDITIVE, f"{key} relaxed")
+
+    keyword_handlers = {
+        "$ref": compare_ref_keyword,
+        "additionalProperties": compare_subschema,
+        "allOf": compare_all_of,
+        "anyOf": compare_union,
+        "const": compare_const,
+        "enum": compare_enum,
+        "items": compare_subschema,
+        "oneOf": compare_union,
+        "properties": compare_properties,
+        "required": compare_required,
+        "type": compare_type,
+    }
+
+
+def _types(value: Any) -> Set[str]:
+    """Returns the json types a type keyword allows, where a missing one allows every type"""
+    if value is _MISSING:
+        return {"array", "boolean", "integer", "null", "number", "object", "string"}
+    types = {value} if isinstance(value, str) else set(value)
+    # Every integer is a number
+    return types | {"integer"} if "number" in types else types
+
+
+def _unmatched(old_branches: List[Any], new_branches: List[Any]) -> Tuple[List[tuple], List[tuple]]:
+    """Returns the indexed branches of each version that have no equal branch in the other"""
+    old_texts = {_canonical(branch) for branch in old_branches}
+    new_texts = {_canonical(branch) for branch in new_branches}
+    removed = [(index, branch) for index, branch in enumerate(old_branches) if _canonical(branch) not in new_texts]
+    added = [(index, branch) for index, branch in enumerate(new_branches) if _canonical(branch) not in old_texts]
+    return removed, added
+
+
+def diff_schemas(old: dict, new: dict) -> List[SchemaChange]:
+    """
+    Compares two versions of a json schema. Subtrees that are equal are not
+    walked, and definitions that hash equal are skipped, so the time taken
+    grows with the size of the changes rather than the size of the schema.
+    Parameters
+    ----------
+    old : dict
+      Previous version of the schema
+    new : dict
+      New version of the schema
+
+    Returns
+    -------
+    List[SchemaChange]
+      Changes between the versions, breaking changes first
+
+    """
+    differ = _Differ(old, new)
+    differ.compare(old, new, "")
+    return sorted(differ.changes, key=lambda change: -_SEVERITY[change.kind])
+
+
+def required_bump(changes: List[SchemaChange], old_version: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the smallest semver bump allowed for changes: major for breaking
+    changes, minor for additive ones and patch otherwise. Before 1.0.0 every
+    level moves down one, so breaking changes need a minor bump.
+    Parameters
+    ----------
+    changes : List[SchemaChange]
+      Changes found by diff_schemas
+    old_version : Optional[str]
+      Previous version, like "0.2.1"
+
+    Returns
+    -------
+    Optional[str]
+      One of major, minor or patch, or None if there are no changes
+
+    """
+    if not changes:
+        return None
+    severity = max(_SEVERITY[change.kind] for change in changes)
+    if old_version is not None and old_version.startswith("0."):
+        severity = max(severity - 1, 0)
+    return ["patch", "minor", "major"][severity]
@@ -3,15 +3,27 @@
 import argparse
 import json
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
-import dictdiffer
 import semver
 
+from aind_data_schema.utils.json_writer import DEFINITIONS_FILENAME
+from aind_data_schema.utils.schema_diff import SchemaChange, diff_schemas, required_bump
 
-def compare_versions(new_ver: str, old_ver: Optional[str]) -> (bool, Optional[str]):
+# Semver bump levels, from smallest to largest
+BUMP_LEVELS = ["patch", "minor", "major"]
+
+# Refs, including those of discriminator mappings, into the shared definitions document
+_SHARED_REF_PATTERN = re.compile(r'"[^"]*' + re.escape(DEFINITIONS_FILENAME) + r"#/\$defs/")
+# Names of the definitions that local refs point to
+_LOCAL_REF_PATTERN = re.compile(r'"#/\$defs/([^"]*)"')
+
+
+def compare_versions(new_ver: str, old_ver: Optional[str], minimum_bump: str = "patch") -> (bool, Optional[str]):
     """
     Compares an old version with a new version.
     Parameters
@@ -20,6 +32,8 @@ def compare_versions(new_ver: str, old_ver: Optional[str]) -> (bool, Optional[st
       Like "0.2.0"
     old_ver : str
       Like "0.1.3"
+    minimum_bump : str
+      Smallest bump allowed, one of patch, minor or major. Defaults to patch.
 
     Returns
     -------
@@ -39,62 +53,156 @@ def compare_versions(new_ver: str, old_ver: Optional[str]) -> (bool, Optional[st
     except (TypeError, ValueError):
         return (True, None)
 
-    major_bump = new_v == old_v.bump_major()
-    minor_bump = new_v == old_v.bump_minor()
-    patch_bump = new_v == old_v.bump_patch()
+    bumps = [old_v.bump_patch(), old_v.bump_minor(), old_v.bump_major()]
 
-    if major_bump or minor_bump or patch_bump:
-        return (True, None)
-    else:
+    if new_v not in bumps:
         return (
             False,
             f"Version not bumped correctly. New Version: {new_ver}. Old Version: {old_ver}",
         )
+    elif bumps.index(new_v) < BUMP_LEVELS.index(minimum_bump):
+        return (
+            False,
+            f"Version bump too small, changes require a {minimum_bump} bump. "
+            f"New Version: {new_ver}. Old Version: {old_ver}",
+        )
+    else:
+        return (True, None)
+
+
+def _schema_version(schema: dict) -> Optional[str]:
+    """Returns the schema_version const of a schema, if it has one"""
+    schema_version = schema.get("properties", {}).get("schema_version")
+    return schema_version.get("const") if isinstance(schema_version, dict) else None
 
 
-def run_job(new_schema_folder: str, old_schema_folder: str) -> None:
+def _read_folders(new_schema_folder: str, old_schema_folder: str) -> Dict[str, Tuple[bytes, bytes]]:
     """
-    Loops through files in folders and creates a list of common files.
-    For each common file, if they are equal, nothing happens. If they are
-    different, the schema_version in the new file is checked against the old.
-    An AssertionError is raised if the version is not bumped correctly.
+    Reads the schemas in both folders concurrently and returns the contents
+    of those in both. The shared definitions document is returned too, if
+    either folder has one, with None for a folder without it.
+    """
+    old_files = set(os.listdir(Path(old_schema_folder)))
+    new_files = set(os.listdir(Path(new_schema_folder)))
+    # Hidden files, e.g. the json_writer manifest, are not schemas
+    common_files = sorted(file for file in old_files.intersection(new_files) if not file.startswith("."))
+    if DEFINITIONS_FILENAME in old_files.union(new_files) and DEFINITIONS_FILENAME not in common_files:
+        common_files.append(DEFINITIONS_FILENAME)
+    paths = [Path(folder) / file for file in common_files for folder in (new_schema_folder, old_schema_folder)]
+    with ThreadPoolExecutor(max_workers=min(len(paths), 16) or 1) as executor:
+        contents = list(executor.map(_read_bytes, paths))
+    return {file: (contents[2 * index], contents[2 * index + 1]) for index, file in enumerate(common_files)}
+
+
+def _read_bytes(path: Path) -> Optional[bytes]:
+    """Returns the contents of a file, or None if it does not exist"""
+    return path.read_bytes() if path.exists() else None
+
+
+def _resolve_shared_definitions(schema: dict, definitions: Optional[dict]) -> dict:
+    """
+    Returns a schema written with --shared-defs as if it were self-contained:
+    its refs into the shared definitions document point to local copies of
+    the definitions it uses, directly or through other definitions. A change
+    to a shared definition is then a change to every schema using it.
+    """
+    text = json.dumps(schema)
+    if definitions is None or not _SHARED_REF_PATTERN.search(text):
+        return schema
+    text = _SHARED_REF_PATTERN.sub('"#/$defs/', text)
+    resolved = json.loads(text)
+    local_definitions = resolved.setdefault("$defs", dict())
+    names = _LOCAL_REF_PATTERN.findall(text)
+    while names:
+        name = names.pop()
+        if name not in local_definitions and name in definitions:
+            local_definitions[name] = definitions[name]
+            names.extend(_LOCAL_REF_PATTERN.findall(json.dumps(definitions[name])))
+    return resolved
+
+
+def check_schema(
+    new_contents: bytes,
+    old_contents: bytes,
+    new_definitions: Optional[dict] = None,
+    old_definitions: Optional[dict] = None,
+) -> Tuple[List[SchemaChange], Optional[str]]:
+    """
+    Compares two versions of a schema file and checks its schema_version
+    Parameters
+    ----------
+    new_contents : bytes
+      Contents of the new schema file
+    old_contents : bytes
+      Contents of the old schema file
+    new_definitions : Optional[dict]
+      $defs of the new shared definitions document, for schemas written with --shared-defs
+    old_definitions : Optional[dict]
+      $defs of the old shared definitions document
+
+    Returns
+    -------
+    Tuple[List[SchemaChange], Optional[str]]
+      Changes between the versions, and an error message if the version is
+      not bumped enough for them
+
+    """
+    # Files with the same bytes, and the same shared definitions, are not parsed
+    if new_contents == old_contents and new_definitions == old_definitions:
+        return [], None
+    old_model = _resolve_shared_definitions(json.loads(old_contents), old_definitions)
+    new_model = _resolve_shared_definitions(json.loads(new_contents), new_definitions)
+    changes = diff_schemas(old_model, new_model)
+    new_schema_version = _schema_version(new_model)
+    old_schema_version = _schema_version(old_model)
+    if not changes and new_schema_version == old_schema_version:
+        return [], None
+    v_check = compare_versions(new_schema_version, old_schema_version)
+    if v_check[0] is False:
+        return changes, v_check[1]
+    bump = required_bump(changes, old_schema_version)
+    v_check = compare_versions(new_schema_version, old_schema_version, bump or "patch")
+    if v_check[0] is False:
+        change = changes[0]
+        return changes, f"{v_check[1]} ({change.kind} change at {change.path}: {change.description})"
+    return changes, None
+
+
+def run_job(new_schema_folder: str, old_schema_folder: str, verbose: bool = False) -> None:
+    """
+    Loops through files in folders and compares the schemas in both. For
+    each schema that changed, the changes are classified as breaking,
+    additive or annotation changes, and the schema_version in the new file
+    is checked against the old. An AssertionError is raised if the version
+    is not bumped, or is bumped less than the changes require. Schemas
+    written with --shared-defs are compared with the definitions they use
+    from the definitions document in their folder.
     Parameters
     ----------
     new_schema_folder : str
     old_schema_folder : str
+    verbose : bool
+      Print every change found. Defaults to False.
 
     Returns
     -------
     None
 
     """
-
-    def open_json_file(path):
-        """Helper method to read a json file"""
-        with open(path, "r") as f:
-            data = json.load(f)
-        return data
-
-    files_in_old_schema_folder = os.listdir(Path(old_schema_folder))
-    files_in_new_schema_folder = os.listdir(Path(new_schema_folder))
-    common_files: list = list(set(files_in_old_schema_folder).intersection(set(files_in_new_schema_folder)))
     version_comparison_issues = []
-    for file in common_files:
-        old_model = open_json_file(Path(old_schema_folder) / file)
-        new_model = open_json_file(Path(new_schema_folder) / file)
-        diff = dictdiffer.diff(old_model, new_model)
-        is_equal = len(list(diff)) == 0
-        if not is_equal:
-            new_schema_version = new_model["properties"]["schema_version"]["const"]
-            old_schema_version_dict = old_model["properties"].get("schema_version")
-            old_schema_version = (
-                None
-                if old_schema_version_dict is None or not isinstance(old_schema_version_dict, dict)
-                else old_schema_version_dict.get("const")
-            )
-            v_check = compare_versions(new_schema_version, old_schema_version)
-            if v_check[0] is False:
-                version_comparison_issues.append(f"{file} - {v_check[1]}")
+    files = _read_folders(new_schema_folder, old_schema_folder)
+    # The shared definitions document is not a schema itself, but is part of every schema referring to it
+    new_definitions, old_definitions = (
+        None if contents is None else json.loads(contents).get("$defs", {})
+        for contents in files.pop(DEFINITIONS_FILENAME, (None, None))
+    )
+    for file, (new_contents, old_contents) in files.items():
+        changes, issue = check_schema(new_contents, old_contents, new_definitions, old_definitions)
+        if verbose:
+            for change in changes:
+                print(f"{file} {change.kind}: {change.path} {change.description}")
+        if issue is not None:
+            version_comparison_issues.append(f"{file} - {issue}")
     if len(version_comparison_issues) > 0:
         version_comparison_issues.sort()
         raise AssertionError(f"There were issues checking the schema versions: {version_comparison_issues}")
@@ -114,8 +222,10 @@ if __name__ == "__main__":
         "--new-schema-folder",
         required=True,
     )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print every change found")
     folder_args = parser.parse_args(sys_args)
     run_job(
         new_schema_folder=folder_args.new_schema_folder,
         old_schema_folder=folder_args.old_schema_folder,
+        verbose=folder_args.verbose,
     )
@@ -0,0 +1,278 @@
+""" Utility to validate models in a diagnostic mode that collects every error instead of stopping """
+
+import functools
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Type, Union
+
+from pydantic import BaseModel, ValidationError
+from pydantic_core import SchemaValidator, core_schema
+
+# Report of the diagnostic validation running in the current context, if any
+_ACTIVE_REPORT = ContextVar("_ACTIVE_REPORT", default=None)
+
+# Validators of model classes with instrumented custom validators are compiled once per class
+_diagnostic_validators: Dict[type, SchemaValidator] = dict()
+
+
+class ValidationIssue(NamedTuple):
+    """A single validation error"""
+
+    # JSON pointer to the failing value
+    path: Optional[str]
+    message: str
+    # Qualified name of the custom validator that failed, or None for
+    # errors raised by pydantic itself (e.g. a missing field)
+    validator: Optional[str] = None
+
+
+class _Position:
+    """Position of the element of a list or dictionary being validated"""
+
+    def __init__(self, keys: Optional[List[Any]] = None) -> None:
+        """Starts before the first element. Dictionaries give their keys, lists are indexed."""
+        self.keys = keys
+        self.index = -1
+
+    def __str__(self) -> str:
+        """Index or key of the element"""
+        if self.keys is not None and self.index < len(self.keys):
+            return str(self.keys[self.index])
+        return str(self.index)
+
+
+class ValidationReport:
+    """Errors and validator timings collected by a diagnostic validation"""
+
+    def __init__(self) -> None:
+        """Starts an empty report"""
+        self.issues: List[ValidationIssue] = []
+        self.timings: Dict[str, float] = dict()
+        self.calls: Dict[str, int] = dict()
+        self.elapsed: float = 0.0
+        self.model: Optional[BaseModel] = None
+        # Location of the value being validated, as field names and positions
+        self._location: List[Any] = []
+        self._custom_issues: List[ValidationIssue] = []
+
+    @property
+    def is_valid(self) -> bool:
+        """Whether no errors were found"""
+        return not self.issues
+
+    def _record_time(self, validator: str, elapsed: float) -> None:
+        """Adds the duration of one call of a custom validator"""
+        self.timings[validator] = self.timings.get(validator, 0.0) + elapsed
+        self.calls[validator] = self.calls.get(validator, 0) + 1
+
+    def _add_validation_error(self, error: ValidationError) -> None:
+        """Adds the errors reported by pydantic"""
+        for e in error.errors():
+            self.issues.append(ValidationIssue(path=_to_pointer(e["loc"]), message=e["msg"]))
+
+    def _add_custom_issue(self, message: str, validator: str) -> None:
+        """Adds the failure of a custom validator on the value being validated"""
+        self._custom_issues.append(ValidationIssue(_to_pointer(self._location), message, validator))
+
+
+def _to_pointer(loc: Iterable[Any]) -> str:
+    """Converts a location, e.g. of a pydantic error, to a JSON pointer"""
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in loc)
+
+
+def _instrument(func: Callable) -> Callable:
+    """
+    Wraps a custom validator so that it is timed and its failures are
+    recorded in the report of the running diagnostic validation instead of
+    raised. The value being validated is always the first argument.
+    """
+    name = ".".join(getattr(func, "__qualname__", func.__name__).split(".")[-2:])
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        """Calls the validator"""
+        report = _ACTIVE_REPORT.get()
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            message = str(e) if isinstance(e, (ValueError, AssertionError)) else f"{type(e).__name__}: {e}"
+            report._add_custom_issue(message, name)
+            # Keep going with the value as it was before this validator
+            return args[0]
+        finally:
+            report._record_time(name, time.perf_counter() - start)
+
+    return wrapper
+
+
+def _at_field(key: str) -> Callable:
+    """Returns a wrap validator that records that a field is being validated"""
+
+    def validate_field(value: Any, handler: Callable) -> Any:
+        """Validates the value of the field"""
+        location = _ACTIVE_REPORT.get()._location
+        location.append(key)
+        try:
+            return handler(value)
+        finally:
+            location.pop()
+
+    return validate_field
+
+
+def _in_container(value: Any, handler: Callable) -> Any:
+    """Wrap validator that records that the elements of a list or dictionary are being validated"""
+    location = _ACTIVE_REPORT.get()._location
+    location.append(_Position(list(value) if isinstance(value, dict) else None))
+    try:
+        return handler(value)
+    finally:
+        location.pop()
+
+
+def _at_next_element(value: Any, handler: Callable) -> Any:
+    """Wrap validator that records that the next element of a list or dictionary is being validated"""
+    _ACTIVE_REPORT.get()._location[-1].index += 1
+    return handler(value)
+
+
+def _locate_fields(fields: Dict[str, dict]) -> Dict[str, dict]:
+    """Wraps the schemas of the fields of a model, so failures are located in the field"""
+    located = dict()
+    for name, field in fields.items():
+        alias = field.get("validation_alias")
+        wrap = _at_field(alias if isinstance(alias, str) else name)
+        schema = field["schema"]
+        if schema["type"] == "default":
+            # Defaults are only applied by the default schema itself, so the value inside it is wrapped
+            schema = dict(schema, schema=core_schema.no_info_wrap_validator_function(wrap, schema["schema"]))
+        else:
+            schema = core_schema.no_info_wrap_validator_function(wrap, schema)
+        located[name] = dict(field, schema=schema)
+    return located
+
+
+def _locate_elements(schema: dict) -> dict:
+    """Wraps a list or dictionary schema, so failures are located in the element"""
+    key = "values_schema" if schema["type"] == "dict" else "items_schema"
+    elements = schema.get(key, core_schema.any_schema())
+    schema = dict(schema, **{key: core_schema.no_info_wrap_validator_function(_at_next_element, elements)})
+    return core_schema.no_info_wrap_validator_function(_in_container, schema)
+
+
+@functools.lru_cache(maxsize=None)
+def _custom_validators(model_class: type) -> Set[Callable]:
+    """Returns the field validators and "after" model validators of a model class, as they appear in its core schema"""
+    decorators = model_class.__pydantic_decorators__
+    validators = {d.func for d in decorators.field_validators.values()}
+    validators.update(d.func for d in decorators.model_validators.values() if d.info.mode == "after")
+    return validators
+
+
+def _wrapped_model_class(schema: dict) -> Optional[type]:
+    """Returns the class of the model schema wrapped by a function schema, e.g. by a model validator"""
+    while isinstance(schema, dict) and schema.get("type") != "model":
+        schema = schema.get("schema")
+    return schema["cls"] if isinstance(schema, dict) else None
+
+
+def _instrument_function(schema: dict, owner: Optional[type]) -> dict:
+    """Instruments the function of a function schema if it is a custom validator"""
+    function = schema["function"]
+    # Field validators belong to the enclosing model, model validators to the model they wrap
+    for model_class in (owner, _wrapped_model_class(schema)):
+        if model_class is not None and function["function"] in _custom_validators(model_class):
+            return dict(schema, function=dict(function, function=_instrument(function["function"])))
+    return schema
+
+
+def _instrument_schema(schema: Any, owner: Optional[type] = None) -> Any:
+    """
+    Returns a copy of a core schema in which the custom validators of every
+    model are instrumented, and the fields of models and the elements of
+    lists and dictionaries record where their values are validated, so that
+    failures are located as they happen. Unchanged parts are shared.
+    """
+    if isinstance(schema, list):
+        items = [_instrument_schema(item, owner) for item in schema]
+        return items if any(new is not old for new, old in zip(items, schema)) else schema
+    if not isinstance(schema, dict):
+        return schema
+    if schema.get("type") == "model":
+        owner = schema["cls"]
+    replaced = {key: value if key == "metadata" else _instrument_schema(value, owner) for key, value in schema.items()}
+    schema_type = str(replaced.get("type"))
+    if schema_type.startswith("function") and isinstance(replaced.get("function"), dict):
+        return _instrument_function(replaced, owner)
+    if schema_type == "model-fields":
+        return dict(replaced, fields=_locate_fields(replaced["fields"]))
+    if schema_type in ("list", "set", "frozenset", "tuple-variable", "dict"):
+        return _locate_elements(replaced)
+    return replaced if any(replaced[key] is not schema[key] for key in schema) else schema
+
+
+def _diagnostic_validator(model_class: Type[BaseModel]) -> SchemaValidator:
+    """
+    Returns a validator of a model class that runs instrumented copies of its
+    custom validators. The model class itself is left untouched, so
+    validating it as usual is not slowed down.
+    """
+    validator = _diagnostic_validators.get(model_class)
+    if validator is None:
+        # Builds the core schema first if it was deferred
+        model_class.model_rebuild()
+        schema = _instrument_schema(model_class.__pydantic_core_schema__)
+        validator = _diagnostic_validators[model_class] = SchemaValidator(schema)
+    return validator
+
+
+def validate_model(model_class: Type[BaseModel], data: Union[str, bytes, dict]) -> BaseModel:
+    """
+    Validates a dictionary or json string as usual or, during a diagnostic
+    validation, in diagnostic mode. Used by validators that validate nested
+    models themselves, so the failures of those models are reported too.
+    """
+    if _ACTIVE_REPORT.get() is None:
+        if isinstance(data, dict):
+            return model_class.model_validate(data)
+        return model_class.model_validate_json(data)
+    if isinstance(data, dict):
+        return _diagnostic_validator(model_class).validate_python(data)
+    return _diagnostic_validator(model_class).validate_json(data)
+
+
+def diagnose(model_class: type, data: Union[str, bytes, dict]) -> ValidationReport:
+    """
+    Validates data in a diagnostic mode. Failing custom validators do not
+    stop validation: each failure is recorded and validation continues with
+    the value unchanged, so later validators still run. Every error is
+    collected along with its JSON pointer, and the time spent in each custom
+    validator is recorded.
+    Parameters
+    ----------
+    model_class : type
+      Model class to validate against
+    data : Union[str, bytes, dict]
+      Dictionary or json to validate
+
+    Returns
+    -------
+    ValidationReport
+      Collected errors and timings. If pydantic itself found no errors,
+      report.model holds the validated model, built with every failing
+      custom validator skipped.
+
+    """
+    report = ValidationReport()
+    token = _ACTIVE_REPORT.set(report)
+    start = time.perf_counter()
+    try:
+        report.model = validate_model(model_class, data)
+    except ValidationError as e:
+        report._add_validation_error(e)
+    finally:
+        report.elapsed = time.perf_counter() - start
+        _ACTIVE_REPORT.reset(token)
+    report.issues.extend(report._custom_issues)
+    return report
@@ -1,9 +1,27 @@
 """ tests for Subject """
+import gzip
+import json
+import os
+import pickle
+import stat
+import tempfile
 import unittest
+from decimal import Decimal
 from pathlib import Path
+from typing import Literal, Optional
 from unittest.mock import MagicMock, call, mock_open, patch
 
+from pydantic import ValidationError
+
+from aind_data_schema import __version__
+from aind_data_schema.base import UNLOADED, AindCoreModel
+from aind_data_schema.core.procedures import Procedures
 from aind_data_schema.core.subject import Subject
+from aind_data_schema.models.organizations import Organization
+from aind_data_schema.models.species import Species
+from aind_data_schema.utils.integrity import read_sidecar, sidecar_path
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
 
 
 class BaseTests(unittest.TestCase):
@@ -29,6 +47,179 @@ class BaseTests(unittest.TestCase):
         mock_open.assert_has_calls([call(Path("dir/subject.foo.bar"), "w")])
         self.assertEqual(1, 1)
 
+    def test_write_standard_file_options(self):
+        """Tests writing compact, compressed and atomic files"""
+        s1 = Subject.load(EXAMPLES_DIR / "subject.json")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            compact_file = s1.write_standard_file(output_directory=tmp_dir, prefix="compact", compact=True)
+            self.assertEqual(Path(tmp_dir) / "compact_subject.json", compact_file)
+            self.assertEqual(s1.model_dump_json(), compact_file.read_text())
+
+            gzip_file = s1.write_standard_file(output_directory=Path(tmp_dir), compress=True)
+            self.assertEqual(Path(tmp_dir) / "subject.json.gz", gzip_file)
+            with gzip.open(gzip_file, "rt") as f:
+                self.assertEqual(s1.model_dump_json(indent=3), f.read())
+            self.assertEqual(s1, Subject.load(gzip_file))
+
+            for compress in [False, True]:
+                atomic_file = s1.write_standard_file(
+                    output_directory=tmp_dir, suffix=".atomic.json", compress=compress, atomic=True, stream=True
+                )
+                self.assertEqual(s1, Subject.load(atomic_file))
+            stream_file = s1.write_standard_file(output_directory=tmp_dir, prefix="stream", stream=True)
+            self.assertEqual(s1.model_dump_json(indent=3), stream_file.read_text())
+
+            # Atomic files get the permissions of the umask, or of the file they replace
+            umask = os.umask(0o022)
+            try:
+                atomic_file = s1.write_standard_file(output_directory=tmp_dir, prefix="mode", atomic=True)
+                self.assertEqual(0o644, stat.S_IMODE(atomic_file.stat().st_mode))
+                atomic_file.chmod(0o640)
+                s1.write_standard_file(output_directory=tmp_dir, prefix="mode", atomic=True)
+                self.assertEqual(0o640, stat.S_IMODE(atomic_file.stat().st_mode))
+            finally:
+                os.umask(umask)
+
+            # A failed write leaves neither a truncated file nor a temporary file
+            before = sorted(os.listdir(tmp_dir))
+            with patch("os.replace", side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    s1.write_standard_file(output_directory=tmp_dir, prefix="failed", atomic=True)
+            self.assertEqual(before, sorted(os.listdir(tmp_dir)))
+
+    def test_read_standard_file(self):
+        """Tests reading a model from its standard file"""
+        s1 = Subject.load(EXAMPLES_DIR / "subject.json")
+        self.assertEqual(s1, Subject.read_standard_file(EXAMPLES_DIR))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with self.assertRaises(FileNotFoundError):
+                Subject.read_standard_file(tmp_dir)
+            s1.write_standard_file(output_directory=tmp_dir, prefix="prefix", suffix=".suffix.json", compress=True)
+            self.assertEqual(s1, Subject.read_standard_file(tmp_dir, prefix="prefix", suffix=".suffix.json"))
+            self.assertIsNone(Subject.find_standard_file(tmp_dir))
+        # Defaults to the current directory
+        with patch.object(Subject, "find_standard_file", return_value=None) as mock_find:
+            with self.assertRaises(FileNotFoundError):
+                Subject.read_standard_file()
+            mock_find.assert_called_once_with(Path("."), None, None)
+
+    def test_load_trusted(self):
+        """Tests that files with a matching sidecar are loaded without validation"""
+        s1 = Subject.load(EXAMPLES_DIR / "subject.json")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for compress, stream in [(False, False), (True, True)]:
+                path = s1.write_standard_file(output_directory=tmp_dir, compress=compress, stream=stream, sidecar=True)
+                sidecar = json.loads(sidecar_path(path).read_text())
+                self.assertEqual(s1.schema_version, sidecar["schema_version"])
+                self.assertEqual(__version__, sidecar["library_version"])
+                self.assertTrue(sidecar["valid"])
+                with patch.object(Subject, "model_validate_json") as mock_validate:
+                    s2 = Subject.read_standard_file(tmp_dir, trusted=True)
+                    mock_validate.assert_not_called()
+                self.assertEqual(s1, s2)
+                self.assertIs(Species.MUS_MUSCULUS, s2.species)
+                self.assertTrue(s2._is_valid)
+                path.unlink()
+
+            # Edited files, other versions and invalid models are validated
+            path = s1.write_standard_file(output_directory=tmp_dir, compact=True, atomic=True, sidecar=True)
+            path.write_text(s1.model_dump_json(indent=3))
+            with patch.object(Subject, "model_validate_json", wraps=Subject.model_validate_json) as mock_validate:
+                self.assertEqual(s1, Subject.load_trusted(path))
+                mock_validate.assert_called_once()
+            s1.write_standard_file(output_directory=tmp_dir, sidecar=True)
+            with patch("aind_data_schema.utils.integrity.__version__", "0.0.0"):
+                with patch.object(Subject, "model_validate_json", wraps=Subject.model_validate_json) as mock_validate:
+                    Subject.load_trusted(path)
+                    mock_validate.assert_called_once()
+            sidecar_path(path).write_text("not json")
+            self.assertIsNone(read_sidecar(path))
+            sidecar_path(path).write_text("[]")
+            self.assertIsNone(read_sidecar(path))
+            self.assertEqual(s1, Subject.load_trusted(path))
+            s3 = Subject.model_construct(**dict(s1, subject_id=None))
+            s3.write_standard_file(output_directory=tmp_dir, sidecar=True)
+            self.assertFalse(json.loads(sidecar_path(path).read_text())["valid"])
+            with self.assertRaises(ValidationError):
+                Subject.load_trusted(path)
+
+            # Models changed since they were validated are checked when written
+            s4 = s1.model_copy(update={"sex": "bogus"})
+            s4.write_standard_file(output_directory=tmp_dir, sidecar=True)
+            self.assertFalse(json.loads(sidecar_path(path).read_text())["valid"])
+            with self.assertRaises(ValidationError):
+                Subject.load_trusted(path)
+
+    def test_load(self):
+        """Tests loading a whole model or only some fields from a file"""
+        s1 = Subject.load(EXAMPLES_DIR / "subject.json")
+        self.assertEqual(s1, Subject.model_validate_json((EXAMPLES_DIR / "subject.json").read_text()))
+
+        s2 = Subject.load(EXAMPLES_DIR / "subject.json", include={"subject_id", "species", "notes"})
+        self.assertEqual(s1.subject_id, s2.subject_id)
+        self.assertEqual(s1.species, s2.species)
+        self.assertIsNone(s2.notes)
+        self.assertIs(UNLOADED, s2.genotype)
+        self.assertIs(UNLOADED, s2.breeding_info)
+        self.assertEqual("UNLOADED", repr(s2.genotype))
+        self.assertIs(UNLOADED, pickle.loads(pickle.dumps(UNLOADED)))
+
+        p1 = Procedures.load(EXAMPLES_DIR / "procedures.json", include={"subject_id"})
+        self.assertEqual("625100", p1.subject_id)
+        self.assertIs(UNLOADED, p1.subject_procedures)
+
+    def test_diff_and_apply_patch(self):
+        """Tests that diffs between models can be applied as patches"""
+        p1 = Procedures.model_validate_json((EXAMPLES_DIR / "procedures.json").read_text())
+        p2 = p1.model_copy(deep=True)
+        p2.notes = "some notes"
+        p2.subject_procedures[0].animal_weight_prior = Decimal("22.5")
+
+        patch = p1.diff(p2)
+        self.assertEqual(
+            [
+                {"op": "replace", "path": "/subject_procedures/0/animal_weight_prior", "value": "22.5"},
+                {"op": "replace", "path": "/notes", "value": "some notes"},
+            ],
+            patch,
+        )
+        p3 = p1.apply_patch(patch)
+        self.assertEqual(p2, p3)
+        self.assertTrue(p3._is_valid)
+        self.assertIsNone(p1.notes)
+        self.assertEqual([], p1.diff(p1.model_copy(deep=True)))
+        with self.assertRaises(ValueError):
+            p1.diff(Procedures.load(EXAMPLES_DIR / "procedures.json", include={"subject_id"}))
+
+    def test_deferred_schema_build(self):
+        """Tests that core model schemas are built when first used"""
+
+        class Part(AindCoreModel):
+            """Core model held by another core model"""
+
+            describedBy: str = "part.py"
+            schema_version: Literal["1.0.0"] = "1.0.0"
+            organization: Optional[Organization.ONE_OF] = None
+
+        class Whole(AindCoreModel):
+            """Core model holding another core model"""
+
+            describedBy: str = "whole.py"
+            schema_version: Literal["1.0.0"] = "1.0.0"
+            part: Optional[Part] = None
+
+        self.assertFalse(Part.__pydantic_complete__)
+        self.assertFalse(Whole.__pydantic_complete__)
+        # Instances built without validation are serialized within other models
+        whole = Whole(part=Part.model_construct(organization=Organization.AI))
+        self.assertTrue(Whole.__pydantic_complete__)
+        self.assertTrue(Part.__pydantic_complete__)
+        self.assertEqual("Allen Institute", json.loads(whole.model_dump_json())["part"]["organization"]["name"])
+        # The nested core model's discriminated union is kept
+        self.assertIn(
+            "discriminator", Whole.model_json_schema()["$defs"]["Part"]["properties"]["organization"]["anyOf"][0]
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,76 @@
+""" Tests bundle module """
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from aind_data_schema.core.procedures import Procedures
+from aind_data_schema.core.subject import Subject
+from aind_data_schema.utils.bundle import BundleEntry, BundleReader, BundleWriter
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class BundleTests(unittest.TestCase):
+    """Tests writing and reading bundles"""
+
+    def test_round_trip(self):
+        """Tests packing documents and reading them back one at a time"""
+        subject = Subject.model_validate_json((EXAMPLES_DIR / "subject.json").read_text())
+        procedures_json = (EXAMPLES_DIR / "procedures.json").read_text()
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "assets.bundle"
+            with BundleWriter(path) as writer:
+                writer.add("asset_1/subject.json", subject)
+                writer.add_json("asset_1/procedures.json", procedures_json, Procedures)
+                writer.add_json("asset_2/procedures.json", procedures_json.encode("utf-8"), Procedures)
+                writer.add_json("empty.json", "{}", Subject)
+                with self.assertRaises(ValueError) as context:
+                    writer.add("asset_1/subject.json", subject)
+                self.assertEqual("Bundle already contains asset_1/subject.json", str(context.exception))
+            writer.close()
+
+            with BundleReader(path) as reader:
+                self.assertEqual(4, len(reader))
+                self.assertIn("asset_2/procedures.json", reader)
+                self.assertEqual(
+                    ["asset_1/subject.json", "asset_1/procedures.json", "asset_2/procedures.json", "empty.json"],
+                    list(reader),
+                )
+                entry = reader.entries["asset_1/procedures.json"]
+                self.assertIsInstance(entry, BundleEntry)
+                self.assertEqual("aind_data_schema.core.procedures.Procedures", entry.schema_class)
+                self.assertEqual(Procedures.model_fields["schema_version"].default, entry.schema_version)
+                self.assertIsNone(reader.entries["empty.json"].schema_version)
+
+                self.assertEqual(procedures_json.encode("utf-8"), reader.read_bytes("asset_2/procedures.json"))
+                self.assertEqual(subject, reader.load("asset_1/subject.json"))
+                # Only the requested document is decoded
+                with patch.object(Procedures, "model_validate_json", wraps=Procedures.model_validate_json) as mock:
+                    procedures = reader.load("asset_1/procedures.json")
+                    mock.assert_called_once()
+                self.assertIsInstance(procedures, Procedures)
+                self.assertEqual(subject.subject_id, reader.load("asset_1/subject.json", Subject).subject_id)
+
+    def test_invalid_bundles(self):
+        """Tests reading files that are not bundles"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / "not.bundle"
+            for contents in [b"{}", b"x" * 100]:
+                path.write_bytes(contents)
+                with self.assertRaises(ValueError) as context:
+                    BundleReader(path)
+                self.assertEqual(f"{path} is not a bundle", str(context.exception))
+
+            with BundleWriter(path) as writer:
+                writer.add_json("subject.json", "{}", Subject)
+                writer.entries["subject.json"] = writer.entries["subject.json"]._replace(schema_class="json.loads")
+            with BundleReader(path) as reader:
+                with self.assertRaises(ValueError) as context:
+                    reader.load("subject.json")
+                self.assertEqual("json.loads is not a core model class", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
 """Tests schema_version_check script"""
 
+import json
 import os
+import tempfile
 import unittest
+from contextlib import redirect_stdout
+from io import StringIO
 from pathlib import Path
 
 from aind_data_schema.utils.schema_version_check import compare_versions, run_job
 
+SCHEMAS_DIR = Path(__file__).parents[1] / "schemas"
 RESOURCE_DIR = Path(os.path.dirname(os.path.realpath(__file__))) / "resources"
 NEW_SCHEMA_DIR = RESOURCE_DIR / "schema_version_comparison" / "new_schemas"
 NEW_SCHEMA_DIR2 = RESOURCE_DIR / "schema_version_comparison" / "new_schemas_bad_versions"
@@ -101,6 +106,87 @@ class SchemaVersionTests(unittest.TestCase):
             )
         self.assertEqual(str(error.exception), expected_error_message)
 
+    def test_required_bump(self):
+        """Tests that versions bumped less than their changes require are reported"""
+        self.assertEqual((True, None), compare_versions("0.14.0", "0.13.4", "minor"))
+        self.assertEqual(
+            (
+                False,
+                "Version bump too small, changes require a minor bump. New Version: 0.13.5. Old Version: 0.13.4",
+            ),
+            compare_versions("0.13.5", "0.13.4", "minor"),
+        )
+        schema = json.loads((SCHEMAS_DIR / "subject_schema.json").read_text())
+        old_version = schema["properties"]["schema_version"]["const"]
+        major, minor, patch = map(int, old_version.split("."))
+        with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+            (Path(old_dir) / "subject_schema.json").write_text(json.dumps(schema))
+            (Path(new_dir) / "subject_schema.json").write_text(json.dumps(schema))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+            # Reordering keys is not a change, so the version does not need a bump
+            (Path(new_dir) / "subject_schema.json").write_text(json.dumps(schema, sort_keys=True))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+            # Only reordering keys and bumping the version is not a problem
+            schema["properties"]["schema_version"]["const"] = f"{major}.{minor}.{patch + 1}"
+            (Path(new_dir) / "subject_schema.json").write_text(json.dumps(schema, sort_keys=True))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+
+            del schema["properties"]["genotype"]
+            (Path(new_dir) / "subject_schema.json").write_text(json.dumps(schema))
+            with self.assertRaises(AssertionError) as error, redirect_stdout(StringIO()) as output:
+                run_job(new_schema_folder=new_dir, old_schema_folder=old_dir, verbose=True)
+        self.assertEqual(
+            "There were issues checking the schema versions: ['subject_schema.json - Version bump too small, "
+            f"changes require a minor bump. New Version: {major}.{minor}.{patch + 1}. Old Version: {old_version} "
+            "(breaking change at /properties/genotype: field removed)']",
+            str(error.exception),
+        )
+        self.assertEqual(
+            "subject_schema.json breaking: /properties/genotype field removed\n",
+            output.getvalue(),
+        )
+
+    def test_shared_definitions(self):
+        """Tests that changes to shared definitions require a bump of the schemas using them"""
+        definitions = {
+            "$defs": {
+                "Part": {"properties": {"sub": {"$ref": "#/$defs/Sub"}}, "type": "object"},
+                "Sub": {"properties": {"name": {"type": "string"}}, "required": ["name"], "type": "object"},
+                "Unused": {"type": "string"},
+            }
+        }
+        schema = {
+            "properties": {
+                "part": {"$ref": "definitions_schema.json#/$defs/Part"},
+                "schema_version": {"const": "0.1.0"},
+            },
+            "type": "object",
+        }
+        with tempfile.TemporaryDirectory() as old_dir, tempfile.TemporaryDirectory() as new_dir:
+            for folder in (old_dir, new_dir):
+                (Path(folder) / "model_schema.json").write_text(json.dumps(schema))
+                (Path(folder) / "definitions_schema.json").write_text(json.dumps(definitions))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+
+            # Unused definitions are not part of the schema
+            definitions["$defs"]["Unused"] = {"type": "integer"}
+            (Path(new_dir) / "definitions_schema.json").write_text(json.dumps(definitions))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+
+            # Definitions used through other definitions are
+            definitions["$defs"]["Sub"]["properties"]["name"]["type"] = "integer"
+            (Path(new_dir) / "definitions_schema.json").write_text(json.dumps(definitions))
+            with self.assertRaises(AssertionError) as error:
+                run_job(new_schema_folder=new_dir, old_schema_folder=old_dir)
+            self.assertIn("model_schema.json - Version not bumped correctly", str(error.exception))
+            schema["properties"]["schema_version"]["const"] = "0.2.0"
+            (Path(new_dir) / "model_schema.json").write_text(json.dumps(schema))
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+
+            # Either folder may be missing the definitions document
+            (Path(old_dir) / "definitions_schema.json").unlink()
+            self.assertIsNone(run_job(new_schema_folder=new_dir, old_schema_folder=old_dir))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,117 @@
+""" Tests content_hash module """
+
+import unittest
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+from unittest.mock import patch
+
+from pydantic import ConfigDict
+
+from aind_data_schema.base import AindModel
+from aind_data_schema.core.data_description import DataDescription
+from aind_data_schema.core.subject import Subject
+from aind_data_schema.models.organizations import Organization
+from aind_data_schema.models.units import SizeUnit
+from aind_data_schema.utils import content_hash as content_hash_module
+from aind_data_schema.utils.content_hash import canonical_json, content_hash, subtree_digests
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class FrozenList(AindModel):
+    """Frozen model holding an unhashable value"""
+
+    model_config = ConfigDict(frozen=True)
+
+    values: List[int]
+
+
+class Example(AindModel):
+    """Model with one field of each kind"""
+
+    model_config = ConfigDict(extra="allow")
+
+    number: Optional[Decimal] = None
+    time: Optional[datetime] = None
+    unit: SizeUnit = SizeUnit.MM
+    frozen: Optional[FrozenList] = None
+
+
+class ContentHashTests(unittest.TestCase):
+    """Tests canonical content hashing"""
+
+    def test_canonical_encoding(self):
+        """Tests that equivalent values are encoded the same"""
+        self.assertEqual('{"a":[1,"2.5",null,true],"b":"x"}', canonical_json({"b": "x", "a": (1, 2.5, None, True)}))
+        self.assertEqual(canonical_json(Decimal("0.10")), canonical_json(0.1))
+        self.assertEqual(canonical_json(Decimal("3E+2")), canonical_json(300.0))
+        self.assertEqual('["a","b"]', canonical_json({"b", "a"}))
+        self.assertEqual('"1"', canonical_json(Decimal("1.000")))
+        self.assertEqual('"0"', canonical_json(Decimal("-0.00")))
+        self.assertEqual('"millimeter"', canonical_json(SizeUnit.MM))
+        self.assertEqual('"2024-01-01T00:00:00+00:00"', canonical_json(datetime(2024, 1, 1, tzinfo=timezone.utc)))
+        self.assertEqual('"2024-01-01"', canonical_json(datetime(2024, 1, 1).date()))
+        self.assertEqual("90.0", canonical_json(timedelta(minutes=1.5)))
+        self.assertEqual('"0aff"', canonical_json(b"\n\xff"))
+        self.assertEqual('"examples"', canonical_json(Path("examples")))
+
+        e1 = Example(number=Decimal("1.0"), time=datetime(2024, 1, 1, 12, tzinfo=timezone.utc), other=[1])
+        e2 = Example(
+            number=Decimal("1.00"),
+            time=datetime(2024, 1, 1, 7, tzinfo=timezone(timedelta(hours=-5))),
+            unit="millimeter",
+            other=[1],
+        )
+        self.assertEqual(content_hash(e1), content_hash(e2))
+        self.assertNotEqual(content_hash(e1), content_hash(e1.model_copy(update={"number": Decimal("1.1")})))
+        self.assertNotEqual(content_hash(e1), content_hash(Example(**dict(e1), another=None)))
+
+    def test_content_hash(self):
+        """Tests hashing core models"""
+        d1 = DataDescription.model_validate_json((EXAMPLES_DIR / "data_description.json").read_text())
+        d2 = DataDescription.model_validate_json(d1.model_dump_json())
+        self.assertEqual(d1.content_hash(), d2.content_hash())
+        self.assertEqual(d1.content_hash(), content_hash(d1))
+        d3 = d1.model_copy(update={"subject_id": "other"})
+        self.assertNotEqual(d1.content_hash(), d3.content_hash())
+
+        s1 = Subject.model_validate_json((EXAMPLES_DIR / "subject.json").read_text())
+        self.assertEqual(64, len(s1.content_hash()))
+        self.assertNotEqual(s1.content_hash(), d1.content_hash())
+
+    def test_frozen_memoization(self):
+        """Tests that the digests of frozen models are computed once"""
+        content_hash(Organization.AI)
+        with patch.object(content_hash_module, "_model_items", wraps=content_hash_module._model_items) as mock_items:
+            content_hash([Organization.AI, Organization.AI])
+            mock_items.assert_not_called()
+        self.assertNotEqual(content_hash(Organization.AI), content_hash(Organization.JAX))
+
+        # Frozen models holding unhashable values are encoded in place
+        e1 = Example(frozen=FrozenList(values=[1, 2]))
+        self.assertIn('"frozen":{"values":[1,2]}', canonical_json(e1))
+        self.assertNotEqual(content_hash(e1), content_hash(Example(frozen=FrozenList(values=[2, 1]))))
+
+    def test_subtree_digests(self):
+        """Tests that equal subtrees have equal digests and that scalars of different types differ"""
+        model = Example(number=1, extra_field=[{1, 2}])
+        same = dict(extra_field=({2, 1},), frozen=None, number=Decimal("1.0"), time=None, unit=SizeUnit.MM)
+        ordered = OrderedDict(reversed(same.items()))
+        digests = subtree_digests(model, same, ordered)
+        self.assertEqual(digests[id(model)], digests[id(same)])
+        self.assertEqual(digests[id(model)], digests[id(ordered)])
+        for other in [dict(same, number=1), dict(same, unit="millimeter"), dict(same, extra_field=[{1, 2.0}])]:
+            digests = subtree_digests(model, other)
+            self.assertNotEqual(digests[id(model)], digests[id(other)])
+
+    def test_buffering(self):
+        """Tests that long encodings are passed to the hash in pieces"""
+        values = list(range(3 * content_hash_module._BUFFER_SIZE))
+        self.assertEqual(canonical_json(values), "[" + ",".join(str(v) for v in values) + "]")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -312,7 +312,18 @@ class ImagingTests(unittest.TestCase):
             f"    For further information visit https://errors.pydantic.dev/{PYD_VERSION}/v/missing\n"
             "daqs\n"
             "  Value error, Device name validation error: 'LAS-08308' is connected to '3' on 'Dev2',"
-            " but this device is not part of the rig. [type=value_error,"
+            " but this device is not part of the rig."
+            "\n     Device name validation error: '539251' is connected to '5' on 'Dev2',"
+            " but this device is not part of the rig."
+            "\n     Device name validation error: 'LAS-08309' is connected to '4' on 'Dev2',"
+            " but this device is not part of the rig."
+            "\n     Device name validation error: 'stage-x' is connected to '2' on 'Dev2',"
+            " but this device is not part of the rig."
+            "\n     Device name validation error: 'TL-1' is connected to '0' on 'Dev2',"
+            " but this device is not part of the rig."
+            "\n     Device name validation error: 'LAS-08307' is connected to '6' on 'Dev2',"
+            " but this device is not part of the rig."
+            " [type=value_error,"
             " input_value=[DAQDevice(device_type='D... hardware_version=None)], input_type=list]\n"
             f"    For further information visit https://errors.pydantic.dev/{PYD_VERSION}/v/value_error"
         )
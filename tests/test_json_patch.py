@@ -0,0 +1,93 @@
+"""Tests json_patch module"""
+
+import unittest
+from decimal import Decimal
+from typing import List, Optional, Set
+
+from pydantic import BaseModel, Field
+
+from aind_data_schema.utils.json_patch import apply_patch, make_patch
+
+
+class JsonPatchTests(unittest.TestCase):
+    """Tests for json_patch methods"""
+
+    def test_make_and_apply_patch(self):
+        """Tests that patches turn the old document into the new one"""
+        old = {"a": 1, "b": [1, 2, 3], "c": {"d": "e", "f/g": 1}, "h": [{"i": 1}], "j": 0}
+        new = {"a": 1.0, "b": [1, 5], "c": {"d": "e", "f/g": 2, "k~": None}, "h": [{"i": 1}, {"i": 2}]}
+        patch = make_patch(old, new)
+        self.assertEqual(
+            [
+                {"op": "replace", "path": "/a", "value": 1.0},
+                {"op": "replace", "path": "/b/1", "value": 5},
+                {"op": "remove", "path": "/b/2"},
+                {"op": "replace", "path": "/c/f~1g", "value": 2},
+                {"op": "add", "path": "/c/k~0", "value": None},
+                {"op": "add", "path": "/h/1", "value": {"i": 2}},
+                {"op": "remove", "path": "/j"},
+            ],
+            patch,
+        )
+        self.assertEqual(new, apply_patch(old, patch))
+        self.assertEqual(1, old["a"])
+        self.assertEqual([], make_patch(old, dict(old)))
+
+        # Whole document and appending operations
+        self.assertEqual([{"op": "replace", "path": "", "value": [1]}], make_patch(old, [1]))
+        self.assertEqual([1], apply_patch(old, [{"op": "replace", "path": "", "value": [1]}]))
+        document = {"b": [1]}
+        self.assertIs(document, apply_patch(document, [{"op": "add", "path": "/b/-", "value": 2}], in_place=True))
+        self.assertEqual({"b": [1, 2]}, document)
+
+    def test_nested_types(self):
+        """Tests that values of different types differ however deep they are nested"""
+        for old_value, new_value in [(1, 1.0), (1, True), ("1", 1.0), (None, "None")]:
+            old = {"a": [{"b": [old_value]}], "c": [[1, 2]] * 10}
+            new = {"a": [{"b": [new_value]}], "c": [[1, 2]] * 10}
+            self.assertEqual([{"op": "replace", "path": "/a/0/b/0", "value": new_value}], make_patch(old, new))
+            self.assertEqual([], make_patch(new, {"a": [{"b": [new_value]}], "c": [[1, 2]] * 10}))
+
+    def test_models(self):
+        """Tests that models are compared as objects of their serialized fields"""
+
+        class Part(BaseModel):
+            """Model with an aliased field"""
+
+            name: str = Field(..., alias="part_name")
+            weight: Decimal = Decimal("1")
+
+        class Assembly(BaseModel):
+            """Model holding other models"""
+
+            parts: List[Part] = []
+            tags: Set[str] = set()
+            primary: Optional[Part] = None
+
+        old = Assembly(parts=[Part(part_name="a")], tags={"x"})
+        new = Assembly(parts=[Part(part_name="b"), Part(part_name="c")], tags={"x"}, primary=Part(part_name="d"))
+        patch = make_patch(old, new)
+        self.assertEqual(
+            [
+                {"op": "replace", "path": "/parts/0/part_name", "value": "b"},
+                {"op": "add", "path": "/parts/1", "value": {"part_name": "c", "weight": "1"}},
+                {"op": "replace", "path": "/primary", "value": {"part_name": "d", "weight": "1"}},
+            ],
+            patch,
+        )
+        self.assertEqual(new, Assembly.model_validate(apply_patch(old.model_dump(mode="json", by_alias=True), patch)))
+        self.assertEqual([], make_patch(old, Assembly(parts=[Part(part_name="a", weight="1.0")], tags={"x"})))
+        self.assertEqual(
+            [{"op": "replace", "path": "/tags/0", "value": "y"}], make_patch(old, Assembly(parts=old.parts, tags={"y"}))
+        )
+
+    def test_invalid_operations(self):
+        """Tests that unsupported operations raise errors"""
+        with self.assertRaises(ValueError):
+            apply_patch({}, [{"op": "move", "from": "/a", "path": "/b"}])
+        with self.assertRaises(ValueError):
+            apply_patch({}, [{"op": "remove", "path": ""}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+"""Tests json_scanner module"""
+
+import json
+import unittest
+
+from aind_data_schema.utils.json_scanner import iter_object_members, skip_value
+
+
+class JsonScannerTests(unittest.TestCase):
+    """Tests for json_scanner methods"""
+
+    def test_skip_value(self):
+        """Tests that values are skipped without being decoded"""
+        s = '{"a": [1, {"b": "x]}\\"y"}], "c": -1.5e3, "d": "s"}'
+        self.assertEqual(len(s), skip_value(s, 0))
+        self.assertEqual(s.index(', "c"'), skip_value(s, s.index("[")))
+        self.assertEqual(s.index(', "d"'), skip_value(s, s.index("-1.5")))
+        self.assertEqual(len(s) - 1, skip_value(s, s.index('"s"')))
+
+        with self.assertRaises(json.JSONDecodeError):
+            skip_value(s, len(s))
+        with self.assertRaises(json.JSONDecodeError):
+            skip_value("[1, 2", 0)
+        with self.assertRaises(json.JSONDecodeError):
+            skip_value("[1, ,]", 4)
+
+    def test_iter_object_members(self):
+        """Tests that top level members are yielded with their raw json"""
+        s = b'\n{ "a" : {"b": [1, 2]},\n"c":null , "d": "e"}'
+        self.assertEqual([("a", '{"b": [1, 2]}'), ("c", "null"), ("d", '"e"')], list(iter_object_members(s)))
+        self.assertEqual([], list(iter_object_members(" {} ")))
+        self.assertEqual([("c", "null")], list(iter_object_members(s, keys={"c"})))
+
+        # Scanning stops once every requested key is found
+        self.assertEqual([("a", "1")], list(iter_object_members('{"a": 1, "b": [', keys={"a"})))
+
+        for malformed in ["[1, 2]", "{a: 1}", '{"a" 1}', '{"a": 1 "b": 2}']:
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_object_members(malformed))
+
+
+if __name__ == "__main__":
+    unittest.main()
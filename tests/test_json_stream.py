@@ -0,0 +1,51 @@
+""" test json_stream """
+
+import io
+import json
+import unittest
+from pathlib import Path
+
+from aind_data_schema.base import AindGeneric
+from aind_data_schema.core.acquisition import Acquisition
+from aind_data_schema.core.metadata import Metadata
+from aind_data_schema.core.procedures import Procedures
+from aind_data_schema.core.session import Session
+from aind_data_schema.utils.json_stream import write_model_json
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class JsonStreamTests(unittest.TestCase):
+    """Tests writing json incrementally"""
+
+    def assert_same_json(self, model, indent=None):
+        """Asserts that the streamed json is identical to model_dump_json"""
+        f = io.StringIO()
+        write_model_json(model, f, indent=indent)
+        self.assertEqual(model.model_dump_json(indent=indent), f.getvalue())
+
+    def test_examples(self):
+        """Tests that the json of examples is identical"""
+        for filename, model_class in [
+            ("exaspim_acquisition.json", Acquisition),
+            ("ophys_session.json", Session),
+            ("aibs_smartspim_procedures.json", Procedures),
+        ]:
+            model = model_class.model_validate_json((EXAMPLES_DIR / filename).read_text())
+            for indent in [None, 2, 3]:
+                with self.subTest(filename=filename, indent=indent):
+                    self.assert_same_json(model, indent=indent)
+
+    def test_aliases_and_extra_fields(self):
+        """Tests models with aliased fields, extra fields, and no fields"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        metadata = Metadata(name="name", location="bucket", subject=subject, external_links=[{"Code Ocean": "link"}])
+        generic = AindGeneric(values=[1, 2], nested={"values": [[]]})
+        for model in [metadata, generic, AindGeneric()]:
+            for indent in [None, 3]:
+                with self.subTest(model=model, indent=indent):
+                    self.assert_same_json(model, indent=indent)
+
+
+if __name__ == "__main__":
+    unittest.main()
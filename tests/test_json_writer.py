@@ -2,11 +2,29 @@
 
 import json
 import os
+import subprocess
+import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import MagicMock, call, mock_open, patch
 
-from aind_data_schema.utils.json_writer import SchemaWriter
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+from aind_data_schema import __version__, core
+from aind_data_schema.core.subject import Subject
+from aind_data_schema.utils.json_writer import (
+    DEFINITIONS_FILENAME,
+    MANIFEST_FILENAME,
+    SchemaWriter,
+    _generate_schema,
+    share_definitions,
+    source_modules,
+)
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
 
 
 class SchemaWriterTests(unittest.TestCase):
@@ -27,6 +45,24 @@ class SchemaWriterTests(unittest.TestCase):
             self.assertIsNotNone(filename)
             self.assertIsNotNone(schema_contents)
 
+    def test_lazy_core_imports(self):
+        """Tests that core modules are only imported when needed"""
+        script = (
+            "import sys\n"
+            "import aind_data_schema.utils.json_writer\n"
+            "from aind_data_schema import core\n"
+            "print(sorted(m for m in sys.modules if m.startswith('aind_data_schema.core.')))\n"
+            "core.Subject\n"
+            "print(sorted(m for m in sys.modules if m.startswith('aind_data_schema.core.')))\n"
+        )
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, check=True, text=True).stdout
+        self.assertEqual(["[]", "['aind_data_schema.core.subject']"], output.splitlines())
+
+        self.assertIs(Subject, core.Subject)
+        self.assertIn("Subject", dir(core))
+        with self.assertRaises(AttributeError):
+            core.NotAModel
+
     def test_parse_args(self):
         """Tests arguments are parsed correctly."""
         sw = SchemaWriter(self.TEST_ARGS)
@@ -38,6 +74,7 @@ class SchemaWriterTests(unittest.TestCase):
         self.assertEqual(expected_output, sw.configs.output)
         self.assertEqual(self.TEST_ARGS, sw.args)
         self.assertEqual(os.getcwd(), sw2.configs.output)
+        self.assertEqual(1, sw2.configs.jobs)
 
     @patch("builtins.open", new_callable=mock_open())
     @patch("os.path.exists")
@@ -107,6 +144,136 @@ class SchemaWriterTests(unittest.TestCase):
         mock_file.assert_has_calls(open_calls, any_order=True)
         file_handle.write.assert_has_calls(write_calls, any_order=True)
 
+    def test_incremental_writes(self):
+        """Tests that only missing, edited or out of date schema files are written"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir)
+            written = SchemaWriter(["--output", tmp_dir, "--jobs", "2"]).write_to_json()
+            schema_files = sorted(output.glob("*_schema.json"))
+            self.assertEqual(schema_files, sorted(written))
+            self.assertEqual(
+                json.dumps(Subject.model_json_schema(), indent=3), (output / "subject_schema.json").read_text()
+            )
+            self.assertEqual(
+                (output / "subject_schema.json").read_text(), _generate_schema("aind_data_schema.core.subject:Subject")
+            )
+            manifest = json.loads((output / MANIFEST_FILENAME).read_text())
+            self.assertEqual({f.name for f in schema_files}, set(manifest))
+
+            # Nothing changed
+            self.assertEqual([], SchemaWriter(["--output", tmp_dir]).write_to_json())
+            self.assertEqual([], SchemaWriter(["--output", tmp_dir, "--check"]).write_to_json())
+
+            # Edited or removed files are reported with --check and regenerated otherwise
+            (output / "subject_schema.json").write_text("{}")
+            (output / "rig_schema.json").unlink()
+            expected = [output / "rig_schema.json", output / "subject_schema.json"]
+            self.assertEqual(expected, sorted(SchemaWriter(["--output", tmp_dir, "--check"]).write_to_json()))
+            self.assertEqual("{}", (output / "subject_schema.json").read_text())
+            self.assertEqual(expected, sorted(SchemaWriter(["--output", tmp_dir]).write_to_json()))
+
+            # A changed source hash regenerates the schema, which is not rewritten when it is the same
+            manifest = json.loads((output / MANIFEST_FILENAME).read_text())
+            manifest["subject_schema.json"]["source"] = "0"
+            (output / MANIFEST_FILENAME).write_text(json.dumps(manifest))
+            with patch("aind_data_schema.utils.json_writer.json.dumps", wraps=json.dumps) as mock_dumps:
+                self.assertEqual([], SchemaWriter(["--output", tmp_dir]).write_to_json())
+                self.assertEqual(2, mock_dumps.call_count)
+            self.assertNotEqual(
+                "0", json.loads((output / MANIFEST_FILENAME).read_text())["subject_schema.json"]["source"]
+            )
+            self.assertEqual([], SchemaWriter(["--output", tmp_dir, "--force", "--check"]).write_to_json())
+
+    def test_share_definitions(self):
+        """Tests that equal definitions are shared and different ones with the same name are kept apart"""
+        kind = {"enum": ["a", "b"], "title": "Kind"}
+        first = {
+            "$defs": {"Kind": kind, "Part": {"properties": {"kind": {"$ref": "#/$defs/Kind"}}}},
+            "properties": {"part": {"$ref": "#/$defs/Part"}},
+        }
+        second = {
+            "$defs": {
+                "Kind": {"enum": ["c"], "title": "Kind"},
+                "module__Kind": kind,
+                "Part": {"properties": {"kind": {"$ref": "#/$defs/module__Kind"}}},
+                "Other": {"properties": {"kind": {"$ref": "#/$defs/Kind"}}},
+            },
+            "properties": {
+                "part": {
+                    "discriminator": {"mapping": {"a": "#/$defs/Part"}, "propertyName": "kind"},
+                    "oneOf": [{"$ref": "#/$defs/Part"}],
+                },
+                "other": {"$ref": "#/$defs/Other"},
+            },
+        }
+        definitions, thin_schemas = share_definitions([first, second], ["defs.json", "../defs.json"])
+        other_kind = [name for name in definitions if name.startswith("Kind_")][0]
+        self.assertEqual(["Kind", other_kind, "Other", "Part"], list(definitions))
+        self.assertEqual(kind, definitions["Kind"])
+        self.assertEqual({"properties": {"kind": {"$ref": "#/$defs/Kind"}}}, definitions["Part"])
+        self.assertEqual({"properties": {"kind": {"$ref": f"#/$defs/{other_kind}"}}}, definitions["Other"])
+        self.assertEqual({"properties": {"part": {"$ref": "defs.json#/$defs/Part"}}}, thin_schemas[0])
+        self.assertEqual(
+            {"mapping": {"a": "../defs.json#/$defs/Part"}, "propertyName": "kind"},
+            thin_schemas[1]["properties"]["part"]["discriminator"],
+        )
+        self.assertEqual({"$ref": "../defs.json#/$defs/Other"}, thin_schemas[1]["properties"]["other"])
+        self.assertIn("$defs", second)
+        writer = SchemaWriter(["--output", "some_test_dir", "--shared-defs"])
+        self.assertEqual(Path("some_test_dir") / DEFINITIONS_FILENAME, writer._definitions_file())
+
+    def test_write_shared_definitions(self):
+        """Tests writing thin schemas that refer to one shared, versioned definitions document"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            output = Path(tmp_dir)
+            args = ["--output", tmp_dir, "--shared-defs", "--attach-version", "--jobs", "1"]
+            written = SchemaWriter(args).write_to_json()
+            definitions_file = output / "definitions" / __version__ / DEFINITIONS_FILENAME
+            self.assertIn(definitions_file, written)
+            document = json.loads(definitions_file.read_text())
+            self.assertEqual(__version__, document["version"])
+
+            subject_file = output / "subject" / Subject.model_construct().schema_version / "subject_schema.json"
+            subject_schema = json.loads(subject_file.read_text())
+            self.assertNotIn("$defs", subject_schema)
+            self.assertIn(f"../../definitions/{__version__}/{DEFINITIONS_FILENAME}#/$defs/", subject_file.read_text())
+            registry = Registry().with_resource(
+                f"../../definitions/{__version__}/{DEFINITIONS_FILENAME}",
+                Resource.from_contents(document, default_specification=DRAFT202012),
+            )
+            example = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+            self.assertTrue(Draft202012Validator(subject_schema, registry=registry).is_valid(example))
+            example["species"]["name"] = "Not a species"
+            self.assertFalse(Draft202012Validator(subject_schema, registry=registry).is_valid(example))
+
+            # Nothing changed, then an edited definitions document regenerates every schema
+            self.assertEqual([], SchemaWriter(args).write_to_json())
+            definitions_file.write_text("{}")
+            self.assertEqual([definitions_file], SchemaWriter(args).write_to_json())
+            self.assertEqual(document, json.loads(definitions_file.read_text()))
+
+            # Leaving shared mode regenerates every schema and removes the definitions document
+            plain_args = ["--output", tmp_dir, "--attach-version"]
+            written = SchemaWriter(plain_args + ["--check"]).write_to_json()
+            self.assertIn(subject_file, written)
+            self.assertIn(definitions_file, written)
+            self.assertTrue(definitions_file.exists())
+            written = SchemaWriter(plain_args).write_to_json()
+            self.assertIn(subject_file, written)
+            self.assertIn(definitions_file, written)
+            self.assertFalse(definitions_file.exists())
+            self.assertIn("$defs", json.loads(subject_file.read_text()))
+            self.assertEqual([], SchemaWriter(plain_args + ["--check"]).write_to_json())
+
+    def test_source_modules(self):
+        """Tests the modules a schema is generated from"""
+        modules = source_modules(Subject)
+        self.assertIn("aind_data_schema.core.subject", modules)
+        self.assertIn("aind_data_schema.base", modules)
+        self.assertIn("aind_data_schema.models.species", modules)
+        self.assertNotIn("aind_data_schema.models.devices", modules)
+        self.assertNotIn("pydantic.main", modules)
+
 
 if __name__ == "__main__":
     unittest.main()
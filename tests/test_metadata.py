@@ -2,16 +2,25 @@
 
 import json
 import re
+import tempfile
 import unittest
 from datetime import time
+from pathlib import Path
+from unittest.mock import patch
 
 from pydantic import ValidationError
 from pydantic import __version__ as pyd_version
 
+from aind_data_schema.base import UNLOADED
 from aind_data_schema.core.acquisition import Acquisition
 from aind_data_schema.core.data_description import DataDescription
 from aind_data_schema.core.instrument import Instrument
-from aind_data_schema.core.metadata import Metadata, MetadataStatus
+from aind_data_schema.core.metadata import (
+    PLATFORM_REQUIREMENTS,
+    Metadata,
+    MetadataStatus,
+    check_injection_materials,
+)
 from aind_data_schema.core.procedures import (
     IontophoresisInjection,
     NanojectInjection,
@@ -24,8 +33,9 @@ from aind_data_schema.core.rig import Rig
 from aind_data_schema.core.session import Session
 from aind_data_schema.core.subject import BreedingInfo, Sex, Species, Subject
 from aind_data_schema.models.organizations import Organization
-from aind_data_schema.models.platforms import Ecephys, SmartSpim
+from aind_data_schema.models.platforms import Ecephys, Platform, SmartSpim
 
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
 PYD_VERSION = re.match(r"(\d+.\d+).\d+", pyd_version).group(1)
 
 
@@ -122,6 +132,453 @@ class TestMetadata(unittest.TestCase):
         )
         self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
 
+    def test_platform_requirements(self):
+        """Tests that platform requirements are looked up from platform
+        classes, instances and dictionaries"""
+        nano_inj = NanojectInjection.model_construct()
+        surgery = Surgery.model_construct(procedures=[nano_inj])
+        for platform in [Platform.ECEPHYS, {"name": Platform.ECEPHYS.name}]:
+            with self.assertRaises(ValueError) as context:
+                Metadata(
+                    name="ecephys_655019_2023-04-03_18-17-09",
+                    location="bucket",
+                    data_description=DataDescription.model_construct(
+                        label="some label", platform=platform, creation_time=time(12, 12, 12)
+                    ),
+                    procedures=Procedures.model_construct(subject_procedures=[surgery]),
+                )
+            self.assertIn("Missing some metadata for Ecephys.", str(context.exception))
+
+        # Platforms without requirements are not checked
+        d1 = Metadata(
+            name="ecephys_655019_2023-04-03_18-17-09",
+            location="bucket",
+            data_description=DataDescription.model_construct(
+                label="some label", platform=Platform.BEHAVIOR, creation_time=time(12, 12, 12)
+            ),
+            procedures=Procedures.model_construct(subject_procedures=[surgery]),
+        )
+        self.assertEqual(MetadataStatus.MISSING, d1.metadata_status)
+        self.assertIn(Ecephys, PLATFORM_REQUIREMENTS)
+
+        # All requirements met
+        ionto_inj = IontophoresisInjection.model_construct(injection_materials=[ViralMaterial.model_construct()])
+        d2 = Metadata(
+            name="ecephys_655019_2023-04-03_18-17-09",
+            location="bucket",
+            data_description=DataDescription.model_construct(
+                label="some label", platform=Platform.SMARTSPIM, creation_time=time(12, 12, 12)
+            ),
+            subject=Subject.model_construct(),
+            procedures=Procedures.model_construct(subject_procedures=[Surgery.model_construct(procedures=[ionto_inj])]),
+            acquisition=Acquisition.model_construct(),
+            instrument=Instrument.model_construct(),
+        )
+        self.assertEqual(MetadataStatus.INVALID, d2.metadata_status)
+        self.assertEqual("Injection is missing injection_materials.", check_injection_materials([nano_inj]))
+        self.assertIsNone(check_injection_materials([]))
+
+    def test_update(self):
+        """Tests that updating a record only validates the new values"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        processing = json.loads((EXAMPLES_DIR / "processing.json").read_text())
+        d1 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=subject)
+        self.assertEqual(MetadataStatus.VALID, d1.metadata_status)
+        last_modified = d1.last_modified
+
+        p1 = Procedures.model_construct(injection_materials=["some materials"])
+        with patch.object(Subject, "model_validate") as mock_validate:
+            d1.update(procedures=p1, processing=processing)
+            mock_validate.assert_not_called()
+        self.assertIs(p1, d1.procedures)
+        self.assertIsInstance(d1.processing, Processing)
+        self.assertEqual(MetadataStatus.INVALID, d1._core_field_status["procedures"])
+        self.assertEqual(MetadataStatus.VALID, d1._core_field_status["processing"])
+        self.assertEqual(MetadataStatus.INVALID, d1.metadata_status)
+        self.assertGreater(d1.last_modified, last_modified)
+
+        d1.update(procedures=None, name="new_name", last_modified=last_modified)
+        self.assertEqual(MetadataStatus.VALID, d1.metadata_status)
+        self.assertEqual("new_name", d1.name)
+        self.assertEqual(last_modified, d1.last_modified)
+
+        # Updating a copy does not change the status of the original
+        d3 = d1.model_copy()
+        d3.update(subject={"subject_id": "123"})
+        self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
+        d1.update(name="other_name")
+        self.assertEqual(MetadataStatus.VALID, d1.metadata_status)
+        self.assertEqual(MetadataStatus.VALID, d1._core_field_status["subject"])
+
+        with self.assertRaises(ValueError) as context:
+            d1.update(not_a_field=1)
+        self.assertEqual("Metadata has no field not_a_field", str(context.exception))
+        with self.assertRaises(ValidationError):
+            d1.update(location=None)
+
+        # Lazily loaded core models are not parsed
+        d2 = Metadata.model_validate_json_lazy(d1.model_dump_json(by_alias=True))
+        d2.update(subject=None)
+        self.assertEqual(MetadataStatus.MISSING, d2.metadata_status)
+        self.assertEqual({"processing"}, set(d2._raw_core_fields))
+
+    def test_update_platform_requirements(self):
+        """Tests that only the platform requirements involving the updated fields are checked"""
+        ionto_inj = IontophoresisInjection.model_construct(injection_materials=[ViralMaterial.model_construct()])
+        d1 = Metadata(
+            name="ecephys_655019_2023-04-03_18-17-09",
+            location="bucket",
+            data_description=DataDescription.model_construct(
+                label="some label", platform=Platform.SMARTSPIM, creation_time=time(12, 12, 12)
+            ),
+            subject=Subject.model_construct(),
+            procedures=Procedures.model_construct(subject_procedures=[Surgery.model_construct(procedures=[ionto_inj])]),
+            acquisition=Acquisition.model_construct(),
+            instrument=Instrument.model_construct(),
+        )
+        with patch("aind_data_schema.core.metadata._get_surgery_procedures") as mock_get_procedures:
+            d1.update(rig=None, name="new_name")
+            mock_get_procedures.assert_not_called()
+
+        with self.assertRaises(ValueError) as context:
+            d1.update(instrument=None, name="other_name")
+        self.assertIn("Missing some metadata for SmartSpim.", str(context.exception))
+        self.assertIsNotNone(d1.instrument)
+        self.assertEqual("new_name", d1.name)
+
+        nano_inj = NanojectInjection.model_construct()
+        with self.assertRaises(ValueError) as context:
+            d1.update(
+                procedures=Procedures.model_construct(
+                    subject_procedures=[Surgery.model_construct(procedures=[nano_inj])]
+                )
+            )
+        self.assertEqual("Injection is missing injection_materials.", str(context.exception))
+
+    def test_load_trusted(self):
+        """Tests loading a record with a matching sidecar without validating it"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        d1 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=subject)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = d1.write_standard_file(output_directory=tmp_dir, sidecar=True)
+            with patch.object(Subject, "model_validate") as mock_validate:
+                d2 = Metadata.load_trusted(path)
+                mock_validate.assert_not_called()
+        self.assertEqual(d1.subject.model_dump(), d2.subject.model_dump())
+        self.assertEqual(MetadataStatus.VALID, d2.metadata_status)
+        self.assertEqual(MetadataStatus.UNKNOWN, d2._core_field_status["subject"])
+        self.assertEqual(MetadataStatus.MISSING, d2._core_field_status["procedures"])
+
+    def test_read_asset_directory(self):
+        """Tests building a record from the standard files of an asset directory"""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            asset_dir = Path(tmp_dir) / "ecephys_655019_2023-04-03_18-17-09"
+            asset_dir.mkdir()
+            for filename in ["subject.json", "procedures.json", "data_description.json", "processing.json"]:
+                (asset_dir / filename).write_text((EXAMPLES_DIR / filename).read_text())
+            Session.model_validate_json((EXAMPLES_DIR / "ephys_session.json").read_text()).write_standard_file(
+                output_directory=asset_dir, compress=True
+            )
+            (asset_dir / "rig.json").write_text((EXAMPLES_DIR / "ephys_rig.json").read_text())
+
+            d1 = Metadata.read_asset_directory(asset_dir)
+            self.assertEqual(asset_dir.name, d1.name)
+            self.assertEqual(str(asset_dir), d1.location)
+            self.assertEqual(Subject.read_standard_file(asset_dir), d1.subject)
+            self.assertIsInstance(d1.session, Session)
+            self.assertEqual(MetadataStatus.INVALID, d1._core_field_status["rig"])
+            self.assertEqual(MetadataStatus.MISSING, d1._core_field_status["instrument"])
+            self.assertEqual(MetadataStatus.INVALID, d1.metadata_status)
+
+            d2 = Metadata.read_asset_directory(asset_dir, name="name", location="bucket", validation_workers=2)
+            self.assertEqual(("name", "bucket"), (d2.name, d2.location))
+            self.assertEqual(d1._core_field_status, d2._core_field_status)
+            self.assertEqual(d1.procedures, d2.procedures)
+
+            d3 = Metadata.read_asset_directory(tmp_dir)
+            self.assertEqual(MetadataStatus.MISSING, d3.metadata_status)
+
+            # Truncated files and json that is not an object are left out and marked invalid
+            other_dir = Path(tmp_dir) / "other_asset"
+            other_dir.mkdir()
+            (other_dir / "subject.json").write_text((EXAMPLES_DIR / "subject.json").read_text())
+            (other_dir / "procedures.json").write_text((EXAMPLES_DIR / "procedures.json").read_text()[:100])
+            (other_dir / "processing.json").write_text("[]")
+            d4 = Metadata.read_asset_directory(other_dir)
+            self.assertIsNone(d4.procedures)
+            self.assertIsNone(d4.processing)
+            self.assertEqual(MetadataStatus.VALID, d4._core_field_status["subject"])
+            self.assertEqual(MetadataStatus.INVALID, d4._core_field_status["procedures"])
+            self.assertEqual(MetadataStatus.INVALID, d4._core_field_status["processing"])
+            self.assertEqual(MetadataStatus.INVALID, d4.metadata_status)
+
+    def test_core_field_classes(self):
+        """Tests the precomputed map of core model fields"""
+        self.assertEqual(
+            {
+                "subject": Subject,
+                "data_description": DataDescription,
+                "procedures": Procedures,
+                "session": Session,
+                "rig": Rig,
+                "processing": Processing,
+                "acquisition": Acquisition,
+                "instrument": Instrument,
+            },
+            dict(Metadata.core_field_classes),
+        )
+        self.assertEqual({}, dict(Subject.core_field_classes))
+        with self.assertRaises(TypeError):
+            Metadata.core_field_classes["name"] = str
+
+    def test_core_field_status(self):
+        """Tests that the status of each core model is recorded in the
+        per-field status map"""
+        s1 = Subject(
+            species=Species.MUS_MUSCULUS,
+            subject_id="123345",
+            sex=Sex.MALE,
+            date_of_birth="2020-10-10",
+            source=Organization.AI,
+            breeding_info=BreedingInfo(
+                breeding_group="Emx1-IRES-Cre(ND)",
+                maternal_id="546543",
+                maternal_genotype="Emx1-IRES-Cre/wt; Camk2a-tTa/Camk2a-tTA",
+                paternal_id="232323",
+                paternal_genotype="Ai93(TITL-GCaMP6f)/wt",
+            ),
+            genotype="Emx1-IRES-Cre;Camk2a-tTA;Ai93(TITL-GCaMP6f)/wt",
+        )
+        p1 = Procedures.model_construct(injection_materials=["some materials"])
+        d1 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=s1, procedures=p1)
+        self.assertEqual(MetadataStatus.INVALID, d1.metadata_status)
+        self.assertEqual(MetadataStatus.VALID, d1._core_field_status["subject"])
+        self.assertEqual(MetadataStatus.INVALID, d1._core_field_status["procedures"])
+        self.assertEqual(MetadataStatus.MISSING, d1._core_field_status["rig"])
+        self.assertFalse(p1._is_valid)
+
+        # A valid model built without validation is validated once
+        s2 = Subject.model_construct(**dict(s1))
+        self.assertEqual(s1, s2)
+        self.assertNotEqual(s1, dict(s1))
+        d2 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=s2)
+        self.assertEqual(MetadataStatus.VALID, d2.metadata_status)
+        self.assertTrue(s2._is_valid)
+
+        # Models that were valid when built are not validated again unless
+        # they may have been changed since
+        with patch.object(Subject, "model_validate") as mock_validate:
+            d3 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=s1)
+            mock_validate.assert_not_called()
+        self.assertEqual(MetadataStatus.VALID, d3.metadata_status)
+        s1.sex = "notasex"
+        self.assertIsNone(s1._is_valid)
+        d3.update(subject=s1)
+        self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
+        s1.sex = Sex.MALE
+        s3 = s1.model_copy(update={"sex": "notasex"})
+        d3 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", subject=s3)
+        self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
+        s1.breeding_info.maternal_id = None
+        d3.update(subject=s1)
+        self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
+        self.assertFalse(s1._is_valid)
+        s1.breeding_info.maternal_id = "546543"
+
+        # A valid dictionary is validated once, when it is parsed into the core model
+        with patch.object(Subject, "model_validate", wraps=Subject.model_validate) as mock_validate:
+            d4 = Metadata(
+                name="ecephys_655019_2023-04-03_18-17-09",
+                location="bucket",
+                subject=json.loads(s1.model_dump_json()),
+            )
+            mock_validate.assert_called_once()
+        self.assertEqual(MetadataStatus.VALID, d4.metadata_status)
+        self.assertEqual(s1, d4.subject)
+
+        # Models holding sets of models, e.g. the modalities of a rig, are validated again too
+        r1 = Rig.model_validate_json((EXAMPLES_DIR / "fip_ophys_rig.json").read_text())
+        r1.notes = "notes"
+        d5 = Metadata(name="ecephys_655019_2023-04-03_18-17-09", location="bucket", rig=r1)
+        self.assertEqual(MetadataStatus.VALID, d5._core_field_status["rig"])
+
+    def test_validate_many(self):
+        """Tests that many records can be validated in bulk"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        records = [
+            {"name": "ecephys_655019_2023-04-03_18-17-09", "location": "bucket", "subject": subject},
+            {"name": "ecephys_655019_2023-04-03_18-17-09"},
+            json.dumps({"name": "ecephys_655019_2023-04-03_18-17-09", "location": "bucket", "subject": {}}),
+            "not json",
+        ]
+        expected_statuses = [
+            MetadataStatus.VALID,
+            MetadataStatus.INVALID,
+            MetadataStatus.INVALID,
+            MetadataStatus.INVALID,
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            jsonl_file = Path(tmp_dir) / "records.jsonl"
+            jsonl_file.write_text("\n".join(r if isinstance(r, str) else json.dumps(r) for r in records) + "\n\n")
+            for workers, ordered in [(None, True), (2, True), (2, False)]:
+                results = list(Metadata.validate_many(jsonl_file, workers=workers, ordered=ordered, max_pending=2))
+                results.sort(key=lambda r: r.index)
+                self.assertEqual(expected_statuses, [r.metadata_status for r in results])
+            self.assertEqual(subject["subject_id"], results[0].metadata.subject.subject_id)
+            self.assertEqual(["location: Field required"], results[1].errors)
+            self.assertEqual([], results[2].errors)
+            self.assertEqual(MetadataStatus.INVALID, results[2].metadata._core_field_status["subject"])
+            self.assertIsNone(results[3].metadata)
+
+            # Directory trees are searched for metadata.nd.json files
+            asset_dir = Path(tmp_dir) / "asset"
+            asset_dir.mkdir()
+            (asset_dir / Metadata.default_filename()).write_text(json.dumps(records[0]))
+            results = list(Metadata.validate_many(tmp_dir))
+            self.assertEqual(1, len(results))
+            self.assertEqual(str(asset_dir / "metadata.nd.json"), results[0].source)
+            self.assertEqual(MetadataStatus.VALID, results[0].metadata_status)
+
+            # Single files and iterables of records
+            results = list(Metadata.validate_many(asset_dir / "metadata.nd.json"))
+            self.assertEqual(MetadataStatus.VALID, results[0].metadata_status)
+            results = list(Metadata.validate_many([records[0], Path(tmp_dir) / "missing.nd.json"]))
+            self.assertEqual(MetadataStatus.VALID, results[0].metadata_status)
+            results = results[1:]
+            self.assertEqual(MetadataStatus.MISSING, results[0].metadata_status)
+            self.assertEqual(1, len(results[0].errors))
+
+    def test_model_validate_json_lazy(self):
+        """Tests that core models are only parsed when first accessed"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        procedures = json.loads((EXAMPLES_DIR / "procedures.json").read_text())
+        json_data = json.dumps(
+            {
+                "name": "ecephys_655019_2023-04-03_18-17-09",
+                "location": "bucket",
+                "metadata_status": "Valid",
+                "subject": subject,
+                "procedures": procedures,
+                "rig": None,
+                "session": {"session_start_time": "not a time"},
+            }
+        )
+        d1 = Metadata.model_validate_json_lazy(json_data)
+        self.assertEqual(MetadataStatus.VALID, d1.metadata_status)
+        self.assertEqual(MetadataStatus.UNKNOWN, d1._core_field_status["procedures"])
+        self.assertEqual(MetadataStatus.MISSING, d1._core_field_status["rig"])
+        self.assertNotIn("procedures", d1.__dict__)
+
+        # Untouched core models are passed through as raw json
+        with patch.object(Procedures, "model_validate_json") as mock_validate:
+            dumped = json.loads(d1.model_dump_json())
+            indented = json.loads(d1.model_dump_json(indent=3))
+            mock_validate.assert_not_called()
+        self.assertEqual(procedures, dumped["procedures"])
+        self.assertEqual(dumped, indented)
+
+        # Copies load their own core models
+        self.assertEqual(subject["subject_id"], d1.model_copy().subject.subject_id)
+        self.assertEqual(subject["subject_id"], d1.subject.subject_id)
+        self.assertEqual(MetadataStatus.VALID, d1._core_field_status["subject"])
+        self.assertIsNone(d1.rig)
+        self.assertEqual(MetadataStatus.VALID, d1.metadata_status)
+        self.assertEqual("not a time", d1.session.session_start_time)
+        self.assertEqual(MetadataStatus.INVALID, d1._core_field_status["session"])
+        self.assertEqual(MetadataStatus.INVALID, d1.metadata_status)
+        with self.assertRaises(AttributeError):
+            d1.not_a_field
+
+        # Dumping with include or exclude, or to a dictionary, materializes the rest
+        self.assertEqual({"procedures": procedures}, json.loads(d1.model_dump_json(include={"procedures"})))
+        self.assertEqual({}, d1._raw_core_fields)
+        d2 = Metadata.model_validate_json_lazy(json_data.replace('"Valid"', '"Invalid"'))
+        self.assertEqual(procedures["subject_id"], d2.model_dump()["procedures"]["subject_id"])
+        self.assertIsInstance(d2.procedures, Procedures)
+        # Once every field is loaded, the status is computed from them
+        self.assertEqual(MetadataStatus.INVALID, d2.metadata_status)
+        d3 = Metadata.model_validate_json_lazy(
+            json.dumps(
+                {"name": "ecephys_655019", "location": "bucket", "metadata_status": "Invalid", "subject": subject}
+            )
+        )
+        self.assertEqual(MetadataStatus.INVALID, d3.metadata_status)
+        self.assertEqual(subject["subject_id"], d3.subject.subject_id)
+        self.assertEqual(MetadataStatus.VALID, d3.metadata_status)
+
+        # Platform requirements are checked when the first core model is loaded
+        data_description = json.loads((EXAMPLES_DIR / "data_description.json").read_text())
+        d4 = Metadata.model_validate_json_lazy(
+            json.dumps(
+                {
+                    "name": "ecephys_655019",
+                    "location": "bucket",
+                    "subject": subject,
+                    "data_description": data_description,
+                }
+            )
+        )
+        self.assertIn("data_description", d4._raw_core_fields)
+        with self.assertRaises(ValueError) as context:
+            d4.subject
+        self.assertIn("Missing some metadata for Ecephys.", str(context.exception))
+        self.assertEqual(subject["subject_id"], d4.subject.subject_id)
+        d5 = Metadata.model_validate_json_lazy(
+            json.dumps({"name": "ecephys_655019", "location": "bucket", "data_description": data_description})
+        )
+        with self.assertRaises(ValueError):
+            d5.data_description
+
+    def test_load(self):
+        """Tests that only the selected fields of a metadata file are loaded"""
+        subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        data_description = json.loads((EXAMPLES_DIR / "data_description.json").read_text())
+        record = {
+            "_id": "a1e6a2a2-a3d5-4a5e-8fbd-5a1a3a0c9b3c",
+            "name": data_description["name"],
+            "location": "bucket",
+            "subject": {"subject_id": subject["subject_id"]},
+            "data_description": data_description,
+            "procedures": None,
+            "rig": json.loads((EXAMPLES_DIR / "ephys_rig.json").read_text()),
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metadata_file = Path(tmp_dir) / "metadata.nd.json"
+            metadata_file.write_text(json.dumps(record))
+            with patch.object(Rig, "model_validate_json") as mock_validate:
+                d1 = Metadata.load(metadata_file, include={"id", "name", "subject", "data_description", "procedures"})
+                mock_validate.assert_not_called()
+
+        self.assertEqual(record["_id"], str(d1.id))
+        self.assertEqual(record["name"], d1.name)
+        self.assertEqual(subject["subject_id"], d1.subject.subject_id)
+        self.assertFalse(d1.subject._is_valid)
+        self.assertEqual(Platform.ECEPHYS, d1.data_description.platform)
+        self.assertIsNone(d1.procedures)
+        self.assertIs(UNLOADED, d1.rig)
+        self.assertIs(UNLOADED, d1.location)
+
+        # Fields can be given by name or alias, whichever the file uses
+        d2 = Metadata(name=record["name"], location="bucket")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            metadata_file = d2.write_standard_file(output_directory=Path(tmp_dir))
+            for include in ({"id", "name"}, {"_id", "name"}):
+                d3 = Metadata.load(metadata_file, include=include)
+                self.assertEqual(d2.id, d3.id)
+            # Generated defaults are not made up for fields missing from the file
+            metadata_file.write_text(json.dumps({"name": record["name"]}))
+            d4 = Metadata.load(metadata_file, include={"id", "name", "external_links"})
+            self.assertIs(UNLOADED, d4.id)
+            self.assertEqual([], d4.external_links)
+
+        # Fields that were not loaded are left out of dumps, and the model can't be written
+        self.assertEqual({"_id", "name"}, set(json.loads(d3.model_dump_json(by_alias=True))))
+        self.assertEqual({"name"}, set(d3.model_dump(exclude={"id": True})))
+        with self.assertRaises(ValueError) as e:
+            d3.write_standard_file(output_directory=Path("unused"))
+        self.assertIn("'location'", str(e.exception))
+
     def test_default_file_extension(self):
         """Tests that the default file extension used is as expected."""
         self.assertEqual(".nd.json", Metadata._FILE_EXTENSION.default)
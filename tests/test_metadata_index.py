@@ -0,0 +1,140 @@
+"""Tests metadata_index module"""
+
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from aind_data_schema.core.data_description import DataDescription
+from aind_data_schema.core.metadata import Metadata
+from aind_data_schema.utils.metadata_index import MetadataIndex, extract_index_fields
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class MetadataIndexTests(unittest.TestCase):
+    """Tests for MetadataIndex"""
+
+    def setUp(self):
+        """Writes a small corpus of metadata files"""
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name) / "assets"
+        self.data_description = json.loads((EXAMPLES_DIR / "data_description.json").read_text())
+        self.subject = json.loads((EXAMPLES_DIR / "subject.json").read_text())
+        self.metadata = {
+            "_id": "a1e6a2a2-a3d5-4a5e-8fbd-5a1a3a0c9b3c",
+            "name": self.data_description["name"],
+            "location": "s3://bucket/asset",
+            "metadata_status": "Valid",
+            "subject": self.subject,
+            "data_description": self.data_description,
+        }
+        (self.root / "asset1").mkdir(parents=True)
+        (self.root / "asset2").mkdir()
+        self.metadata_file = self.root / "asset1" / Metadata.default_filename()
+        self.metadata_file.write_text(json.dumps(self.metadata))
+        self.data_description_file = self.root / "asset2" / DataDescription.default_filename()
+        self.data_description_file.write_text(json.dumps(dict(self.data_description, subject_id="999")))
+        self.index = MetadataIndex(Path(self.tmp_dir.name) / "index.sqlite")
+
+    def tearDown(self):
+        """Removes the corpus"""
+        self.index.close()
+        self.tmp_dir.cleanup()
+
+    def test_extract_index_fields(self):
+        """Tests that queryable fields are extracted"""
+        fields = extract_index_fields(json.dumps(self.metadata), "Metadata")
+        self.assertEqual(self.metadata["_id"], fields["record_id"])
+        self.assertEqual(self.subject["subject_id"], fields["subject_id"])
+        self.assertEqual("ecephys", fields["platform"])
+        self.assertEqual(["ecephys", "behavior-videos"], fields["modalities"])
+        self.assertEqual("raw", fields["data_level"])
+
+        fields = extract_index_fields(json.dumps({"name": "n", "location": "l"}), "Metadata")
+        self.assertIsNone(fields["subject_id"])
+        self.assertEqual([], fields["modalities"])
+
+    def test_update_and_query(self):
+        """Tests incremental indexing and querying"""
+        self.assertEqual(2, self.index.update(self.root))
+        self.assertEqual(0, self.index.update(self.root))
+
+        self.assertEqual([self.metadata["_id"]], self.index.query(subject_id=self.subject["subject_id"]))
+        self.assertEqual(
+            [self.metadata["_id"], self.data_description["name"]],
+            self.index.query(platform="ecephys", modality="ecephys", data_level="raw"),
+        )
+        self.assertEqual([self.metadata["_id"]], self.index.query(metadata_status="Valid"))
+        self.assertEqual([], self.index.query(created_after=datetime(2023, 1, 1)))
+        self.assertEqual(2, len(self.index.query(created_before=datetime(2023, 1, 1))))
+        self.assertEqual([], self.index.query(modality="SPIM"))
+
+        records = list(self.index.query_records(subject_id="999"))
+        self.assertIsInstance(records[0], DataDescription)
+        records = list(self.index.query_records(name=self.data_description["name"], metadata_status="Valid"))
+        self.assertIsInstance(records[0], Metadata)
+        self.assertEqual({"subject", "data_description"}, set(records[0]._raw_core_fields))
+
+        # A touched file with unchanged contents is not re-indexed when using content hashes
+        os.utime(self.metadata_file, (0, 0))
+        self.assertEqual(1, self.index.update(self.root, use_content_hash=True))
+        os.utime(self.metadata_file, (1, 1))
+        self.assertEqual(0, self.index.update(self.root, use_content_hash=True))
+        self.metadata_file.write_text(json.dumps(dict(self.metadata, metadata_status="Invalid")))
+        os.utime(self.metadata_file, (2, 2))
+        self.assertEqual(1, self.index.update(self.root, use_content_hash=True))
+        self.assertEqual([self.metadata["_id"]], self.index.query(metadata_status="Invalid"))
+
+        # Deleted files are removed from the index
+        self.data_description_file.unlink()
+        self.assertEqual(0, self.index.update(self.root))
+        self.assertEqual([self.metadata["_id"]], self.index.query(modality="ecephys"))
+        self.assertEqual(2, self.index.connection.execute("SELECT COUNT(*) FROM modalities").fetchone()[0])
+
+    def test_creation_time_offsets(self):
+        """Tests that creation times with different offsets are compared in UTC"""
+        # 01:17:09 UTC, which sorts before the other record as a raw string
+        self.metadata_file.write_text(
+            json.dumps(
+                dict(
+                    self.metadata,
+                    data_description=dict(self.data_description, creation_time="2023-04-03T18:17:09-07:00"),
+                )
+            )
+        )
+        # 01:00:00 UTC
+        self.data_description_file.write_text(
+            json.dumps(dict(self.data_description, subject_id="999", creation_time="2023-04-04T03:00:00+02:00"))
+        )
+        self.index.update(self.root)
+
+        name = self.data_description["name"]
+        self.assertEqual([name, self.metadata["_id"]], self.index.query())
+        cutoff = datetime(2023, 4, 4, 1, 10, tzinfo=timezone.utc)
+        self.assertEqual([self.metadata["_id"]], self.index.query(created_after=cutoff))
+        self.assertEqual([name], self.index.query(created_before=cutoff.astimezone(timezone(timedelta(hours=-5)))))
+        # Times without an offset are taken to be UTC
+        self.assertEqual([name], self.index.query(created_before=datetime(2023, 4, 4, 1, 10)))
+        self.assertEqual(
+            ["2023-04-04T01:00:00.000000Z", "2023-04-04T01:17:09.000000Z"],
+            [row[0] for row in self.index.connection.execute("SELECT creation_time FROM records ORDER BY 1")],
+        )
+
+        fields = extract_index_fields(json.dumps({"creation_time": "not a time"}), "DataDescription")
+        self.assertIsNone(fields["creation_time"])
+
+    def test_rebuild_older_index(self):
+        """Tests that an index written in an older format is rebuilt"""
+        self.assertEqual(2, self.index.update(self.root))
+        self.index.connection.execute("PRAGMA user_version = 0")
+        self.index.close()
+        self.index = MetadataIndex(Path(self.tmp_dir.name) / "index.sqlite")
+        self.assertEqual([], self.index.query())
+        self.assertEqual(2, self.index.update(self.root))
+
+
+if __name__ == "__main__":
+    unittest.main()
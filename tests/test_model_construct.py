@@ -0,0 +1,89 @@
+""" test model_construct """
+
+import json
+import unittest
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from pydantic import ValidationError
+
+from aind_data_schema.base import AindGeneric, AindModel
+from aind_data_schema.core.acquisition import Acquisition
+from aind_data_schema.core.instrument import Instrument
+from aind_data_schema.core.procedures import Procedures
+from aind_data_schema.core.session import Session
+from aind_data_schema.core.subject import Subject
+from aind_data_schema.models.species import Species
+from aind_data_schema.utils.model_construct import construct_model, get_builder
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class First(AindModel):
+    """Model for testing unions"""
+
+    value: int
+    notes: Optional[str] = None
+
+
+class Second(AindModel):
+    """Model for testing unions"""
+
+    value: int
+    other: str = "other"
+
+
+class ModelConstructTests(unittest.TestCase):
+    """Tests building models from trusted json without validation"""
+
+    def test_examples(self):
+        """Tests that constructed examples are identical to validated ones, including nested types"""
+        for filename, model_class in [
+            ("exaspim_acquisition.json", Acquisition),
+            ("ophys_session.json", Session),
+            ("procedures.json", Procedures),
+            ("aibs_smartspim_procedures.json", Procedures),
+            ("exaspim_instrument.json", Instrument),
+            ("subject.json", Subject),
+        ]:
+            with self.subTest(filename=filename):
+                contents = (EXAMPLES_DIR / filename).read_text()
+                validated = model_class.model_validate_json(contents)
+                constructed = construct_model(model_class, json.loads(contents))
+                self.assertEqual(repr(validated), repr(constructed))
+                self.assertEqual(validated.model_dump_json(), constructed.model_dump_json())
+        # Frozen registry names are the shared instances, as in validated models
+        self.assertIs(Species.MUS_MUSCULUS, constructed.species)
+        self.assertIs(validated.source, constructed.source)
+
+    def test_defaults_and_extra_fields(self):
+        """Tests that missing fields get their defaults and extra fields are kept"""
+        first = construct_model(First, {"value": 1})
+        self.assertEqual(First(value=1), first)
+        self.assertEqual({"value"}, first.model_fields_set)
+        generic = construct_model(AindGeneric, {"a": [1]})
+        self.assertEqual({"a": [1]}, generic.model_extra)
+
+    def test_unions(self):
+        """Tests that ambiguous unions are validated instead of constructed"""
+        builder = get_builder(Union[First, Second])
+        self.assertIsInstance(builder({"value": 1, "notes": "notes"}), First)
+        self.assertIsInstance(builder({"value": 1, "other": "value"}), Second)
+        # Matches both models, so it is validated, and pydantic picks the first
+        self.assertIsInstance(builder({"value": 1}), First)
+        self.assertEqual(Second(value=2), builder(Second(value=2)))
+
+        builder = get_builder(List[Union[int, str]])
+        self.assertEqual([1, "a"], builder([1, "a"]))
+        self.assertEqual([None, 1], get_builder(List[Optional[int]])([None, 1]))
+        self.assertEqual({"a": [1]}, get_builder(Dict[str, List[int]])({"a": [1]}))
+        self.assertEqual({"a"}, get_builder(Set[str])(["a"]))
+
+        builder = get_builder(Species.ONE_OF)
+        self.assertIs(Species.CALLITHRIX_JACCHUS, builder(Species.CALLITHRIX_JACCHUS.model_dump()))
+        with self.assertRaises(ValidationError):
+            builder({"name": "Not a species"})
+
+
+if __name__ == "__main__":
+    unittest.main()
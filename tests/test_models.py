@@ -2,8 +2,12 @@
 
 import unittest
 
+from pydantic import ValidationError
+
 from aind_data_schema.models.harp_types import HarpDeviceType
+from aind_data_schema.models.modalities import Modality
 from aind_data_schema.models.organizations import Organization
+from aind_data_schema.models.pid_names import PIDName
 from aind_data_schema.models.platforms import Platform
 from aind_data_schema.models.registry import Registry
 from aind_data_schema.models.species import Species
@@ -53,5 +57,40 @@ class LiteralAndDefaultTests(unittest.TestCase):
             self.assertIsNotNone(round_trip)
 
 
+class InterningTests(unittest.TestCase):
+    """Tests that validated frozen names are the shared instances"""
+
+    def test_interning(self):
+        """Test validated names are the instances defined on the registry classes"""
+
+        for singleton in [
+            Organization.AI,
+            Organization.THORLABS,
+            Platform.ECEPHYS,
+            Modality.SPIM,
+            Species.MUS_MUSCULUS,
+        ]:
+            round_trip = singleton.model_validate_json(singleton.model_dump_json())
+            self.assertIs(singleton, round_trip)
+            self.assertIs(singleton, singleton.model_validate(singleton.model_dump()))
+            self.assertIs(singleton, singleton.model_validate(singleton.model_copy()))
+        self.assertIs(Registry.ROR, Organization.AI.model_validate_json(Organization.AI.model_dump_json()).registry)
+        self.assertIs(Organization.AI, Organization.from_abbreviation("AI"))
+        self.assertIs(Organization.AI, Organization.from_name("Allen Institute"))
+        self.assertIs(Platform.ECEPHYS, Platform.from_abbreviation("ecephys"))
+        self.assertIs(Modality.SPIM, Modality.from_abbreviation("SPIM"))
+
+        # Data that differs from the shared instance is still validated
+        ai = Organization.AI.model_dump()
+        self.assertIs(Organization.AI, Organization.AI.model_validate(dict(ai, registry=Registry.ROR)))
+        for data in [dict(ai, registry_identifier="other"), dict(ai, extra=1), dict(ai, name="AI")]:
+            with self.assertRaises(ValidationError):
+                Organization.AI.model_validate(data)
+
+        # Names that are not frozen are not shared
+        name = PIDName(name="name")
+        self.assertIsNot(name, PIDName.model_validate(name.model_dump()))
+
+
 if __name__ == "__main__":
     unittest.main()
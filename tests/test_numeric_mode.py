@@ -0,0 +1,107 @@
+""" Tests numeric_mode module """
+
+import json
+import unittest
+import warnings
+from decimal import Decimal
+from pathlib import Path
+from typing import List, Optional
+
+from pydantic import Field, ValidationError
+
+from aind_data_schema.base import AindModel
+from aind_data_schema.core.acquisition import Acquisition
+from aind_data_schema.core.procedures import Procedures
+from aind_data_schema.models.coordinates import Affine3dTransform, CcfCoords, Coordinates3d, Orientation3d
+from aind_data_schema.models.units import SizeValue
+from aind_data_schema.utils.content_hash import content_hash
+from aind_data_schema.utils.numeric_mode import dump_json_numbers, validate_json_floats
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class Example(AindModel):
+    """Model holding float mode models and other Decimals"""
+
+    transforms: List[Affine3dTransform] = []
+    position: Optional[Coordinates3d] = None
+    ccf: Optional[CcfCoords] = None
+    size: Optional[SizeValue] = None
+    orientation: Optional[Orientation3d] = None
+    weight: Decimal = Field(Decimal("0.1"), ge=0)
+
+
+class NumericModeTests(unittest.TestCase):
+    """Tests writing Decimals as numbers and reading in float mode"""
+
+    def test_dump_json_numbers(self):
+        """Tests that Decimals are written as json numbers"""
+        example = Example(
+            transforms=[Affine3dTransform(affine_transform=[Decimal("1.5")] * 12)],
+            position=Coordinates3d(x=1, y="2.25", z=Decimal("3E+2")),
+            orientation=Orientation3d(pitch=1, yaw=2, roll=3),
+        )
+        contents = json.loads(dump_json_numbers(example))
+        self.assertEqual([1.5] * 12, contents["transforms"][0]["affine_transform"])
+        self.assertEqual({"x": 1.0, "y": 2.25, "z": 300.0, "unit": "micrometer"}, contents["position"])
+        self.assertEqual(0.1, contents["weight"])
+        self.assertEqual(json.loads(example.model_dump_json()).keys(), contents.keys())
+        self.assertEqual(example, Example.model_validate_json(dump_json_numbers(example, indent=3)))
+
+        procedures = Procedures.model_validate_json((EXAMPLES_DIR / "procedures.json").read_text())
+        self.assertEqual(procedures, Procedures.model_validate_json(dump_json_numbers(procedures)))
+
+    def test_validate_json_floats(self):
+        """Tests that the Decimals of float mode models are read as floats"""
+        example = Example(
+            transforms=[Affine3dTransform(affine_transform=[Decimal("1.5")] * 12)],
+            position=Coordinates3d(x=1, y="2.25", z=3),
+            ccf=CcfCoords(ml=1, ap=2, dv=3),
+            size=SizeValue(value=Decimal("0.5")),
+            orientation=Orientation3d(pitch=1, yaw=2, roll=3),
+        )
+        for contents in [example.model_dump_json(), dump_json_numbers(example)]:
+            e1 = validate_json_floats(Example, contents)
+            self.assertEqual([1.5] * 12, e1.transforms[0].affine_transform)
+            self.assertIsInstance(e1.transforms[0].affine_transform[0], float)
+            self.assertIsInstance(e1.position.y, float)
+            self.assertIsInstance(e1.ccf.dv, float)
+            self.assertIsInstance(e1.size.value, float)
+            # Other models keep their Decimals
+            self.assertIsInstance(e1.orientation.pitch, Decimal)
+            self.assertIsInstance(e1.weight, Decimal)
+            self.assertEqual(json.loads(dump_json_numbers(example)), json.loads(dump_json_numbers(e1)))
+
+        # Constraints are still checked
+        with self.assertRaises(ValidationError):
+            validate_json_floats(Example, '{"transforms": [{"type": "affine", "affine_transform": [1]}]}')
+        with self.assertRaises(ValidationError):
+            validate_json_floats(Example, '{"position": {"x": "a", "y": 1, "z": 1}}')
+        with self.assertRaises(ValidationError):
+            validate_json_floats(Example, '{"weight": -1}')
+
+        procedures = Procedures.model_validate_json((EXAMPLES_DIR / "procedures.json").read_text())
+        self.assertEqual(procedures, validate_json_floats(Procedures, dump_json_numbers(procedures)))
+
+    def test_float_mode_models(self):
+        """Tests that models read in float mode are written without warnings and hashed as if read as usual"""
+        contents = (EXAMPLES_DIR / "exaspim_acquisition.json").read_text()
+        acquisition = Acquisition.model_validate_json(contents)
+        float_acquisition = validate_json_floats(Acquisition, contents)
+        self.assertIsInstance(float_acquisition.tiles[0].coordinate_transformations[0].scale[0], float)
+        self.assertEqual(content_hash(acquisition), content_hash(float_acquisition))
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            float_contents = dump_json_numbers(float_acquisition)
+        self.assertEqual(dump_json_numbers(acquisition), float_contents)
+        self.assertEqual(acquisition, Acquisition.model_validate_json(float_contents))
+        # Decimals are still written as strings, with the serializers the classes always had
+        self.assertEqual(contents.strip(), acquisition.model_dump_json(indent=3))
+        self.assertEqual(
+            {"value": "0.5", "unit": "millimeter"}, json.loads(SizeValue(value=Decimal("0.5")).model_dump_json())
+        )
+        self.assertNotIn("serialization", Coordinates3d.__pydantic_core_schema__["schema"]["fields"]["x"]["schema"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,215 @@
+""" Tests schema_compiler module """
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from jsonschema import Draft202012Validator, ValidationError
+
+from aind_data_schema.utils import schema_compiler
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+SCHEMAS_DIR = Path(__file__).parents[1] / "schemas"
+
+# Schema using every compiled keyword, with instances that are valid and invalid in different ways
+SCHEMA = {
+    "$defs": {
+        "Cat": {
+            "type": "object",
+            "properties": {"kind": {"const": "cat"}, "lives": {"type": "integer", "minimum": 0, "maximum": 9}},
+            "required": ["kind"],
+            "additionalProperties": False,
+        },
+        "Dog": {
+            "type": "object",
+            "properties": {"kind": {"const": "dog"}, "tags": {"type": "array", "items": {"pattern": "^[a-z]+$"}}},
+            "required": ["kind"],
+            "additionalProperties": False,
+        },
+        "Any/pet": {"anyOf": [{"$ref": "#/$defs/Cat"}, {"$ref": "#/$defs/Dog"}]},
+        "Any~pet": {"type": ["string", "null"]},
+    },
+    "type": "object",
+    "properties": {
+        "pet": {
+            "discriminator": {"mapping": {"cat": "#/$defs/Cat", "dog": "#/$defs/Dog"}, "propertyName": "kind"},
+            "oneOf": [{"$ref": "#/$defs/Cat"}, {"$ref": "#/$defs/Dog"}],
+        },
+        "other": {"oneOf": [{"type": "number"}, {"type": "integer"}]},
+        "mismatched": {
+            "discriminator": {"mapping": {"dog": "#/$defs/Cat"}, "propertyName": "kind"},
+            "oneOf": [{"$ref": "#/$defs/Cat"}],
+        },
+        "unmapped": {
+            "discriminator": {"mapping": {"cat": "#/$defs/Cat"}, "propertyName": "kind"},
+            "oneOf": [{"$ref": "#/$defs/Cat"}, {"$ref": "#/$defs/Dog"}],
+        },
+        "either": {"$ref": "#/$defs/Any~1pet"},
+        "names": {"$ref": "#/$defs/Any~0pet"},
+        "flag": {"anyOf": [{"type": "boolean"}, {"enum": ["yes", "no"]}]},
+        "values": {"enum": [1, True, None, [1], {"a": 1}]},
+        "exact": {"const": {"a": [1, False]}},
+        "pair": {"type": "array", "minItems": 2, "maxItems": 2, "uniqueItems": True},
+        "counts": {"type": "object", "additionalProperties": {"type": "integer"}},
+        "scores": {"additionalProperties": {"allOf": [{"type": "number"}], "minimum": 0}},
+        "child": {"$ref": "#"},
+        "items": {"items": {"$ref": "#/$defs/Cat"}},
+        "described": {"title": "Only annotations"},
+    },
+    "required": ["pet"],
+}
+
+INSTANCES = [
+    {"pet": {"kind": "cat"}},
+    {"pet": {"kind": "cat", "lives": 9.0}},
+    {"pet": {"kind": "cat", "lives": 10}},
+    {"pet": {"kind": "cat", "lives": -1}},
+    {"pet": {"kind": "cat", "lives": True}},
+    {"pet": {"kind": "cat", "tags": []}},
+    {"pet": {"kind": "dog", "tags": ["a", "B"]}},
+    {"pet": {"kind": "bird"}},
+    {"pet": {"kind": 1}},
+    {"pet": {"lives": 1}},
+    {"pet": {}},
+    {"pet": []},
+    {"pet": {"kind": "cat"}, "other": 1.5},
+    {"pet": {"kind": "cat"}, "other": 1},
+    {"pet": {"kind": "cat"}, "other": "1"},
+    {"pet": {"kind": "cat"}, "mismatched": {"kind": "cat"}},
+    {"pet": {"kind": "cat"}, "mismatched": {"kind": "dog"}},
+    {"pet": {"kind": "cat"}, "unmapped": {"kind": "dog"}},
+    {"pet": {"kind": "cat"}, "either": {"kind": "dog"}},
+    {"pet": {"kind": "cat"}, "either": {"kind": "fox"}},
+    {"pet": {"kind": "cat"}, "names": None},
+    {"pet": {"kind": "cat"}, "names": 1},
+    {"pet": {"kind": "cat"}, "flag": False},
+    {"pet": {"kind": "cat"}, "flag": "yes"},
+    {"pet": {"kind": "cat"}, "flag": "maybe"},
+    {"pet": {"kind": "cat"}, "values": 1},
+    {"pet": {"kind": "cat"}, "values": 1.0},
+    {"pet": {"kind": "cat"}, "values": False},
+    {"pet": {"kind": "cat"}, "values": {"a": 1}},
+    {"pet": {"kind": "cat"}, "values": {"a": True}},
+    {"pet": {"kind": "cat"}, "values": [True]},
+    {"pet": {"kind": "cat"}, "values": "1"},
+    {"pet": {"kind": "cat"}, "exact": {"a": [1, False]}},
+    {"pet": {"kind": "cat"}, "exact": {"a": [True, False]}},
+    {"pet": {"kind": "cat"}, "exact": {"a": [1]}},
+    {"pet": {"kind": "cat"}, "exact": {"b": [1, False]}},
+    {"pet": {"kind": "cat"}, "pair": [1, 2]},
+    {"pet": {"kind": "cat"}, "pair": [1, True]},
+    {"pet": {"kind": "cat"}, "pair": [1, 1.0]},
+    {"pet": {"kind": "cat"}, "pair": [1]},
+    {"pet": {"kind": "cat"}, "pair": [1, 2, 3]},
+    {"pet": {"kind": "cat"}, "counts": {"a": 1}},
+    {"pet": {"kind": "cat"}, "counts": {"a": 1.5}},
+    {"pet": {"kind": "cat"}, "scores": {"a": 1.5}},
+    {"pet": {"kind": "cat"}, "scores": {"a": -1}},
+    {"pet": {"kind": "cat"}, "scores": []},
+    {"pet": {"kind": "cat"}, "child": {"pet": {"kind": "dog"}}},
+    {"pet": {"kind": "cat"}, "child": {"pet": {"kind": "dog", "lives": 1}}},
+    {"pet": {"kind": "cat"}, "items": [{"kind": "cat"}, {"kind": "dog"}]},
+    {"pet": {"kind": "cat"}, "described": object},
+    [],
+]
+
+
+class SchemaCompilerTests(unittest.TestCase):
+    """Tests compiling json schemas into validators"""
+
+    def setUp(self):
+        """Points the cache at a temporary directory"""
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = Path(temp_dir.name)
+        env_patch = patch.dict(os.environ, {schema_compiler.CACHE_DIR_ENV: temp_dir.name})
+        env_patch.start()
+        self.addCleanup(env_patch.stop)
+
+    def _compile(self, schema: dict):
+        """Compiles a schema and returns its validator module"""
+        schema_path = self.temp_dir / "test_schema.json"
+        schema_path.write_text(json.dumps(schema))
+        return schema_compiler.load_validator(schema_path)
+
+    def test_examples(self):
+        """Tests that the compiled validators agree with jsonschema on the examples"""
+        for example in sorted(EXAMPLES_DIR.glob("*.json")):
+            schema_path = next(
+                path for path in SCHEMAS_DIR.glob("*_schema.json") if example.stem.endswith(path.stem[:-7])
+            )
+            validator = schema_compiler.load_validator(schema_path)
+            instance = json.loads(example.read_text())
+            expected = Draft202012Validator(json.loads(schema_path.read_text())).is_valid(instance)
+            self.assertEqual(expected, validator.is_valid(instance), example.name)
+
+    def test_keywords(self):
+        """Tests that the compiled validator agrees with jsonschema on every keyword"""
+        validator = self._compile(SCHEMA)
+        for instance in INSTANCES:
+            expected = Draft202012Validator(SCHEMA).is_valid(instance)
+            self.assertEqual(expected, validator.is_valid(instance), instance)
+            if not expected:
+                with self.assertRaises(ValidationError):
+                    validator.validate(instance)
+        self.assertEqual(validator.SCHEMA_HASH, schema_compiler.schema_hash(json.dumps(SCHEMA)))
+        sorted_hash = schema_compiler.schema_hash(json.dumps(SCHEMA, sort_keys=True))
+        self.assertIn(f"SCHEMA_HASH = {sorted_hash!r}", schema_compiler.compile_schema(SCHEMA))
+
+    def test_errors(self):
+        """Tests the messages and paths of errors, including those found through a discriminator"""
+        schema_path = SCHEMAS_DIR / "procedures_schema.json"
+        validator = schema_compiler.load_validator(schema_path)
+        procedures = json.loads((EXAMPLES_DIR / "procedures.json").read_text())
+        validator.validate(procedures)
+        procedure = procedures["subject_procedures"][0]
+        for key, value, path, message in [
+            ("procedure_type", "Unknown", ["subject_procedures", 0, "procedure_type"], "'Unknown' is not one of"),
+            ("extra", 1, ["subject_procedures", 0], "('extra' was unexpected)"),
+            ("experimenter_full_name", 1, ["subject_procedures", 0, "experimenter_full_name"], "1 is not of type"),
+            ("workstation_id", 1, ["subject_procedures", 0, "workstation_id"], "1 is not valid under any"),
+        ]:
+            with patch.dict(procedure, {key: value}):
+                with self.assertRaises(ValidationError) as context:
+                    validator.validate(procedures)
+                self.assertEqual(path, list(context.exception.path))
+                self.assertIn(message, context.exception.message)
+        del procedures["subject_id"]
+        with self.assertRaises(ValidationError) as context:
+            validator.validate(procedures)
+        self.assertEqual("'subject_id' is a required property", context.exception.message)
+        self.assertEqual("required", context.exception.validator)
+
+    def test_unsupported(self):
+        """Tests that schemas with keywords that are not compiled are rejected"""
+        with self.assertRaises(ValueError):
+            schema_compiler.compile_schema({"properties": {"a": {"minLength": 1}}})
+        with self.assertRaises(ValueError):
+            schema_compiler.compile_schema({"$ref": "other.json"})
+
+    def test_caching(self):
+        """Tests that validators are compiled once and again when the schema changes"""
+        validator = self._compile(SCHEMA)
+        self.assertIs(validator, self._compile(SCHEMA))
+        self.assertEqual(self.temp_dir / "validators", Path(validator.__file__).parent)
+        self.assertIsNot(validator, self._compile({"type": "object"}))
+        with patch.object(schema_compiler, "_validators", dict()):
+            with patch.object(schema_compiler, "compile_schema") as compile_schema:
+                self.assertEqual(validator.__file__, self._compile(SCHEMA).__file__)
+            compile_schema.assert_not_called()
+
+    def test_compile_schemas(self):
+        """Tests compiling a directory of schemas into the cache and into modules"""
+        paths = schema_compiler.compile_schemas(SCHEMAS_DIR)
+        self.assertEqual(len(list(SCHEMAS_DIR.glob("*.json"))), len(paths))
+        output = self.temp_dir / "compiled"
+        paths = schema_compiler.compile_schemas(SCHEMAS_DIR, output)
+        self.assertIn(output / "subject_schema.py", paths)
+        self.assertEqual(paths[0].read_text(), Path(schema_compiler.compile_schemas(SCHEMAS_DIR)[0]).read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
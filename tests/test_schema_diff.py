@@ -0,0 +1,210 @@
+""" Tests schema_diff module """
+
+import json
+import unittest
+from copy import deepcopy
+from pathlib import Path
+
+from aind_data_schema.utils.schema_diff import (
+    ADDITIVE,
+    ANNOTATION,
+    BREAKING,
+    SchemaChange,
+    diff_schemas,
+    required_bump,
+)
+
+SCHEMAS_DIR = Path(__file__).parents[1] / "schemas"
+
+OLD_SCHEMA = {
+    "$defs": {
+        "Kind": {"enum": ["a", "b"], "title": "Kind"},
+        "Part": {"properties": {"kind": {"$ref": "#/$defs/Kind"}}, "type": "object"},
+        "Same": {"properties": {"part": {"$ref": "#/$defs/Part"}}, "type": "object"},
+    },
+    "properties": {
+        "schema_version": {"const": "0.1.0", "default": "0.1.0"},
+        "name": {"type": "string", "title": "Name"},
+        "removed": {"type": "string"},
+        "optional": {"type": "string"},
+        "required": {"type": "string"},
+        "count": {"type": "integer", "minimum": 0, "maximum": 10},
+        "size": {"type": "number", "minimum": 1},
+        "literal": {"const": "x"},
+        "either": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+        "pair": {"oneOf": [{"type": "string"}, {"type": "integer"}]},
+        "maybe": {"anyOf": [{"type": "string"}, {"type": "null"}]},
+        "wrapped": {"allOf": [{"$ref": "#/$defs/Kind"}]},
+        "tags": {"items": {"type": "string"}, "type": "array"},
+        "extra": {"additionalProperties": False, "type": "object"},
+        "open": {"type": "object"},
+        "same": {"$ref": "#/$defs/Same"},
+        "renamed": {"$ref": "#/$defs/Kind"},
+        "ref": {"$ref": "#/$defs/Kind"},
+        "pattern": {"pattern": "^a"},
+        "kinds": {"enum": ["a", "b"]},
+        "types": {"type": ["string", "null"]},
+    },
+    "required": ["name", "required"],
+}
+
+
+def _new_schema() -> dict:
+    """Returns a new version of OLD_SCHEMA with every kind of change"""
+    schema = deepcopy(OLD_SCHEMA)
+    schema["$defs"]["Kind"]["enum"] = ["a"]
+    schema["$defs"]["Renamed"] = {"enum": ["a", "b", "c"], "title": "Kind"}
+    properties = schema["properties"]
+    properties["schema_version"] = {"const": "0.2.0", "default": "0.2.0"}
+    properties["name"]["title"] = "Full name"
+    del properties["removed"]
+    properties["added"] = {"type": "string"}
+    properties["added_required"] = {"type": "string"}
+    properties["count"].update({"minimum": 1, "maximum": 20})
+    del properties["size"]["minimum"]
+    properties["literal"]["const"] = "y"
+    properties["either"] = {"type": "string"}
+    properties["pair"]["oneOf"] = [{"type": "number"}, {"type": "integer"}, {"type": "null"}]
+    properties["maybe"]["anyOf"] = [{"type": "integer"}, {"type": "null"}]
+    properties["wrapped"]["allOf"].append({"title": "Other"})
+    properties["tags"]["items"] = {"type": "integer"}
+    properties["extra"]["additionalProperties"] = True
+    properties["open"]["additionalProperties"] = False
+    properties["renamed"] = {"$ref": "#/$defs/Renamed"}
+    properties["ref"] = {"type": "string"}
+    properties["pattern"]["pattern"] = "^b"
+    properties["kinds"]["enum"] = ["b", "a"]
+    properties["types"]["type"] = "string"
+    schema["required"] = ["name", "optional", "added_required"]
+    return schema
+
+
+class SchemaDiffTests(unittest.TestCase):
+    """Tests comparing versions of schemas"""
+
+    def test_classification(self):
+        """Tests that each kind of change is classified"""
+        changes = {(change.path, change.kind) for change in diff_schemas(OLD_SCHEMA, _new_schema())}
+        expected = {
+            ("/$defs/Kind/enum", BREAKING),
+            ("/$defs/Renamed/enum", ADDITIVE),
+            ("/properties/name/title", ANNOTATION),
+            ("/properties/removed", BREAKING),
+            ("/properties/added", ADDITIVE),
+            ("/properties/added_required", BREAKING),
+            ("/required/optional", BREAKING),
+            ("/required/required", ADDITIVE),
+            ("/properties/count/minimum", BREAKING),
+            ("/properties/count/maximum", ADDITIVE),
+            ("/properties/size/minimum", ADDITIVE),
+            ("/properties/literal/const", BREAKING),
+            ("/properties/either/anyOf", BREAKING),
+            ("/properties/pair/oneOf/0", BREAKING),
+            ("/properties/pair/oneOf/0", ADDITIVE),
+            ("/properties/pair/oneOf/2", ADDITIVE),
+            ("/properties/maybe/anyOf/0/type", BREAKING),
+            ("/properties/wrapped/allOf/1", BREAKING),
+            ("/properties/tags/items/type", BREAKING),
+            ("/properties/extra/additionalProperties", ADDITIVE),
+            ("/properties/open/additionalProperties", BREAKING),
+            ("/properties/ref/$ref", BREAKING),
+            ("/properties/ref/type", BREAKING),
+            ("/properties/pattern/pattern", BREAKING),
+            ("/properties/kinds/enum", ANNOTATION),
+            ("/properties/types/type", BREAKING),
+        }
+        self.assertEqual(expected, changes)
+
+    def test_reverse(self):
+        """Tests that reverting changes classifies them the other way"""
+        changes = {(change.path, change.kind) for change in diff_schemas(_new_schema(), OLD_SCHEMA)}
+        self.assertIn(("/properties/either/anyOf", ADDITIVE), changes)
+        self.assertIn(("/properties/pair/oneOf/2", BREAKING), changes)
+        self.assertIn(("/properties/extra/additionalProperties", BREAKING), changes)
+        self.assertIn(("/properties/wrapped/allOf/1", ADDITIVE), changes)
+        self.assertIn(("/properties/size/minimum", BREAKING), changes)
+        self.assertIn(("/properties/types/type", ADDITIVE), changes)
+
+    def test_union_changes(self):
+        """Tests fields that become or stop being unions"""
+        old = {"properties": {"a": {"type": "string", "title": "A"}, "b": {"type": "string"}}}
+        new = {
+            "properties": {
+                "a": {"anyOf": [{"type": "string"}, {"type": "null"}], "title": "A"},
+                "b": {"oneOf": [{"type": "integer"}, {"type": "null"}]},
+            }
+        }
+        self.assertEqual(
+            [
+                SchemaChange("/properties/b/oneOf", BREAKING, "type changed"),
+                SchemaChange("/properties/a/anyOf", ADDITIVE, "type widened"),
+            ],
+            diff_schemas(old, new),
+        )
+        self.assertEqual(
+            [
+                SchemaChange("/properties/a/anyOf", BREAKING, "type narrowed"),
+                SchemaChange("/properties/b/oneOf", BREAKING, "type changed"),
+            ],
+            diff_schemas(new, old),
+        )
+
+    def test_keywords_added_and_removed(self):
+        """Tests keywords that are only in one version"""
+        old = {"enum": ["a"], "allOf": [{"type": "string"}], "items": {"type": "string"}, "format": "date"}
+        new = {"const": "a", "maxItems": 1, "uniqueItems": True, "additionalProperties": False, "required": ["a"]}
+        self.assertEqual(
+            {
+                ("/const", BREAKING),
+                ("/maxItems", BREAKING),
+                ("/uniqueItems", BREAKING),
+                ("/additionalProperties", BREAKING),
+                ("/enum", ADDITIVE),
+                ("/allOf/0", ADDITIVE),
+                ("/format", ADDITIVE),
+                ("/items/type", ADDITIVE),
+            },
+            {(change.path, change.kind) for change in diff_schemas(old, new)},
+        )
+        self.assertEqual(
+            {("/const", ADDITIVE), ("/enum", BREAKING), ("/properties/a", BREAKING), ("/required/a", ADDITIVE)},
+            {
+                (change.path, change.kind)
+                for change in diff_schemas({"const": "a", "required": ["a"], "properties": {"a": {}}}, {"enum": ["a"]})
+            },
+        )
+        self.assertEqual(
+            [SchemaChange("/allOf/0/type", BREAKING, "type changed")],
+            diff_schemas({"allOf": [{"type": "string"}]}, {"allOf": [{"type": "integer"}]}),
+        )
+        self.assertEqual(
+            [SchemaChange("/items", BREAKING, "schema replaced")], diff_schemas({"items": [{}]}, {"items": {}})
+        )
+
+    def test_required_bump(self):
+        """Tests the smallest bump allowed for changes, before and after 1.0.0"""
+        breaking = SchemaChange("/", BREAKING, "")
+        additive = SchemaChange("/", ADDITIVE, "")
+        annotation = SchemaChange("/", ANNOTATION, "")
+        self.assertIsNone(required_bump([]))
+        self.assertEqual("major", required_bump([annotation, breaking], "1.2.0"))
+        self.assertEqual("minor", required_bump([additive, annotation]))
+        self.assertEqual("patch", required_bump([annotation], "1.0.0"))
+        self.assertEqual("minor", required_bump([breaking], "0.2.0"))
+        self.assertEqual("patch", required_bump([additive], "0.2.0"))
+
+    def test_equal_schemas(self):
+        """Tests that a schema has no changes from itself or from a copy with reordered keys"""
+        schema = json.loads((SCHEMAS_DIR / "rig_schema.json").read_text())
+        self.assertEqual([], diff_schemas(schema, schema))
+        reordered = json.loads(json.dumps(schema, sort_keys=True))
+        self.assertEqual([], diff_schemas(schema, reordered))
+        reordered["$defs"]["Camera"]["properties"]["cooling"]["title"] = "Camera cooling"
+        self.assertEqual(
+            [SchemaChange("/$defs/Camera/properties/cooling/title", ANNOTATION, "title changed")],
+            diff_schemas(schema, reordered),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -92,6 +92,19 @@ class SubjectTests(unittest.TestCase):
                 alleles=[PIDName(registry_identifier="12345", name="adsf", registry=Registry.MGI)],
             )
 
+        # The checks also apply to subjects read from json
+        subject = Subject.model_construct(
+            species=Species.MUS_MUSCULUS,
+            subject_id="1234",
+            sex="Male",
+            date_of_birth=now.date(),
+            genotype="wt",
+            source=Organization.AI,
+        )
+        with self.assertRaises(ValueError) as context:
+            Subject.model_validate_json(subject.model_dump_json())
+        self.assertIn("Breeding info should be provided for subjects bred in house", str(context.exception))
+
 
 if __name__ == "__main__":
     unittest.main()
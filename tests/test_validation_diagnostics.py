@@ -0,0 +1,162 @@
+""" test validation_diagnostics """
+
+import json
+import unittest
+from pathlib import Path
+from typing import Dict, List
+from unittest.mock import patch
+
+from pydantic import ValidationError, field_validator
+
+from aind_data_schema.base import AindModel
+from aind_data_schema.core.metadata import Metadata
+from aind_data_schema.core.mri_session import MRIScan
+from aind_data_schema.core.procedures import Procedures
+from aind_data_schema.core.subject import Subject
+from aind_data_schema.models.organizations import Organization
+from aind_data_schema.models.species import Species
+from aind_data_schema.utils import validation_diagnostics
+from aind_data_schema.utils.validation_diagnostics import ValidationIssue, diagnose
+
+EXAMPLES_DIR = Path(__file__).parents[1] / "examples"
+
+
+class ValidationDiagnosticsTests(unittest.TestCase):
+    """Tests diagnostic validation"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Subject that fails both of its custom validators"""
+        cls.subject = dict(
+            species=Species.MUS_MUSCULUS,
+            subject_id="1234",
+            sex="Male",
+            date_of_birth="2020-01-01",
+            source=Organization.AI,
+        )
+
+    def test_collects_every_custom_error(self):
+        """Tests that validation keeps going past failing custom validators"""
+        with self.assertRaises(ValidationError):
+            Subject.model_validate(self.subject)
+
+        report = Subject.diagnose(self.subject)
+        self.assertFalse(report.is_valid)
+        self.assertEqual(
+            [
+                ValidationIssue(
+                    path="/species",
+                    message="Full genotype should be provided for mouse subjects",
+                    validator="Subject.validate_genotype",
+                ),
+                ValidationIssue(
+                    path="/source",
+                    message="Breeding info should be provided for subjects bred in house",
+                    validator="Subject.validate_inhouse_breeding_info",
+                ),
+            ],
+            report.issues,
+        )
+        self.assertEqual({"Subject.validate_genotype": 1, "Subject.validate_inhouse_breeding_info": 1}, report.calls)
+        self.assertEqual(set(report.calls), set(report.timings))
+        self.assertGreater(report.elapsed, 0)
+        self.assertFalse(report.model.check_validity())
+
+    def test_nested_paths(self):
+        """Tests that errors of nested models are reported with their full path"""
+        report = Metadata.diagnose(dict(name="name", location="location", subject=self.subject))
+        self.assertEqual(["/subject/species", "/subject/source"], [issue.path for issue in report.issues])
+        self.assertEqual(1, report.calls["Metadata.validate_metadata"])
+
+        procedures = json.loads((EXAMPLES_DIR / "aibs_smartspim_procedures.json").read_text())
+        procedures["specimen_procedures"][1]["procedure_type"] = "Other - see notes"
+        procedures["specimen_procedures"][1]["notes"] = None
+        report = Procedures.diagnose(json.dumps(procedures))
+        self.assertEqual(["/specimen_procedures/1"], [issue.path for issue in report.issues])
+        self.assertEqual("SpecimenProcedure.validate_procedure_type", report.issues[0].validator)
+
+    def test_valid(self):
+        """Tests diagnosing a valid model"""
+        subject = dict(self.subject, species=Species.HOMO_SAPIENS, source=Organization.JAX)
+        report = diagnose(Subject, subject)
+        self.assertTrue(report.is_valid)
+        self.assertTrue(report.model.check_validity())
+        self.assertEqual(Subject.model_validate(subject), report.model)
+
+    def test_pydantic_errors(self):
+        """Tests that errors raised by pydantic are collected along with custom errors"""
+        subject = dict(self.subject, sex="Unknown")
+        del subject["subject_id"]
+        report = Subject.diagnose(subject)
+        self.assertIsNone(report.model)
+        self.assertEqual(
+            [
+                ("/subject_id", None),
+                ("/sex", None),
+                ("/species", "Subject.validate_genotype"),
+                ("/source", "Subject.validate_inhouse_breeding_info"),
+            ],
+            [(issue.path, issue.validator) for issue in report.issues],
+        )
+
+    def test_unexpected_exception(self):
+        """Tests that other exceptions raised by custom validators are recorded too"""
+
+        class Model(AindModel):
+            """Model with a broken validator"""
+
+            value: int
+
+            @field_validator("value")
+            def check_value(cls, value):
+                """Raises an unexpected error"""
+                return {}[value]
+
+        with self.assertRaises(KeyError):
+            Model(value=1)
+        report = diagnose(Model, dict(value=1))
+        self.assertEqual([ValidationIssue("/value", "KeyError: 1", "Model.check_value")], report.issues)
+        self.assertEqual(1, report.model.value)
+
+    def test_ordinary_validation(self):
+        """Tests that validating as usual does not run the instrumented validators"""
+        subject = dict(self.subject, species=Species.HOMO_SAPIENS, source=Organization.JAX)
+        Subject.diagnose(self.subject)
+        with patch.object(validation_diagnostics, "_ACTIVE_REPORT") as mock_report:
+            Subject.model_validate(subject)
+            with self.assertRaises(ValidationError):
+                Subject.model_validate(self.subject)
+        mock_report.get.assert_not_called()
+
+    def test_equal_values(self):
+        """Tests that failures on equal values are located where each of them is validated"""
+
+        class Session(AindModel):
+            """Model with a list of scans"""
+
+            scans: List[MRIScan]
+            notes: Dict[str, List[MRIScan]] = {}
+
+        scan = dict(
+            scan_index=1,
+            scan_type="3D Scan",
+            scan_sequence_type="Other",
+            primary_scan=True,
+            vc_orientation=dict(rotation=[1, 2, 3, 4, 5, 6, 7, 8, 9]),
+            vc_position=dict(translation=[1, 1, 1]),
+            subject_position="Supine",
+            voxel_sizes=dict(scale=[0.1, 0.1, 0.1]),
+            echo_time=2.2,
+            effective_echo_time=2.0,
+            repetition_time=1.2,
+            additional_scan_parameters={},
+        )
+        report = diagnose(Session, dict(scans=[scan, scan], notes={"a": [], "b": [scan]}))
+        self.assertEqual(
+            ["/scans/0/notes", "/scans/1/notes", "/notes/b/0/notes"], [issue.path for issue in report.issues]
+        )
+        self.assertEqual({"MRIScan.validate_other"}, {issue.validator for issue in report.issues})
+
+
+if __name__ == "__main__":
+    unittest.main()